@@ -0,0 +1,208 @@
+"""
+Запросов в секунду при высокой конкурентности: WSGI + TaskViewSet,
+ASGI + TaskViewSet (sync_to_async на каждый запрос) и ASGI + async-представления.
+
+Запросы подаются прямо в WSGIHandler / ASGIHandler внутри процесса, без сети
+и сервера, поэтому измеряется только стоимость Django и ORM. База - тестовая
+SQLite в памяти, кэш ответов выключен (--cache включает).
+
+    SECRET_KEY=x python -m benchmarks.asgi_vs_wsgi --tasks 1000 --requests 3000 --concurrency 200
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import clear_url_caches  # noqa: E402
+
+HOST = 'testserver'
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+ENDPOINTS = {
+    'detail': lambda ids: f'/api/tasks/{random.choice(ids)}/',  # nosec B311 - выбор задачи для запроса
+    'list': lambda ids: '/api/tasks/?priority=High&sort=deadline',
+}
+
+
+def use_async_views(enabled):
+    import tasks.urls
+    import todolist.urls
+
+    settings.TASKS_ASYNC_VIEWS = enabled
+    importlib.reload(tasks.urls)
+    importlib.reload(todolist.urls)
+    clear_url_caches()
+
+
+def seed(count):
+    from tasks.models import Task
+    from tasks.services import bulk_create_tasks
+
+    priorities = list(Task.Priority.values)
+    items = [
+        {'title': f'Benchmark task {index:07}', 'priority': priorities[index % len(priorities)]}
+        for index in range(count)
+    ]
+    bulk_create_tasks(items)
+    return list(Task.objects.values_list('id', flat=True))
+
+
+def split_path(path):
+    path, _, query = path.partition('?')
+    return path, query
+
+
+def run_wsgi(paths, concurrency):
+    handler = WSGIHandler()
+
+    def request(path):
+        path_info, query = split_path(path)
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path_info,
+            'QUERY_STRING': query,
+            'SERVER_NAME': HOST,
+            'SERVER_PORT': '80',
+            'HTTP_HOST': HOST,
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+        }
+        statuses = []
+        started = time.perf_counter()
+        body = b''.join(handler(environ, lambda status, headers: statuses.append(status)))
+        elapsed = time.perf_counter() - started
+        assert statuses[0].startswith('200'), (path, statuses[0], body[:200])
+        return elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        latencies = list(pool.map(request, paths))
+        return time.perf_counter() - started, latencies
+
+
+def run_asgi(paths, concurrency):
+    handler = ASGIHandler()
+
+    async def request(path):
+        path_info, query = split_path(path)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path_info,
+            'raw_path': path_info.encode(),
+            'query_string': query.encode(),
+            'headers': [(b'host', HOST.encode())],
+            'server': (HOST, 80),
+            'client': ('127.0.0.1', 50000),
+        }
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        statuses = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Future()  # клиент не отключается
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        started = time.perf_counter()
+        await handler(scope, receive, send)
+        elapsed = time.perf_counter() - started
+        assert statuses[0] == 200, (path, statuses[0])
+        return elapsed
+
+    async def main():
+        queue = list(reversed(paths))
+        latencies = []
+
+        async def worker():
+            while queue:
+                latencies.append(await request(queue.pop()))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started, latencies
+
+    return asyncio.run(main())
+
+
+def measure(mode, paths, concurrency):
+    use_async_views(mode == 'asgi-async')
+    runner = run_wsgi if mode == 'wsgi' else run_asgi
+    runner(paths[:concurrency], concurrency)  # прогрев
+    elapsed, latencies = runner(paths, concurrency)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        'mode': mode,
+        'requests': len(paths),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'rps': round(len(paths) / elapsed, 1),
+        'p50_ms': round(percentiles[49] * 1000, 2),
+        'p95_ms': round(percentiles[94] * 1000, 2),
+        'p99_ms': round(percentiles[98] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000, help='Сколько задач создать.')
+    parser.add_argument('--requests', type=int, default=2000, help='Запросов на режим и эндпоинт.')
+    parser.add_argument('--concurrency', type=int, default=100, help='Одновременных запросов.')
+    parser.add_argument('--endpoint', choices=list(ENDPOINTS), action='append', help='По умолчанию все.')
+    parser.add_argument('--mode', choices=MODES, action='append', help='По умолчанию все.')
+    parser.add_argument('--cache', action='store_true', help='Включить кэш ответов.')
+    parser.add_argument('--json', action='store_true', help='Вывести результаты в JSON.')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.TASKS_CACHE_ENABLED = args.cache
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        ids = seed(args.tasks)
+        random.seed(0)
+        results = []
+        for endpoint in args.endpoint or list(ENDPOINTS):
+            paths = [ENDPOINTS[endpoint](ids) for _ in range(args.requests)]
+            for mode in args.mode or MODES:
+                results.append({'endpoint': endpoint, **measure(mode, paths, args.concurrency)})
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'endpoint':<8} {'mode':<11} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for row in results:
+        print(
+            f"{row['endpoint']:<8} {row['mode']:<11} {row['rps']:>9} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+        )
+
+
+if __name__ == '__main__':
+    main()
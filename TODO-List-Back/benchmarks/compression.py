@@ -0,0 +1,187 @@
+"""
+Размер и стоимость CPU сжатия больших списков задач: GET /api/tasks/
+(view=full и view=summary) и потоковый экспорт NDJSON на 10k / 100k задачах.
+
+Для каждого тела: байты отформатированного JSON (indent=2, \\u-экранирование,
+как при ?indent= у DRF) против компактного; для каждой кодировки и уровня -
+сжатый размер, процессорное время сжатия и распаковки (медиана --repeat
+замеров), для экспорта ещё и размер при сжатии по кускам с flush (так
+сжимает CompressionMiddleware потоковые ответы). Отдельно - время ответа
+целиком через django.test.Client с каждым Accept-Encoding.
+
+    SECRET_KEY=x python -m benchmarks.compression --sizes 10000 100000 --output compression.json
+"""
+import argparse
+import gzip
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from benchmarks.list_scale import git_commit, seed  # noqa: E402
+from tasks.compression import CODECS, brotli, zstandard  # noqa: E402
+
+SIZES = (10_000, 100_000)
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 4, 9), 'zstd': (1, 3, 9)}
+BODIES = {
+    'list_full': ('/api/tasks/', {}),
+    'list_summary': ('/api/tasks/', {'view': 'summary'}),
+    'export_ndjson': ('/api/tasks/export/', {'export_format': 'ndjson'}),
+}
+DECOMPRESS = {
+    'gzip': gzip.decompress,
+    'br': brotli and brotli.decompress,
+    'zstd': zstandard and (lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)),
+}
+
+
+def cpu_ms(func, repeat):
+    """Медиана процессорного времени вызова, мс."""
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        func()
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+
+def fetch(client, path, params, encoding='identity'):
+    response = client.get(path, params, HTTP_ACCEPT_ENCODING=encoding)
+    assert response.status_code == 200, response.status_code
+    if response.streaming:
+        return list(response.streaming_content)
+    return [response.content]
+
+
+def pretty_size(chunks, streaming):
+    """Размер того же тела в отформатированном JSON."""
+    if streaming:
+        lines = b''.join(chunks).splitlines()
+        return sum(len(json.dumps(json.loads(line), indent=2)) + 1 for line in lines)
+    return len(json.dumps(json.loads(b''.join(chunks)), indent=2))
+
+
+def compress_whole(encoding, level, body):
+    return CODECS[encoding](level).finish(body)
+
+
+def compress_streaming(encoding, level, chunks):
+    stream = CODECS[encoding](level)
+    return b''.join([stream.compress(chunk) for chunk in chunks] + [stream.finish()])
+
+
+def measure_body(name, chunks, size, repeat):
+    streaming = name.startswith('export')
+    body = b''.join(chunks)
+    results = []
+    for encoding in CODECS:
+        for level in LEVELS[encoding]:
+            compressed = compress_whole(encoding, level, body)
+            assert DECOMPRESS[encoding](compressed) == body
+            result = {
+                'tasks': size,
+                'body': name,
+                'encoding': encoding,
+                'level': level,
+                'bytes': len(body),
+                'compressed_bytes': len(compressed),
+                'ratio': round(len(body) / len(compressed), 2),
+                'compress_cpu_ms': round(cpu_ms(lambda: compress_whole(encoding, level, body), repeat), 2),
+                'decompress_cpu_ms': round(cpu_ms(lambda: DECOMPRESS[encoding](compressed), repeat), 2),
+            }
+            result['compress_mb_per_s'] = round(len(body) / 1e3 / max(result['compress_cpu_ms'], 1e-3), 1)
+            if streaming:
+                result['streaming_chunks'] = len(chunks)
+                result['streaming_bytes'] = len(compress_streaming(encoding, level, chunks))
+            results.append(result)
+            print(
+                f'{size:>8} {name:<14} {encoding:>4}-{level:<2} {len(body):>10} -> {len(compressed):>9} B'
+                f'  {result["compress_cpu_ms"]:>8.2f} ms', file=sys.stderr,
+            )
+    return results
+
+
+def measure_responses(client, size, path, params, repeat):
+    """Полное время ответа (представление, рендеринг, сжатие в middleware) по Accept-Encoding."""
+    results = []
+    for encoding in ('identity', *CODECS):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            chunks = fetch(client, path, params, encoding)
+            samples.append((time.perf_counter() - started) * 1000)
+        results.append({
+            'tasks': size,
+            'path': path,
+            'params': params,
+            'accept_encoding': encoding,
+            'response_bytes': sum(map(len, chunks)),
+            'median_ms': round(statistics.median(samples), 2),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='Количества задач.')
+    parser.add_argument('--repeat', type=int, default=3, help='Замеров на каждый случай.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed генератора данных.')
+    parser.add_argument('--output', help='Файл для результатов JSON (по умолчанию stdout).')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.TASKS_CACHE_ENABLED = False
+    settings.ALLOWED_HOSTS = ['*']
+    rng = random.Random(args.seed)  # nosec B311 - воспроизводимые данные по --seed
+    client = Client()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        meta = {
+            'started_at': timezone.now().isoformat(),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'encodings': list(CODECS),
+            'args': vars(args),
+        }
+        bodies, responses = [], []
+        for size in sorted(args.sizes):
+            seed(size, rng)
+            for name, (path, params) in BODIES.items():
+                chunks = fetch(client, path, params)
+                entries = measure_body(name, chunks, size, args.repeat)
+                pretty = pretty_size(chunks, name.startswith('export'))
+                for entry in entries:
+                    entry['pretty_bytes'] = pretty
+                bodies += entries
+                responses += measure_responses(client, size, path, params, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = json.dumps({'meta': meta, 'bodies': bodies, 'responses': responses}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""
+Время GET /api/tasks/ на 10k / 100k / 1M задачах для всех сочетаний sort,
+order и фильтров, плюс create, patch и edit_status. Результаты пишутся
+в JSON (--output); --compare сравнивает с прошлым прогоном и завершается
+с кодом 1, если медиана какого-то случая выросла больше чем в --threshold раз.
+
+Задачи создаются bulk_create_tasks с правдоподобным распределением
+приоритета, дедлайна и выполнения, размеры наращиваются по возрастанию
+в одной тестовой БД. Запросы идут через django.test.Client (middleware,
+представление, рендеринг), кэш ответов выключен. Список меряется
+первой страницей keyset-пагинации (page), страницей по курсору у конца
+выборки (deep) и целиком (full, только до --full-limit задач).
+
+    SECRET_KEY=x python -m benchmarks.list_scale --output bench.json
+    SECRET_KEY=x python -m benchmarks.list_scale --sizes 10000 --compare bench.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess  # nosec B404 - только git rev-parse для метаданных отчёта
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from tasks.instrumentation import collect  # noqa: E402
+
+SIZES = (10_000, 100_000, 1_000_000)
+SEED_CHUNK = 10_000
+SORTS = ('title', 'priority', 'deadline', 'created_at', 'status', 'task_status')
+ORDERS = ('asc', 'desc')
+FILTERS = {
+    'none': {},
+    'title': {'title': 'report'},
+    'q': {'q': 'budget review'},
+    'priority': {'priority': 'High'},
+    'status': {'status': 'false'},
+    'task_status': {'task_status': 'Overdue'},
+    'combined': {'priority': 'Critical', 'status': 'false', 'task_status': 'Active'},
+}
+
+# Распределения синтетических задач
+PRIORITY_WEIGHTS = {'Low': 30, 'Medium': 40, 'High': 20, 'Critical': 10}
+NO_DEADLINE_SHARE = 0.25
+DEADLINE_MEAN_DAYS, DEADLINE_SIGMA_DAYS = 10, 30  # вокруг сегодня, часть - в прошлом
+COMPLETED_SHARE = {'past': 0.7, 'future': 0.2, 'none': 0.35}
+VERBS = ('Prepare', 'Review', 'Fix', 'Update', 'Write', 'Call', 'Plan', 'Deploy', 'Check', 'Send')
+NOUNS = ('report', 'budget', 'release', 'invoice', 'meeting', 'design', 'backlog', 'server', 'contract', 'docs')
+
+
+def synthetic_tasks(count, start, rng, today):
+    priorities, weights = zip(*PRIORITY_WEIGHTS.items())
+    for index in range(start, start + count):
+        if rng.random() < NO_DEADLINE_SHARE:
+            deadline, period = None, 'none'
+        else:
+            deadline = today + datetime.timedelta(days=round(rng.gauss(DEADLINE_MEAN_DAYS, DEADLINE_SIGMA_DAYS)))
+            period = 'past' if deadline < today else 'future'
+        words = [rng.choice(VERBS), rng.choice(NOUNS)]
+        yield {
+            'title': f'{words[0]} {words[1]} #{index}',
+            'description': f'{rng.choice(VERBS)} the {rng.choice(NOUNS)} with the team' if rng.random() < 0.5 else '',
+            'deadline': deadline,
+            'priority': rng.choices(priorities, weights)[0],
+            'is_completed_by_user': rng.random() < COMPLETED_SHARE[period],
+        }
+
+
+def seed(count, rng):
+    """Добавляет задачи до общего количества count."""
+    from tasks.models import Task
+    from tasks.services import bulk_create_tasks
+
+    today = timezone.now().date()
+    existing = Task.objects.count()
+    for start in range(existing, count, SEED_CHUNK):
+        bulk_create_tasks(list(synthetic_tasks(min(SEED_CHUNK, count - start), start, rng, today)))
+    return list(Task.objects.values_list('id', flat=True))
+
+
+def list_cases(full):
+    modes = ['page', 'deep', 'full'] if full else ['page', 'deep']
+    for filter_name, filters in FILTERS.items():
+        sorts = SORTS + ('relevance',) if 'q' in filters else SORTS
+        for sort in sorts:
+            for order in ORDERS:
+                for mode in modes:
+                    params = {**filters, 'sort': sort, 'order': order}
+                    yield f'list {mode} filter={filter_name} sort={sort} order={order}', mode, params
+
+
+def deep_cursor(params, page_size):
+    """
+    Курсор, после которого в выборке params остаётся page_size строк, как
+    его выдала бы пагинация; None, если выборка короче двух страниц.
+    """
+    from tasks.models import Task
+    from tasks.pagination import TaskKeysetPagination
+    from tasks.services import filter_tasks, sort_tasks
+
+    queryset = sort_tasks(filter_tasks(Task.objects.all(), params), params)
+    rows = list(queryset.reverse()[page_size:page_size + 1])
+    if not rows or queryset.count() < 2 * page_size:
+        return None
+    paginator = TaskKeysetPagination()
+    paginator.ordering = paginator.get_ordering(queryset)
+    return paginator.encode_cursor([getattr(rows[0], name) for name, _ in paginator.ordering])
+
+
+def summarize(timings):
+    times = sorted(timings)
+    return {
+        'runs': len(times),
+        'median_ms': round(statistics.median(times) * 1000, 3),
+        'min_ms': round(times[0] * 1000, 3),
+        'p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 3),
+        'mean_ms': round(statistics.fmean(times) * 1000, 3),
+    }
+
+
+def measure(request, repeat):
+    """Прогрев и repeat замеров; request() возвращает ответ."""
+    request()
+    timings, sql, queries = [], [], 0
+    for _ in range(repeat):
+        with collect() as metrics:
+            response = request()
+            elapsed = metrics.elapsed()
+        timings.append(elapsed)
+        sql.append(metrics.sql)
+        queries = metrics.queries
+    return response, {
+        **summarize(timings),
+        'sql_median_ms': round(statistics.median(sql) * 1000, 3),
+        'queries': queries,
+    }
+
+
+def run_size(client, size, ids, args, rng):
+    results = []
+    full = size <= args.full_limit
+    for name, mode, params in list_cases(full):
+        if mode == 'deep':
+            cursor = deep_cursor(params, args.page_size)
+            if cursor is None:
+                continue
+            params = {**params, 'page_size': args.page_size, 'cursor': cursor}
+        elif mode == 'page':
+            params = {**params, 'page_size': args.page_size}
+        response, stats = measure(lambda: client.get('/api/tasks/', params), args.repeat)
+        assert response.status_code == 200, (name, response.status_code)
+        data = response.json()
+        rows = len(data if mode == 'full' else data['results'])
+        results.append({'size': size, 'case': name, 'params': params, 'rows': rows, **stats})
+        print(f'{size:>8} {name:<62} {stats["median_ms"]:>10.2f} ms', file=sys.stderr)
+
+    writes = {
+        'create': lambda: client.post(
+            '/api/tasks/', {'title': f'Benchmark created {rng.random()}', 'priority': 'High'},
+            content_type='application/json',
+        ),
+        'patch': lambda: client.patch(
+            f'/api/tasks/{rng.choice(ids)}/', {'title': f'Benchmark patched {rng.random()}'},
+            content_type='application/json',
+        ),
+        'edit_status': lambda: client.post(f'/api/tasks/{rng.choice(ids)}/edit_status/'),
+    }
+    for name, request in writes.items():
+        response, stats = measure(request, args.write_repeat)
+        assert response.status_code in (200, 201), (name, response.status_code)
+        results.append({'size': size, 'case': name, 'params': {}, 'rows': 1, **stats})
+        print(f'{size:>8} {name:<62} {stats["median_ms"]:>10.2f} ms', file=sys.stderr)
+    return results
+
+
+def git_commit():
+    try:
+        # Фиксированная команда без ввода пользователя, git ищется в PATH
+        return subprocess.run(  # nosec B603 B607
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Случаи, где медиана выросла больше чем в threshold раз: [(случай, было, стало)]."""
+    with open(baseline_path) as file:
+        baseline = {(row['size'], row['case']): row for row in json.load(file)['results']}
+    regressions = []
+    for row in results:
+        old = baseline.get((row['size'], row['case']))
+        if old and old['median_ms'] > 0 and row['median_ms'] / old['median_ms'] > threshold:
+            regressions.append((f'{row["size"]} {row["case"]}', old['median_ms'], row['median_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='Количества задач.')
+    parser.add_argument('--repeat', type=int, default=3, help='Замеров на каждый запрос списка.')
+    parser.add_argument('--write-repeat', type=int, default=30, help='Замеров create / patch / edit_status.')
+    parser.add_argument('--page-size', type=int, default=50, help='page_size для режима page.')
+    parser.add_argument('--full-limit', type=int, default=100_000,
+                        help='Полный список меряется, только если задач не больше.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed генератора данных.')
+    parser.add_argument('--output', help='Файл для результатов JSON (по умолчанию stdout).')
+    parser.add_argument('--compare', help='JSON прошлого прогона для сравнения.')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Допустимый рост медианы, раз.')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.TASKS_CACHE_ENABLED = False
+    settings.ALLOWED_HOSTS = ['*']
+    rng = random.Random(args.seed)  # nosec B311 - воспроизводимые данные по --seed
+    client = Client()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        meta = {
+            'started_at': timezone.now().isoformat(),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'database_version': '.'.join(map(str, connection.Database.sqlite_version_info))
+            if connection.vendor == 'sqlite' else None,
+            'args': vars(args),
+        }
+        results = []
+        for size in sorted(args.sizes):
+            started = time.perf_counter()
+            ids = seed(size, rng)
+            print(f'seeded {size} tasks in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+            results += run_size(client, size, ids, args, rng)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = json.dumps({'meta': meta, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(report)
+    else:
+        print(report)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for case, old, new in regressions:
+            print(f'REGRESSION {case}: {old:.2f} -> {new:.2f} ms', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,32 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def ensure_fts(sender, using, **kwargs):
+    from django.db import connections
+    from .search import install_fts
+    install_fts(connections[using])
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # Кэш ответов должен быть общим для всех процессов сервера
+        from .cache import check_backend
+        check_backend()
+
+        # Восстанавливаем FTS-триггеры, если миграция пересоздала tasks_task
+        post_migrate.connect(ensure_fts, sender=self)
+
+        # WAL и остальные PRAGMA из SQLITE_PRAGMAS на каждом новом соединении
+        from .db import apply_sqlite_pragmas
+        connection_created.connect(apply_sqlite_pragmas)
+
+        # Учёт SQL-запросов для InstrumentationMiddleware
+        from .instrumentation import install_query_recorder
+        connection_created.connect(install_query_recorder)
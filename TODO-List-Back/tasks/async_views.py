@@ -0,0 +1,219 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import NotFound, ValidationError
+
+from . import cache as task_cache
+from .changes import TokenExpired, check_token, current_token
+from .conditional import adetail_validators, alist_validators, not_modified_response, set_validators
+from .events import aevent_stream, event_stream
+from .instrumentation import measure_serialization
+from .models import Task
+from .pagination import TaskKeysetPagination
+from .renderers import TaskJSONRenderer
+from .serializers import (
+    TaskCreateAndUpdateSerializer, TaskSerializer, atask_list_data, task_fieldset, task_list_layout, task_rows_to_dicts,
+)
+from .services import filter_tasks, sort_tasks
+from .views import NOT_FOUND_MESSAGE, TaskViewSet
+
+
+
+def json_response(data, status=200):
+    return HttpResponse(TaskJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class AsyncTaskView(View):
+    """
+    Async-версии частых запросов TaskViewSet для ASGI: без перехода в поток
+    на весь запрос, БД через async ORM. Ответы совпадают с TaskViewSet;
+    остальные методы, браузерный API и keyset-страницы обслуживает он же
+    (sync_view) через sync_to_async.
+    """
+    sync_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True  # как у APIView
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if 'format' in request.GET or 'text/html' in request.headers.get('Accept', ''):
+            return await self.fallback(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def fallback(self, request, *args, **kwargs):
+        def respond():
+            return self.sync_view(request, *args, **kwargs).render()
+        return await sync_to_async(respond)()
+
+    async def http_method_not_allowed(self, request, *args, **kwargs):
+        return await self.fallback(request, *args, **kwargs)
+
+    async def options(self, request, *args, **kwargs):
+        return await self.fallback(request, *args, **kwargs)
+
+    async def cached_response(self, request, make_key, get_data):
+        """
+        Как TaskViewSet.cached_response: get_data возвращает (данные, ETag, Last-Modified),
+        данные None - у клиента та же версия или задачи нет (ETag None).
+        """
+        if not task_cache.is_enabled():
+            return self.conditional_response(request, *await get_data())
+
+        key = await make_key()
+        cached = await task_cache.aget_cached(key)
+        if cached is not None:
+            response = self.conditional_response(request, *cached)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        data, etag, last_modified = await get_data()
+        if data is not None:
+            await task_cache.aset_cached(key, (data, etag, last_modified))
+        response = self.conditional_response(request, data, etag, last_modified)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    @staticmethod
+    def conditional_response(request, data, etag, last_modified):
+        """304 по If-None-Match / If-Modified-Since, иначе 200 с данными и валидаторами (404 без данных)."""
+        response = not_modified_response(request, etag, last_modified) if etag is not None else None
+        if response is None:
+            if data is None:
+                return json_response({'detail': NOT_FOUND_MESSAGE}, status=404)
+            response = json_response(data)
+        return set_validators(response, etag, last_modified)
+
+
+class TaskListAsyncView(AsyncTaskView):
+    sync_view = staticmethod(TaskViewSet.as_view({'get': 'list', 'post': 'create'}, basename='task', detail=False))
+
+    async def get(self, request):
+        params = request.GET
+        if TaskKeysetPagination.cursor_query_param in params or TaskKeysetPagination.page_size_query_param in params:
+            return await self.fallback(request)
+        try:
+            fields = task_fieldset(params)
+        except ValidationError as exc:
+            return json_response(exc.detail, status=400)
+
+        if params.get('q'):
+            # Проверка наличия FTS-таблицы - синхронный запрос к БД
+            queryset, ordered = await sync_to_async(self.build_querysets)(params)
+        else:
+            queryset, ordered = self.build_querysets(params)
+
+        return await self.cached_response(
+            request,
+            lambda: task_cache.alist_key(request),
+            lambda: self.list_data(request, queryset, ordered, fields),
+        )
+
+    @staticmethod
+    async def list_data(request, queryset, ordered, fields):
+        """Данные списка с ETag и Last-Modified; без данных (None), если у клиента та же версия."""
+        etag, last_modified = await alist_validators(queryset, request)
+        if not_modified_response(request, etag, last_modified) is not None:
+            return None, etag, last_modified
+        with measure_serialization():
+            data = await atask_list_data(ordered, fields)
+        return data, etag, last_modified
+
+    @staticmethod
+    def build_querysets(params):
+        """Отфильтрованный queryset (для ETag) и он же с сортировкой списка."""
+        queryset = filter_tasks(Task.objects.all(), params)
+        return queryset, sort_tasks(queryset, params)
+
+    async def post(self, request):
+        if request.content_type != 'application/json':
+            return await self.fallback(request)
+        try:
+            data = json.loads(request.body)
+        except ValueError as exc:
+            return json_response({'detail': f'JSON parse error - {exc}'}, status=400)
+
+        serializer = TaskCreateAndUpdateSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=400)
+        task = await Task.objects.acreate(**serializer.validated_data)
+        return json_response(TaskCreateAndUpdateSerializer(task).data, status=201)
+
+
+class TaskDetailAsyncView(AsyncTaskView):
+    sync_view = staticmethod(TaskViewSet.as_view(
+        {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+        basename='task', detail=True,
+    ))
+
+    async def get(self, request, pk):
+        return await self.cached_response(
+            request,
+            lambda: task_cache.adetail_key(pk),
+            lambda: self.detail_data(request, pk),
+        )
+
+    @classmethod
+    async def detail_data(cls, request, pk):
+        """Карточка с ETag и Last-Modified; без данных, если у клиента та же версия или задачи нет."""
+        etag, last_modified = await adetail_validators(pk)
+        if etag is None:
+            return None, None, None
+        if not_modified_response(request, etag, last_modified) is not None:
+            return None, etag, last_modified
+        return await cls.task_data(pk), etag, last_modified
+
+    @staticmethod
+    async def task_data(pk):
+        keys, _ = task_list_layout()
+        with measure_serialization():
+            row = await Task.objects.filter(pk=pk).values_list(*keys).afirst()
+            if row is None:
+                return None
+            return next(task_rows_to_dicts([row]))
+
+
+class TaskEditStatusAsyncView(AsyncTaskView):
+    sync_view = staticmethod(TaskViewSet.as_view({'post': 'edit_status'}, basename='task', detail=True))
+
+    async def post(self, request, pk):
+        try:
+            task = await Task.objects.aget(pk=pk)
+            await task.aedit_mark()
+        except Task.DoesNotExist:
+            return json_response({'detail': NOT_FOUND_MESSAGE}, status=404)
+        with measure_serialization():
+            data = TaskSerializer(task).data
+        return json_response(data)
+
+
+class TaskEventStreamView(View):
+    """
+    SSE-поток событий задач: created, updated, status (сменился статус), deleted.
+    id события - токен ленты изменений, поэтому EventSource после обрыва
+    продолжает с Last-Event-ID без пропусков (изменения одной задачи за время
+    обрыва приходят одним событием с последним состоянием); без него поток
+    начинается с текущего момента (или с ?since=). Под ASGI ожидающий
+    подписчик не занимает поток; под WSGI занимает рабочий поток сервера.
+    """
+
+    async def get(self, request):
+        token = request.headers.get('Last-Event-ID') or request.GET.get('since')
+        if token:
+            try:
+                await sync_to_async(check_token)(token)
+            except (NotFound, TokenExpired) as exc:
+                return json_response({'detail': exc.detail}, status=exc.status_code)
+        else:
+            token = await sync_to_async(current_token)()
+
+        stream = aevent_stream(token) if isinstance(request, ASGIRequest) else event_stream(token)
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx не буферизует поток
+        return response
@@ -0,0 +1,198 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+from . import routers
+
+# Глобальная версия данных задач: любая запись увеличивает её,
+# и все закэшированные ответы старой версии перестают использоваться
+VERSION_KEY = 'tasks:version'
+# Время последней записи: пока реплика может отставать, прочитанное с неё не кэшируется
+WRITTEN_KEY = 'tasks:written_at'
+
+# Параметры списка, от которых зависит ответ, и их значения по умолчанию
+LIST_PARAMS = {
+    'sort': None,
+    'order': 'asc',
+    'title': '',
+    'priority': '',
+    'status': '',
+    'task_status': '',
+    'q': '',
+    'cursor': '',
+    'page_size': '',
+    'view': '',
+    'fields': '',
+    'exclude': '',
+}
+
+
+def get_cache():
+    return caches[settings.TASKS_CACHE_ALIAS]
+
+
+def is_enabled():
+    return settings.TASKS_CACHE_ENABLED
+
+
+# Попадания и промахи этого процесса: счётчик в общем кэше - лишняя запись на каждый запрос
+_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def check_backend():
+    """
+    Версия данных хранится в кэше: backend должен быть общим для всех процессов
+    и увеличивать её атомарно (Redis, Memcached). У файлового кэша и кэша в БД
+    incr - это чтение и запись, параллельные записи теряют увеличения версии.
+    Кэш в памяти процесса разрешён только явно, TASKS_CACHE_SINGLE_PROCESS.
+    """
+    if not is_enabled():
+        return
+    cache = get_cache()
+    if isinstance(cache, (RedisCache, BaseMemcachedCache)):
+        return
+    if isinstance(cache, LocMemCache):
+        if settings.TASKS_CACHE_SINGLE_PROCESS:
+            return
+        raise ImproperlyConfigured(
+            f'CACHES[{settings.TASKS_CACHE_ALIAS!r}] is a per-process LocMemCache: with several workers '
+            'writes do not invalidate cached task responses in other processes. Configure Redis or '
+            'Memcached, set TASKS_CACHE_SINGLE_PROCESS=True for a single-process server, '
+            'or disable TASKS_CACHE_ENABLED.'
+        )
+    raise ImproperlyConfigured(
+        f'CACHES[{settings.TASKS_CACHE_ALIAS!r}] uses {type(cache).__name__}, whose incr is not atomic: '
+        'concurrent writes can lose a data version bump and keep serving stale task responses. '
+        'Configure Redis or Memcached, or disable TASKS_CACHE_ENABLED.'
+    )
+
+
+def _count(hit):
+    with _counts_lock:
+        _counts['hits' if hit else 'misses'] += 1
+
+
+def get_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Ключ мог быть вытеснен: начинаем с текущего времени, чтобы не совпасть
+        # с версией ещё живых записей
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY, 0)
+    return version
+
+
+async def aget_version():
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = await cache.aget(VERSION_KEY, 0)
+    return version
+
+
+def _bump_version():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        get_version()
+    cache.set(WRITTEN_KEY, time.time(), timeout=settings.TASKS_REPLICA_LAG or None)
+
+
+def _replica_may_lag(written_at):
+    """Ответ прочитан с реплики, а последняя запись была меньше TASKS_REPLICA_LAG секунд назад."""
+    if routers.is_pinned() or routers.replica_alias() is None or written_at is None:
+        return False
+    return time.time() - written_at < settings.TASKS_REPLICA_LAG
+
+
+def invalidate():
+    """
+    Сбрасывает кэш ответов. Внутри транзакции версия увеличивается ещё раз
+    после коммита, чтобы не осталось ответов, закэшированных до него.
+    """
+    if not is_enabled():
+        return
+    _bump_version()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(_bump_version)
+
+
+def list_key(request):
+    return _list_key(request.query_params, request.get_host(), get_version())
+
+
+async def alist_key(request):
+    """list_key для django.http.HttpRequest в async-представлениях."""
+    return _list_key(request.GET, request.get_host(), await aget_version())
+
+
+def _list_key(params, host, version):
+    normalized = []
+    for name, default in LIST_PARAMS.items():
+        value = params.get(name, default)
+        if name == 'sort' and value is None:
+            value = 'relevance' if params.get('q') else 'title'
+        normalized.append(f'{name}={value}')
+    # Фактический статус и ссылки next зависят от даты и хоста
+    normalized.append(f'date={timezone.now().date().isoformat()}')
+    normalized.append(f'host={host}')
+    # Хэш только сокращает ключ, не защищает
+    digest = hashlib.sha1('&'.join(normalized).encode(), usedforsecurity=False).hexdigest()
+    return f'tasks:v{version}:list:{digest}'
+
+
+def detail_key(pk):
+    return f'tasks:v{get_version()}:detail:{pk}'
+
+
+async def adetail_key(pk):
+    return f'tasks:v{await aget_version()}:detail:{pk}'
+
+
+def get_cached(key):
+    value = get_cache().get(key)
+    _count(value is not None)
+    return value
+
+
+async def aget_cached(key):
+    value = await get_cache().aget(key)
+    _count(value is not None)
+    return value
+
+
+def set_cached(key, value):
+    cache = get_cache()
+    if not _replica_may_lag(cache.get(WRITTEN_KEY)):
+        cache.set(key, value, timeout=settings.TASKS_CACHE_TIMEOUT)
+
+
+async def aset_cached(key, value):
+    cache = get_cache()
+    if not _replica_may_lag(await cache.aget(WRITTEN_KEY)):
+        await cache.aset(key, value, timeout=settings.TASKS_CACHE_TIMEOUT)
+
+
+def stats():
+    """Попадания и промахи с запуска этого процесса, текущая версия данных."""
+    with _counts_lock:
+        hits, misses = _counts['hits'], _counts['misses']
+    return {
+        'hits': hits,
+        'misses': misses,
+        'version': get_cache().get(VERSION_KEY),
+    }
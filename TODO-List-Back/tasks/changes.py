@@ -0,0 +1,157 @@
+import datetime
+import heapq
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F, Max, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from .models import Task, TaskChangeSequence, TaskTombstone
+from .serializers import task_list_layout, task_rows_to_dicts
+
+# Изменений в одном ответе GET /api/tasks/changes/ (?limit=)
+CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 5000
+# Тексты ошибок, не секреты
+INVALID_TOKEN_MESSAGE = 'Invalid token'  # nosec B105
+EXPIRED_TOKEN_MESSAGE = 'Token expired: deletions since it were pruned, reload the task list'  # nosec B105
+
+
+class TokenExpired(APIException):
+    """Записи об удалениях после токена уже удалены prune_tombstones: нужна полная синхронизация."""
+    status_code = status.HTTP_410_GONE
+    default_detail = EXPIRED_TOKEN_MESSAGE
+    default_code = 'token_expired'
+
+
+def parse_token(token):
+    """Токен '<change_seq>.<id>' - ключ последнего полученного изменения; пустой - с начала."""
+    if not token:
+        return 0, 0
+    change_seq, _, task_id = token.partition('.')
+    try:
+        return int(change_seq), int(task_id or 0)
+    except ValueError:
+        raise NotFound(INVALID_TOKEN_MESSAGE)
+
+
+def format_token(change_seq, task_id):
+    return f'{change_seq}.{task_id}'
+
+
+def last_sequence():
+    return TaskChangeSequence.objects.values_list('value', flat=True).first() or 0
+
+
+def sequence_state():
+    """Последний выданный номер и номер, до которого удалены записи об удалениях."""
+    return TaskChangeSequence.objects.values_list('value', 'pruned_seq').first() or (0, 0)
+
+
+def check_not_expired(change_seq, task_id, pruned_seq):
+    # Пустой токен - синхронизация с начала, удаления до неё клиенту не нужны
+    if (change_seq or task_id) and change_seq <= pruned_seq:
+        raise TokenExpired()
+
+
+def check_token(token):
+    """Токен корректен (иначе NotFound) и удаления после него ещё хранятся (иначе TokenExpired)."""
+    change_seq, task_id = parse_token(token)
+    check_not_expired(change_seq, task_id, sequence_state()[1])
+
+
+def current_token():
+    """Токен, после которого пойдут только будущие изменения."""
+    return format_token(last_sequence() + 1, 0)
+
+
+def fetch_changes(token, limit=CHANGES_LIMIT):
+    """
+    Изменения после token в порядке (change_seq, id): список (вид, токен, данные),
+    токен для продолжения и есть ли ещё. Вид - created, updated, status
+    (сменился статус) или deleted; данные - задача как в списке или {'id': ...}.
+    Одна транзакция записи даёт всем своим строкам один change_seq, поэтому
+    id в ключе нужен, чтобы продолжить с середины большой массовой операции.
+    """
+    change_seq, task_id = parse_token(token)
+    # Выборки ограничены номером, зафиксированным до их начала: все меньшие
+    # номера уже видны, и обе выборки видят одно и то же множество изменений
+    sequence, pruned_seq = sequence_state()
+    check_not_expired(change_seq, task_id, pruned_seq)
+    if sequence < change_seq:
+        return [], token, False
+    keys, _ = task_list_layout()
+
+    tasks = Task.objects \
+        .filter(Q(change_seq__gt=change_seq) | Q(change_seq=change_seq, id__gt=task_id), change_seq__lte=sequence) \
+        .order_by('change_seq', 'id') \
+        .values_list('change_seq', 'id', 'version', 'status_changed_seq', *keys)[:limit + 1]
+    deleted = TaskTombstone.objects \
+        .filter(Q(change_seq__gt=change_seq) | Q(change_seq=change_seq, task_id__gt=task_id), change_seq__lte=sequence) \
+        .order_by('change_seq', 'task_id') \
+        .values_list('change_seq', 'task_id')[:limit + 1]
+
+    changes = list(heapq.merge(
+        (((row[0], row[1]), row[2:]) for row in tasks),
+        (((row[0], row[1]), None) for row in deleted),
+        key=lambda change: change[0],
+    ))
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    task_data = task_rows_to_dicts(row[2:] for _, row in changes if row is not None)
+    entries = []
+    for key, row in changes:
+        if row is None:
+            entries.append(('deleted', format_token(*key), {'id': key[1]}))
+            continue
+        version, status_changed_seq = row[:2]
+        if version == 1:
+            kind = 'created'
+        elif status_changed_seq == key[0]:
+            kind = 'status'
+        else:
+            kind = 'updated'
+        entries.append((kind, format_token(*key), next(task_data)))
+
+    if has_more:
+        next_token = entries[-1][1]
+    else:
+        # Все изменения до sequence получены
+        next_token = format_token(sequence + 1, 0)
+    return entries, next_token, has_more
+
+
+def changes_since(token, limit=CHANGES_LIMIT):
+    """Ответ GET /api/tasks/changes/: изменённые задачи и id удалённых."""
+    entries, next_token, has_more = fetch_changes(token, limit)
+    return {
+        'tasks': [data for kind, _, data in entries if kind != 'deleted'],
+        'deleted': [data['id'] for kind, _, data in entries if kind == 'deleted'],
+        'next': next_token,
+        'has_more': has_more,
+    }
+
+
+def prune_tombstones(days=None, now=None):
+    """
+    Удаляет записи об удалениях старше days дней (TASKS_TOMBSTONE_RETENTION_DAYS)
+    и запоминает наибольший удалённый номер в TaskChangeSequence.pruned_seq:
+    клиент с токеном не новее него получает 410 и загружает список заново.
+    Возвращает количество удалённых записей.
+    """
+    days = settings.TASKS_TOMBSTONE_RETENTION_DAYS if days is None else days
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=days)
+    using = router.db_for_write(TaskTombstone)
+    with transaction.atomic(using=using):
+        tombstones = TaskTombstone.objects.using(using)
+        last = tombstones.filter(deleted_at__lt=cutoff).aggregate(last=Max('change_seq'))['last']
+        if last is None:
+            return 0
+        # Граница - по номеру: записи одной транзакции удаляются вместе
+        TaskChangeSequence.objects.using(using).update(pruned_seq=Greatest(F('pruned_seq'), last))
+        deleted, _ = tombstones.filter(change_seq__lte=last).delete()
+    return deleted
@@ -0,0 +1,155 @@
+import zlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # brotli не установлен - br не предлагается
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard не установлен - zstd не предлагается
+    zstandard = None
+
+# Типы, которые имеет смысл сжимать. text/event-stream не сжимается:
+# события должны доходить сразу, а прокси могут буферизовать сжатый поток
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+SKIPPED_TYPES = ('text/event-stream',)
+
+
+class GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        """Сжимает кусок потока и сбрасывает его клиенту (Z_SYNC_FLUSH)."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data=b''):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data=b''):
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data=b''):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Content-Encoding -> потоковый компрессор; только установленные библиотеки
+CODECS = {'gzip': GzipStream}
+if brotli is not None:
+    CODECS['br'] = BrotliStream
+if zstandard is not None:
+    CODECS['zstd'] = ZstdStream
+
+
+def compression(enabled=True, **options):
+    """
+    Настройки CompressionMiddleware для ответов одного представления
+    (функции, метода или action): enabled, min_size, encodings, levels -
+    как TASKS_COMPRESSION_* в settings.
+    """
+    overrides = {'enabled': enabled, **options}
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(*args, **kwargs):
+                response = await view(*args, **kwargs)
+                response.compression = overrides
+                return response
+        else:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                response = view(*args, **kwargs)
+                response.compression = overrides
+                return response
+        return wrapper
+    return decorator
+
+
+def response_options(response):
+    """Настройки сжатия ответа: settings, поверх них - декоратор compression."""
+    return {
+        'enabled': True,
+        'min_size': settings.TASKS_COMPRESSION_MIN_SIZE,
+        'encodings': settings.TASKS_COMPRESSION_ENCODINGS,
+        'levels': settings.TASKS_COMPRESSION_LEVELS,
+        **getattr(response, 'compression', {}),
+    }
+
+
+def is_compressible(content_type):
+    content_type = content_type.split(';', 1)[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(SKIPPED_TYPES)
+
+
+def parse_accept_encoding(header):
+    """Accept-Encoding -> {кодировка: q}."""
+    weights = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def negotiate(header, encodings):
+    """
+    Кодировка с наибольшим q клиента среди encodings, установленных в CODECS;
+    при равном q - первая в encodings (порядок предпочтения сервера). None - без сжатия.
+    """
+    weights = parse_accept_encoding(header)
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        if encoding not in CODECS:
+            continue
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress_chunks(chunks, stream):
+    for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def acompress_chunks(chunks, stream):
+    async for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
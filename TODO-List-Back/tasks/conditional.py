@@ -0,0 +1,116 @@
+import hashlib
+import json
+
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Task, TaskTombstone
+
+
+def detail_validators(pk):
+    """ETag и Last-Modified одной задачи по version и modified_at, без загрузки модели."""
+    queryset = _detail_queryset(pk)
+    if queryset is None:
+        return None, None
+    return _detail_validators(pk, queryset.first())
+
+
+async def adetail_validators(pk):
+    queryset = _detail_queryset(pk)
+    if queryset is None:
+        return None, None
+    return _detail_validators(pk, await queryset.afirst())
+
+
+def _detail_queryset(pk):
+    try:
+        return Task.objects.filter(pk=pk).values_list('version', 'modified_at')
+    except (TypeError, ValueError):
+        # pk не число: валидаторов нет, 404 вернёт обычный get_object()
+        return None
+
+
+def _detail_validators(pk, row):
+    if row is None:
+        return None, None
+    version, modified_at = row
+    return f'"task-{pk}-{version}"', int(modified_at.timestamp())
+
+
+# Состояние отфильтрованного списка: количество и сумма версий меняются
+# при создании, правке и удалении
+LIST_STATE = {
+    'count': Count('id'),
+    'max_id': Max('id'),
+    'versions': Sum('version'),
+    'modified': Max('modified_at'),
+}
+
+
+def list_validators(queryset, request):
+    """
+    ETag и Last-Modified списка одним агрегатом по отфильтрованным задачам,
+    время последнего удаления берётся из TaskTombstone. У отфильтрованного
+    списка только ETag: задача, вышедшая из фильтра, не меняет max(modified_at)
+    оставшихся, и If-Modified-Since вернул бы устаревший 304.
+    """
+    state = queryset.order_by().aggregate(**LIST_STATE)
+    deleted = TaskTombstone.objects.aggregate(deleted=Max('deleted_at'))['deleted']
+    return _list_validators(state, deleted, request, _is_filtered(queryset))
+
+
+async def alist_validators(queryset, request):
+    state = await queryset.order_by().aaggregate(**LIST_STATE)
+    deleted = (await TaskTombstone.objects.aaggregate(deleted=Max('deleted_at')))['deleted']
+    return _list_validators(state, deleted, request, _is_filtered(queryset))
+
+
+def _is_filtered(queryset):
+    return bool(queryset.query.where)
+
+
+def _list_validators(state, deleted, request, filtered):
+    # Фактический статус зависит от даты, ссылки next - от адреса запроса
+    raw = '|'.join(str(value) for value in (
+        request.get_full_path(),
+        timezone.now().date(),
+        state['count'], state['max_id'], state['versions'], state['modified'], deleted,
+    ))
+    # Хэш только сокращает ETag, не защищает
+    etag = f'"tasks-{hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()}"'
+
+    if filtered:
+        return etag, None
+    times = [value for value in (state['modified'], deleted) if value is not None]
+    last_modified = int(max(times).timestamp()) if times else None
+    return etag, last_modified
+
+
+def page_validators(data):
+    """
+    ETag страницы keyset-пагинации по её данным (вместе со ссылками next / previous):
+    агрегат по всему отфильтрованному списку на каждую страницу не нужен.
+    """
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return f'"tasks-page-{hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()}"', None
+
+
+def not_modified_response(request, etag, last_modified):
+    """304, если If-None-Match / If-Modified-Since совпали, иначе None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code == 200:
+        if etag:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
@@ -0,0 +1,16 @@
+import re
+
+from django.conf import settings
+
+# Значение PRAGMA подставляется в SQL, поэтому допускаются только слова и числа
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Обработчик connection_created: PRAGMA из settings.SQLITE_PRAGMAS для SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        if not PRAGMA_VALUE.match(name) or not PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f'Invalid SQLite PRAGMA: {name} = {value}')
+        connection.connection.execute(f'PRAGMA {name} = {value}')
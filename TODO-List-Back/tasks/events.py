@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .changes import fetch_changes, format_token, parse_token
+
+# Пауза перед переподключением EventSource, мс
+RETRY_MS = 3000
+
+
+class TaskEventSubscription:
+    """Подписчик SSE: ключ последнего полученного изменения и ещё не отданные события."""
+
+    def __init__(self, token, wake):
+        self.cursor = parse_token(token)
+        self.wake = wake
+        self.joined_at = time.monotonic()
+        self._chunks = deque()
+
+    def deliver(self, events, next_key):
+        # Тот же опрос может вернуть уже полученное подписчиком при подключении
+        chunk = ''.join(text for key, text in events if key > self.cursor)
+        self.cursor = max(self.cursor, next_key)
+        if chunk:
+            self._chunks.append(chunk)
+            self.wake()
+
+    def take(self):
+        """Накопленные события одной строкой ('' - новых нет)."""
+        chunks = []
+        while self._chunks:
+            chunks.append(self._chunks.popleft())
+        return ''.join(chunks)
+
+
+class TaskEventBroker:
+    """
+    Подписчики SSE этого процесса и общий для них опрос ленты изменений
+    (tasks.changes). Запись задач будит подписчиков, а ленту читает один из
+    них сразу для всех: с самого раннего токена среди подписчиков, раздавая
+    каждому изменения после его собственного. Поэтому массовые операции,
+    переподключение с Last-Event-ID и записи других процессов (замечаются
+    по heartbeat) обрабатываются одинаково, а число запросов к БД не растёт
+    с числом подписчиков.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._subscriptions = set()
+        self._polling = False
+        self._polled_at = float('-inf')
+        self.notified_at = float('-inf')
+
+    @property
+    def subscribers(self):
+        return len(self._subscriptions)
+
+    def notify(self):
+        with self._condition:
+            self.notified_at = time.monotonic()
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.wake()
+
+    @contextmanager
+    def subscribe(self, token, wake):
+        """wake() вызывается из любого потока при изменении и при доставке событий."""
+        subscription = TaskEventSubscription(token, wake)
+        with self._condition:
+            self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._condition:
+                self._subscriptions.discard(subscription)
+
+    def poll(self, since):
+        """
+        Дочитывает ленту и раздаёт её подписчикам, если опрос не начинался после since.
+        Пока опрашивает другой подписчик, ждёт его: чаще всего этот опрос и нужен.
+        """
+        with self._condition:
+            while self._polling:
+                self._condition.wait()
+            if self._polled_at > since:
+                return
+            self._polling = True
+            self._polled_at = time.monotonic()
+            subscriptions = list(self._subscriptions)
+        try:
+            if not subscriptions:
+                return
+            start = min(subscription.cursor for subscription in subscriptions)
+            # Подключившиеся во время опроса могут ждать изменений раньше start: они опросят сами
+            for events, next_key in read_events(format_token(*start)):
+                for subscription in subscriptions:
+                    subscription.deliver(events, next_key)
+        finally:
+            with self._condition:
+                self._polling = False
+                self._condition.notify_all()
+
+
+broker = TaskEventBroker()
+
+
+def notify_subscribers(using=None):
+    """Будит подписчиков после COMMIT текущей транзакции (сразу, если её нет)."""
+    transaction.on_commit(broker.notify, using=using)
+
+
+def format_event(kind, token, data):
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {token}\nevent: {kind}\ndata: {payload}\n\n'
+
+
+def read_events(token):
+    """
+    Изменения после token по страницам ленты, каждая - сразу после выборки:
+    [(ключ, событие SSE)] и ключ, с которого читать дальше.
+    """
+    has_more = True
+    while has_more:
+        entries, token, has_more = fetch_changes(token)
+        yield [(parse_token(entry[1]), format_event(*entry)) for entry in entries], parse_token(token)
+
+
+def event_stream(token):
+    """
+    Поток для WSGI: занимает рабочий поток сервера на всё соединение.
+    Поток закрывается через TASKS_SSE_MAX_AGE секунд, EventSource
+    переподключается с Last-Event-ID.
+    """
+    deadline = time.monotonic() + settings.TASKS_SSE_MAX_AGE
+    woken = threading.Event()
+    with broker.subscribe(token, woken.set) as subscription:
+        yield f'retry: {RETRY_MS}\n\n'
+        # Нужен опрос, начатый после since: подключения, последней записи или начала heartbeat
+        since = subscription.joined_at
+        while True:
+            woken.clear()
+            broker.poll(since)
+            chunk = subscription.take()
+            if chunk:
+                yield chunk
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            waited_from = time.monotonic()
+            if woken.wait(min(settings.TASKS_SSE_HEARTBEAT, remaining)):
+                since = broker.notified_at
+            else:
+                yield ': ping\n\n'
+                since = waited_from
+
+
+async def aevent_stream(token):
+    """
+    Поток для ASGI: ожидающий подписчик - это asyncio.Event без потока
+    и без запросов к БД до изменения или heartbeat.
+    """
+    deadline = time.monotonic() + settings.TASKS_SSE_MAX_AGE
+    loop = asyncio.get_running_loop()
+    woken = asyncio.Event()
+    with broker.subscribe(token, partial(loop.call_soon_threadsafe, woken.set)) as subscription:
+        yield f'retry: {RETRY_MS}\n\n'
+        since = subscription.joined_at
+        while True:
+            woken.clear()
+            await sync_to_async(broker.poll)(since)
+            chunk = subscription.take()
+            if chunk:
+                yield chunk
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            waited_from = time.monotonic()
+            try:
+                await asyncio.wait_for(woken.wait(), min(settings.TASKS_SSE_HEARTBEAT, remaining))
+                since = broker.notified_at
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                since = waited_from
@@ -0,0 +1,63 @@
+import csv
+import json
+from itertools import islice
+
+from .serializers import iter_task_rows, task_list_layout
+
+# Сколько строк читать из БД за раз и сколько строк отдавать одним куском ответа
+EXPORT_CHUNK_SIZE = 2000
+
+# Экспорт - самое большое тело и сжимается потоково: минимальные уровни дают
+# примерно втрое меньше CPU ценой ~30% байт (benchmarks/compression.py)
+EXPORT_COMPRESSION_LEVELS = {'zstd': 1, 'br': 1, 'gzip': 1}
+
+
+class Echo:
+    """Псевдо-файл для csv.writer: write() просто возвращает строку."""
+
+    def write(self, value):
+        return value
+
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    rows = iter_task_rows(queryset, chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(
+            json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n'
+            for row in chunk
+        ).encode()
+
+
+def stream_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    keys, _ = task_list_layout()
+    writer = csv.writer(Echo())
+    yield writer.writerow(keys).encode()
+    rows = iter_task_rows(queryset, chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(
+            writer.writerow([_csv_value(row[key]) for key in keys])
+            for row in chunk
+        ).encode()
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+
+# Формат -> (генератор, Content-Type, имя файла)
+EXPORT_FORMATS = {
+    'ndjson': (stream_ndjson, 'application/x-ndjson', 'tasks.ndjson'),
+    'csv': (stream_csv, 'text/csv', 'tasks.csv'),
+}
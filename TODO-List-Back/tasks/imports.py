@@ -0,0 +1,105 @@
+import csv
+import json
+from dataclasses import dataclass
+
+# Сколько задач создавать и фиксировать одной транзакцией
+IMPORT_CHUNK_SIZE = 5000
+
+
+@dataclass
+class ImportRecord:
+    """Запись файла: данные задачи или ошибка разбора и позиция конца записи."""
+    line: int
+    offset: int
+    data: dict = None
+    error: str = None
+
+
+def iter_ndjson(file, offset=0, line=0):
+    """
+    Читает NDJSON из бинарного файла построчно, начиная с байта offset.
+    Пустые строки пропускаются, offset каждой записи - начало следующей.
+    """
+    file.seek(offset)
+    for raw in file:
+        offset += len(raw)
+        line += 1
+        if not raw.strip():
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError as exc:
+            yield ImportRecord(line, offset, error=f'Invalid JSON: {exc}')
+            continue
+        if not isinstance(data, dict):
+            yield ImportRecord(line, offset, error='Expected a JSON object.')
+            continue
+        yield ImportRecord(line, offset, data=data)
+
+
+class _LineReader:
+    """
+    Отдаёт csv.reader декодированные строки и считает прочитанные байты.
+    Строка не в UTF-8 декодируется с заменой символов (кавычки и разделители
+    сохраняются), а ошибка - в error: запись с ней пропускается как ошибочная.
+    """
+
+    def __init__(self, file, offset):
+        self.file = file
+        self.offset = offset
+        self.error = None
+
+    def __iter__(self):
+        for raw in self.file:
+            self.offset += len(raw)
+            try:
+                yield raw.decode('utf-8')
+            except UnicodeDecodeError as exc:
+                self.error = self.error or f'Invalid UTF-8: {exc}'
+                yield raw.decode('utf-8', errors='replace')
+
+
+def iter_csv(file, offset=0, line=0):
+    """
+    Читает CSV с заголовком из бинарного файла, начиная с байта offset.
+    Заголовок всегда берётся из первой строки файла. Пустые ячейки
+    считаются отсутствующими полями, как если бы их не было в JSON.
+    """
+    file.seek(0)
+    header_line = file.readline()
+    try:
+        header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+    except UnicodeDecodeError as exc:
+        # Без заголовка не разобрать ни одной строки
+        yield ImportRecord(1, max(offset, len(header_line)), error=f'Invalid UTF-8 in header: {exc}')
+        return
+    if offset == 0:
+        offset, line = len(header_line), 1
+    else:
+        file.seek(offset)
+
+    source = _LineReader(file, offset)
+    reader = csv.reader(source)
+    for values in reader:
+        record_line = line + reader.line_num
+        if source.error:
+            yield ImportRecord(record_line, source.offset, error=source.error)
+            source.error = None
+            continue
+        if not any(values):
+            continue
+        if len(values) != len(header):
+            yield ImportRecord(record_line, source.offset, error=f'Expected {len(header)} columns, got {len(values)}.')
+            continue
+        data = {key: value for key, value in zip(header, values) if value != ''}
+        yield ImportRecord(record_line, source.offset, data=data)
+
+
+IMPORT_FORMATS = {
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
+
+
+def detect_format(path):
+    return 'csv' if str(path).lower().endswith('.csv') else 'ndjson'
@@ -0,0 +1,89 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Метрики текущего запроса; None - запрос не измеряется (или вне запроса).
+# ContextVar переходит в потоки sync_to_async, поэтому запросы async ORM тоже учитываются
+_metrics = ContextVar('task_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('started', 'queries', 'sql', 'serialize')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql = 0.0
+        self.serialize = 0.0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+@contextmanager
+def collect():
+    """Собирает метрики запросов к БД и сериализации внутри блока."""
+    metrics = RequestMetrics()
+    token = _metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _metrics.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper каждого соединения: без измеряемого запроса - один ContextVar.get."""
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Обработчик connection_created."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure_serialization():
+    """
+    Время блока в serialize: построение данных ответа и рендеринг JSON.
+    Запросы к БД внутри блока (ленивый queryset, get_object) уже учтены в sql и вычитаются.
+    """
+    metrics = _metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    sql = metrics.sql
+    try:
+        yield
+    finally:
+        metrics.serialize += time.perf_counter() - started - (metrics.sql - sql)
+
+
+def server_timing(metrics, total):
+    """Значение заголовка Server-Timing, длительности в миллисекундах."""
+    return ', '.join((
+        f'total;dur={total * 1000:.2f}',
+        f'sql;dur={metrics.sql * 1000:.2f};desc="{metrics.queries} queries"',
+        f'serialize;dur={metrics.serialize * 1000:.2f}',
+    ))
+
+
+def log_fields(request, response, metrics, total):
+    return {
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'total_ms': round(total * 1000, 2),
+        'sql_ms': round(metrics.sql * 1000, 2),
+        'queries': metrics.queries,
+        'serialize_ms': round(metrics.serialize * 1000, 2),
+    }
@@ -0,0 +1,268 @@
+import datetime
+import http.client
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from django.db import connections
+from django.test import Client
+from django.utils import timezone
+
+from .models import Task
+from .services import bulk_create_tasks
+
+# Доли запросов по умолчанию; create пополняет пул id, delete его расходует
+DEFAULT_MIX = {'list': 40, 'detail': 30, 'edit_status': 10, 'patch': 10, 'create': 5, 'delete': 5}
+ENDPOINTS = tuple(DEFAULT_MIX)
+# Эндпоинты, которым нужна существующая задача
+NEEDS_TASK = ('detail', 'edit_status', 'patch', 'delete')
+
+
+def parse_mix(value):
+    """'list=40,detail=30' -> {'list': 40, 'detail': 30}."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f'Unknown endpoint {name!r}, expected one of: {", ".join(ENDPOINTS)}')
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f'Invalid weight for {name!r}: {weight!r}')
+        if mix[name] < 0:
+            raise ValueError(f'Negative weight for {name!r}')
+    if not any(mix.values()):
+        raise ValueError('Request mix is empty')
+    return mix
+
+
+def seed_tasks(count, rng):
+    """Создаёт count задач со случайными приоритетом, дедлайном и выполнением; возвращает их id."""
+    today = timezone.now().date()
+    tasks = [
+        {
+            'title': f'Load test seed #{index}',
+            'deadline': today + datetime.timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.75 else None,
+            'priority': rng.choice(Task.Priority.values),
+            'is_completed_by_user': rng.random() < 0.3,
+        }
+        for index in range(count)
+    ]
+    bulk_create_tasks(tasks)
+    return list(Task.objects.order_by('id').values_list('id', flat=True))
+
+
+class TaskIdPool:
+    """id задач, общие для всех воркеров: delete забирает id, create добавляет."""
+
+    def __init__(self, ids):
+        self._ids = list(ids)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def pick(self, rng):
+        with self._lock:
+            return rng.choice(self._ids) if self._ids else None
+
+    def take(self, rng):
+        with self._lock:
+            if not self._ids:
+                return None
+            index = rng.randrange(len(self._ids))
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def add(self, task_id):
+        with self._lock:
+            self._ids.append(task_id)
+
+
+def build_request(endpoint, pool, rng, list_params):
+    """(method, path, тело) для эндпоинта; без задач в пуле - create."""
+    task_id = None
+    if endpoint in NEEDS_TASK:
+        task_id = pool.take(rng) if endpoint == 'delete' else pool.pick(rng)
+        if task_id is None:
+            endpoint = 'create'
+
+    if endpoint == 'list':
+        query = urlencode(list_params)
+        return endpoint, 'GET', f'/api/tasks/?{query}' if query else '/api/tasks/', None
+    if endpoint == 'detail':
+        return endpoint, 'GET', f'/api/tasks/{task_id}/', None
+    if endpoint == 'edit_status':
+        return endpoint, 'POST', f'/api/tasks/{task_id}/edit_status/', None
+    if endpoint == 'patch':
+        return endpoint, 'PATCH', f'/api/tasks/{task_id}/', {'title': f'Load test patch {rng.randrange(10 ** 6)}'}
+    if endpoint == 'delete':
+        return endpoint, 'DELETE', f'/api/tasks/{task_id}/', None
+    body = {'title': f'Load test task {rng.randrange(10 ** 6)}', 'priority': rng.choice(Task.Priority.values)}
+    return 'create', 'POST', '/api/tasks/', body
+
+
+class InProcessTransport:
+    """Запросы через django.test.Client: весь стек Django без сети, свой клиент на поток."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def request(self, method, path, body):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(raise_request_exception=False)
+        data = json.dumps(body) if body is not None else ''
+        response = client.generic(method, path, data, content_type='application/json')
+        return response.status_code, response.content
+
+    def close(self):
+        # Соединения с БД у каждого потока свои
+        connections.close_all()
+
+
+class HttpTransport:
+    """Запросы к запущенному серверу, keep-alive соединение на поток."""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise ValueError(f'Expected http://host[:port], got {base_url!r}')
+        self.host, self.port, self.prefix = parts.hostname, parts.port or 80, parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method, path, body):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout,
+                )
+            try:
+                connection.request(method, self.prefix + path, body=data, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (ConnectionError, http.client.HTTPException):
+                # Сервер закрыл keep-alive соединение - одно переподключение
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency, status):
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            self.statuses[endpoint][status] += 1
+            if status is None or status >= 400:
+                self.errors[endpoint] += 1
+
+
+def run_load(transport, pool, mix, concurrency, requests=None, duration=None, list_params=None, seed=0):
+    """
+    concurrency воркеров выполняют requests запросов (или работают duration секунд),
+    выбирая эндпоинт по весам mix. Возвращает LoadResult.
+    """
+    names, weights = zip(*((name, weight) for name, weight in mix.items() if weight))
+    list_params = list_params or {}
+    counter = itertools.count()
+    result = LoadResult()
+    deadline = time.perf_counter() + duration if duration else None
+
+    def has_budget():
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return next(counter) < requests
+
+    def worker(index):
+        # Воспроизводимая смесь запросов по seed, не криптография
+        rng = random.Random(seed * 1000 + index)  # nosec B311
+        while has_budget():
+            endpoint = rng.choices(names, weights)[0]
+            endpoint, method, path, body = build_request(endpoint, pool, rng, list_params)
+            started = time.perf_counter()
+            try:
+                status, content = transport.request(method, path, body)
+            except OSError:
+                status, content = None, b''
+            result.record(endpoint, time.perf_counter() - started, status)
+            if endpoint == 'create' and status == 201:
+                pool.add(json.loads(content)['id'])
+
+    def thread_worker(index):
+        try:
+            worker(index)
+        finally:
+            transport.close()
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        # В текущем потоке: соединения остаются открытыми (и видят транзакцию вызывающего)
+        worker(0)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(thread_worker, index) for index in range(concurrency)]:
+                future.result()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def percentile(sorted_values, share):
+    """Перцентиль методом ближайшего ранга."""
+    rank = math.ceil(round(share * len(sorted_values), 9))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def summarize(result):
+    """Отчёт по эндпоинтам и итог: запросы, ошибки, req/s, p50/p95/p99."""
+    def row(latencies, errors, statuses):
+        latencies = sorted(latencies)
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'error_rate': round(errors / len(latencies), 4),
+            'rps': round(len(latencies) / result.elapsed, 1),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2),
+            'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        }
+
+    endpoints = {
+        name: row(result.latencies[name], result.errors[name], result.statuses[name])
+        for name in ENDPOINTS if result.latencies[name]
+    }
+    total_statuses = defaultdict(int)
+    for statuses in result.statuses.values():
+        for status, count in statuses.items():
+            total_statuses[status] += count
+    total = row(
+        [latency for latencies in result.latencies.values() for latency in latencies],
+        sum(result.errors.values()),
+        total_statuses,
+    )
+    return {'seconds': round(result.elapsed, 3), 'endpoints': endpoints, 'total': total}
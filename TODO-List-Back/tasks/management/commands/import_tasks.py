@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from tasks.imports import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, detect_format
+from tasks.models import TaskImportCheckpoint
+from tasks.serializers import TaskCreateAndUpdateSerializer
+from tasks.services import bulk_create_tasks
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Сколько ошибок валидации выводить, остальные только считаются
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковый импорт задач из NDJSON/CSV файла. Строки проверяются по правилам '
+        'TaskCreateAndUpdateSerializer, задачи фиксируются пачками, прерванный импорт '
+        'продолжается с последней зафиксированной пачки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу.')
+        parser.add_argument(
+            '--format',
+            choices=list(IMPORT_FORMATS),
+            help='Формат файла, по умолчанию по расширению (.csv - CSV, иначе NDJSON).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help=f'Сколько задач фиксировать одной транзакцией (по умолчанию {IMPORT_CHUNK_SIZE}).',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать импорт файла заново, игнорируя сохранённый прогресс.',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Остановиться на первой некорректной строке (по умолчанию такие строки пропускаются).',
+        )
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options['path'])
+        if not os.path.isfile(path):
+            raise CommandError(f'File not found: {path}')
+        chunk_size = options['chunk_size']
+        if chunk_size <= 0:
+            raise CommandError('--chunk-size must be positive')
+        read_records = IMPORT_FORMATS[options['format'] or detect_format(path)]
+
+        if options['restart']:
+            TaskImportCheckpoint.objects.filter(source=path).delete()
+        checkpoint, _ = TaskImportCheckpoint.objects.get_or_create(source=path)
+        size = os.path.getsize(path)
+        if checkpoint.offset > size:
+            raise CommandError(f'Checkpoint is past the end of {path}; the file has changed, use --restart')
+        if checkpoint.offset:
+            self.stdout.write(f'Resuming from line {checkpoint.line} (byte {checkpoint.offset})')
+
+        start_offset = checkpoint.offset
+        created = skipped = 0
+        started = time.perf_counter()
+        checkpoint_skipped = checkpoint.skipped
+        validator = TaskCreateAndUpdateSerializer()
+        chunk = []
+
+        def flush(record):
+            # Пачка и позиция в файле фиксируются вместе: после сбоя ни одна
+            # задача не будет создана дважды и ни одна не потеряется
+            nonlocal created
+            with transaction.atomic():
+                created += bulk_create_tasks(chunk, chunk_size)
+                checkpoint.offset = record.offset
+                checkpoint.line = record.line
+                checkpoint.created += len(chunk)
+                checkpoint.skipped = checkpoint_skipped + skipped
+                checkpoint.save()
+            chunk.clear()
+
+        record = None
+        with open(path, 'rb') as file:
+            for record in read_records(file, checkpoint.offset, checkpoint.line):
+                error = record.error
+                if error is None:
+                    try:
+                        chunk.append(validator.run_validation(record.data))
+                    except ValidationError as exc:
+                        error = exc.detail
+                if error is not None:
+                    if options['strict']:
+                        raise CommandError(f'Line {record.line}: {error}')
+                    skipped += 1
+                    if skipped <= MAX_REPORTED_ERRORS:
+                        self.stderr.write(f'Line {record.line}: {error}')
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush(record)
+
+            if record is not None and (chunk or record.offset != checkpoint.offset):
+                flush(record)
+
+        elapsed = time.perf_counter() - started
+        self.report(created, skipped, record.offset - start_offset if record else 0, elapsed)
+
+    def report(self, created, skipped, read_bytes, elapsed):
+        if skipped > MAX_REPORTED_ERRORS:
+            self.stderr.write(f'... and {skipped - MAX_REPORTED_ERRORS} more invalid rows')
+        rate = created / elapsed if elapsed else 0
+        mbytes = read_bytes / 1024 / 1024
+        self.stdout.write(
+            f'Read {mbytes:.1f} MB in {elapsed:.2f}s: '
+            f'{rate:.0f} tasks/s, {mbytes / elapsed if elapsed else 0:.1f} MB/s'
+        )
+        peak = peak_memory_mb()
+        if peak is not None:
+            self.stdout.write(f'Peak memory: {peak:.1f} MB')
+        self.stdout.write(self.style.SUCCESS(f'Imported {created} tasks, skipped {skipped} invalid rows'))
+
+
+def peak_memory_mb():
+    """Пиковый RSS процесса; ru_maxrss в килобайтах на Linux и в байтах на macOS."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
@@ -0,0 +1,162 @@
+import json
+import os
+import random
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from tasks.loadtest import (
+    DEFAULT_MIX, HttpTransport, InProcessTransport, TaskIdPool, parse_mix, run_load, seed_tasks, summarize,
+)
+from tasks.models import Task
+
+# Параметры сценария и значения по умолчанию; сценарий - JSON-файл с этими ключами
+SCENARIO_DEFAULTS = {
+    'mix': DEFAULT_MIX,
+    'concurrency': 4,
+    'requests': 1000,
+    'duration': None,
+    'tasks': 1000,
+    'list_params': {},
+    'seed': 0,
+}
+# Сколько id существующих задач взять с сервера для detail / patch / delete
+REMOTE_POOL_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузка на API задач (список, детали, создание, PATCH, edit_status, удаление) '
+        'пулом воркеров: внутри процесса через django.test.Client или на сервер по --url. '
+        'Выводит пропускную способность, p50/p95/p99 и долю ошибок по эндпоинтам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Адрес запущенного сервера (http://127.0.0.1:8000); без него - внутри процесса.')
+        parser.add_argument('--scenario', help='JSON-файл сценария; параметры командной строки его переопределяют.')
+        parser.add_argument('--save-scenario', help='Сохранить итоговый сценарий в JSON-файл.')
+        parser.add_argument('--mix', help='Доли запросов, например "list=40,detail=30,create=5".')
+        parser.add_argument('--concurrency', type=int, help='Количество воркеров.')
+        parser.add_argument('--requests', type=int, help='Всего запросов.')
+        parser.add_argument('--duration', type=float, help='Длительность в секундах вместо --requests.')
+        parser.add_argument('--tasks', type=int, help='Сколько задач создать перед нагрузкой (внутри процесса).')
+        parser.add_argument(
+            '--list-params', help='Query-параметры запросов списка, например "page_size=50&sort=deadline".',
+        )
+        parser.add_argument('--seed', type=int, help='Seed выбора запросов.')
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help='Внутри процесса работать с настроенной БД вместо временной (данные будут изменены).',
+        )
+        parser.add_argument('--json', action='store_true', help='Вывести отчёт в JSON.')
+
+    def handle(self, *args, **options):
+        scenario = self.scenario(options)
+        if options['save_scenario']:
+            with open(options['save_scenario'], 'w') as file:
+                json.dump(scenario, file, indent=2)
+
+        if options['url']:
+            try:
+                transport = HttpTransport(options['url'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            report = self.run(transport, self.remote_ids(transport), scenario)
+        elif options['current_db']:
+            report = self.run(InProcessTransport(), self.local_ids(scenario), scenario)
+        else:
+            old_name = self.create_temporary_db()
+            try:
+                report = self.run(InProcessTransport(), self.local_ids(scenario), scenario)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['json']:
+            self.stdout.write(json.dumps({'scenario': scenario, **report}, indent=2))
+        else:
+            self.print_report(report)
+
+    def scenario(self, options):
+        scenario = dict(SCENARIO_DEFAULTS)
+        if options['scenario']:
+            try:
+                with open(options['scenario']) as file:
+                    loaded = json.load(file)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Cannot read scenario: {exc}')
+            unknown = set(loaded) - set(SCENARIO_DEFAULTS)
+            if unknown:
+                raise CommandError(f'Unknown scenario keys: {", ".join(sorted(unknown))}')
+            scenario.update(loaded)
+        if options['duration'] is not None:
+            scenario['requests'] = None
+        for key in ('concurrency', 'requests', 'duration', 'tasks', 'seed'):
+            if options[key] is not None:
+                scenario[key] = options[key]
+        if options['list_params'] is not None:
+            scenario['list_params'] = dict(pair.split('=', 1) for pair in options['list_params'].split('&') if pair)
+
+        try:
+            scenario['mix'] = parse_mix(options['mix']) if options['mix'] else parse_mix(
+                ','.join(f'{name}={weight}' for name, weight in scenario['mix'].items())
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if scenario['concurrency'] < 1:
+            raise CommandError('concurrency must be positive')
+        if not scenario['duration'] and not (scenario['requests'] or 0) > 0:
+            raise CommandError('Either requests or duration must be positive')
+        return scenario
+
+    def create_temporary_db(self):
+        # Временный файл, а не SQLite в памяти: потоки работают с БД как в эксплуатации (WAL, блокировки)
+        if connection.vendor == 'sqlite':
+            test_settings = connection.settings_dict.setdefault('TEST', {})
+            test_settings['NAME'] = os.path.join(tempfile.gettempdir(), f'tasks_loadtest_{os.getpid()}.sqlite3')
+        return connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    def local_ids(self, scenario):
+        ids = list(Task.objects.order_by('id').values_list('id', flat=True))
+        missing = scenario['tasks'] - len(ids)
+        if missing > 0:
+            ids = seed_tasks(missing, random.Random(scenario['seed']))  # nosec B311 - тестовые данные по seed
+        return ids
+
+    def remote_ids(self, transport):
+        # Одна страница keyset-пагинации: пулу хватит, а весь список на большой БД не нужен
+        status, content = transport.request('GET', f'/api/tasks/?page_size={REMOTE_POOL_SIZE}', None)
+        if status != 200:
+            raise CommandError(f'GET /api/tasks/ returned {status}')
+        return [task['id'] for task in json.loads(content)['results']]
+
+    def run(self, transport, ids, scenario):
+        result = run_load(
+            transport,
+            TaskIdPool(ids),
+            scenario['mix'],
+            scenario['concurrency'],
+            requests=scenario['requests'],
+            duration=scenario['duration'],
+            list_params=scenario['list_params'],
+            seed=scenario['seed'],
+        )
+        return summarize(result)
+
+    def print_report(self, report):
+        header = (
+            f'{"endpoint":<12} {"requests":>8} {"errors":>7} {"err %":>6} {"req/s":>8} '
+            f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"max ms":>8}'
+        )
+        self.stdout.write(header)
+        rows = [*report['endpoints'].items(), ('total', report['total'])]
+        for name, row in rows:
+            self.stdout.write(
+                f'{name:<12} {row["requests"]:>8} {row["errors"]:>7} {row["error_rate"] * 100:>6.2f} '
+                f'{row["rps"]:>8.1f} {row["p50_ms"]:>8.2f} {row["p95_ms"]:>8.2f} '
+                f'{row["p99_ms"]:>8.2f} {row["max_ms"]:>8.2f}'
+            )
+        message = f'{report["total"]["requests"]} requests in {report["seconds"]:.2f}s'
+        style = self.style.ERROR if report['total']['errors'] else self.style.SUCCESS
+        self.stdout.write(style(message))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tasks.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет записи об удалённых задачах старше TASKS_TOMBSTONE_RETENTION_DAYS: клиенты ленты '
+        'изменений с более старым токеном получают 410. Запускается периодически, например раз в сутки из cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Сколько дней хранить записи об удалённых задачах, по умолчанию TASKS_TOMBSTONE_RETENTION_DAYS.',
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune_tombstones(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} tombstones'))
@@ -0,0 +1,33 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services import recompute_statuses
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статусы задач, перешедших границу дедлайна (set-based UPDATE).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Дата, относительно которой считается просрочка (YYYY-MM-DD), по умолчанию сегодня.',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Также исправить любые другие расхождения статуса (просмотр всей таблицы).',
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+
+        counts = recompute_statuses(today=today, full=options['full'])
+        for transition, count in counts.items():
+            self.stdout.write(f'{transition}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Updated {sum(counts.values())} tasks'))
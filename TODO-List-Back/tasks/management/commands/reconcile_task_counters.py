@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from tasks.stats import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет счётчики статистики (TaskCounter) с таблицей задач и исправляет расхождения. '
+        'Запускается периодически, например раз в сутки из cron.'
+    )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_counters()
+        for (dimension, key), (old, new) in sorted(fixed.items()):
+            self.stdout.write(f'{dimension}:{key or "-"}: {old} -> {new}')
+        self.stdout.write(self.style.SUCCESS(f'Fixed {len(fixed)} counters'))
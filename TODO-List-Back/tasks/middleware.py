@@ -0,0 +1,179 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from .compression import CODECS, acompress_chunks, compress_chunks, is_compressible, negotiate, response_options
+from .instrumentation import collect, log_fields, server_timing
+from .routers import pin_to_primary, replica_alias, unpin
+
+logger = logging.getLogger('tasks.instrumentation')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaPinningMiddleware:
+    """
+    Запросы на запись и клиенты, писавшие последние TASKS_REPLICA_LAG секунд,
+    работают с основной БД. После записи клиенту ставится cookie с временем,
+    до которого он читает из основной БД (защита от отставания реплики).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if replica_alias() is None:
+            return self.get_response(request)
+        token = pin_to_primary() if self.needs_primary(request) else None
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                unpin(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        if replica_alias() is None:
+            return await self.get_response(request)
+        token = pin_to_primary() if self.needs_primary(request) else None
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                unpin(token)
+        return self.process_response(request, response)
+
+    @staticmethod
+    def needs_primary(request):
+        if request.method not in SAFE_METHODS:
+            return True
+        try:
+            return float(request.COOKIES.get(settings.TASKS_PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    @staticmethod
+    def process_response(request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            lag = settings.TASKS_REPLICA_LAG
+            response.set_cookie(
+                settings.TASKS_PRIMARY_COOKIE, str(time.time() + lag),
+                max_age=lag, httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class InstrumentationMiddleware:
+    """
+    Время запроса, время и количество SQL-запросов, время сериализации:
+    заголовок Server-Timing и строка JSON в логгер tasks.instrumentation.
+    Включается TASKS_INSTRUMENTATION; выключенный не входит в цепочку
+    middleware. Для потоковых ответов время - до начала отдачи тела.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TASKS_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect() as metrics:
+            response = self.get_response(request)
+        return self.process_response(request, response, metrics)
+
+    async def __acall__(self, request):
+        with collect() as metrics:
+            response = await self.get_response(request)
+        return self.process_response(request, response, metrics)
+
+    @staticmethod
+    def process_response(request, response, metrics):
+        total = metrics.elapsed()
+        if settings.TASKS_INSTRUMENTATION_HEADER:
+            response['Server-Timing'] = server_timing(metrics, total)
+        if total * 1000 >= settings.TASKS_INSTRUMENTATION_LOG_MS and logger.isEnabledFor(logging.INFO):
+            fields = log_fields(request, response, metrics, total)
+            logger.info(json.dumps(fields), extra={'metrics': fields})
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов API кодировкой, согласованной по Accept-Encoding
+    (TASKS_COMPRESSION_ENCODINGS: zstd, br, gzip). Обычные ответы сжимаются,
+    если тело не меньше TASKS_COMPRESSION_MIN_SIZE байт и сжатое меньше исходного;
+    потоковые - по мере отдачи, каждый кусок сразу уходит клиенту.
+    Представление меняет настройки декоратором tasks.compression.compression.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TASKS_COMPRESSION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    @staticmethod
+    def process_response(request, response):
+        if response.has_header('Content-Encoding') or not is_compressible(response.get('Content-Type', '')):
+            return response
+        options = response_options(response)
+        if not options['enabled']:
+            return response
+        if not response.streaming and len(response.content) < options['min_size']:
+            return response
+
+        # Ответ зависит от Accept-Encoding, даже если клиенту сжатие не подошло
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''), options['encodings'])
+        if encoding is None:
+            return response
+        stream = CODECS[encoding](options['levels'][encoding])
+
+        if response.streaming:
+            chunks = response.streaming_content
+            if response.is_async:
+                response.streaming_content = acompress_chunks(chunks, stream)
+            else:
+                response.streaming_content = compress_chunks(chunks, stream)
+            del response['Content-Length']
+        else:
+            content = stream.finish(response.content)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        # Сжатое тело отличается побайтно, но представление то же
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
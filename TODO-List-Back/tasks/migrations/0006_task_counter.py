@@ -0,0 +1,46 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:40
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    # Та же раскладка, что в tasks.stats.counter_keys на момент миграции
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounter = apps.get_model('tasks', 'TaskCounter')
+    counts = Counter()
+    groups = Task.objects.order_by().values_list('priority', 'is_completed_by_user', 'deadline') \
+        .annotate(total=Count('id'))
+    for priority, completed, deadline, total in groups:
+        counts[('priority', priority)] += total
+        counts[('done' if completed else 'open', str(deadline) if deadline else '')] += total
+    TaskCounter.objects.bulk_create([
+        TaskCounter(dimension=dimension, key=key, count=count)
+        for (dimension, key), count in counts.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=16)),
+                ('key', models.CharField(blank=True, max_length=16)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskcounter',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key'), name='task_counter_dimension_key'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:44
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def number_existing_changes(apps, schema_editor):
+    # Существующие задачи и удаления получают номера по id, последовательность - следующий
+    Task = apps.get_model('tasks', 'Task')
+    TaskTombstone = apps.get_model('tasks', 'TaskTombstone')
+    TaskChangeSequence = apps.get_model('tasks', 'TaskChangeSequence')
+    db_alias = schema_editor.connection.alias
+    last_task = Task.objects.using(db_alias).aggregate(last=Max('id'))['last'] or 0
+    last_tombstone = TaskTombstone.objects.using(db_alias).aggregate(last=Max('id'))['last'] or 0
+    Task.objects.using(db_alias).update(change_seq=F('id'))
+    TaskTombstone.objects.using(db_alias).update(change_seq=F('id') + last_task)
+    TaskChangeSequence.objects.using(db_alias).create(id=1, value=last_task + last_tombstone)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChangeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='change_seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['change_seq', 'id'], name='task_change_seq_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['change_seq', 'task_id'], name='tombstone_change_seq_idx'),
+        ),
+        migrations.RunPython(number_existing_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_change_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='status_changed_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
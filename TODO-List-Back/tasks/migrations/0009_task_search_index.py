@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import tasks.search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_status_changed_seq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSearchIndex',
+            fields=[
+                ('task', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='tasks.task')),
+                ('document', tasks.search.FTSDocumentField(db_column='tasks_task_fts')),
+            ],
+            options={
+                'db_table': 'tasks_task_fts',
+                'managed': False,
+            },
+        ),
+    ]
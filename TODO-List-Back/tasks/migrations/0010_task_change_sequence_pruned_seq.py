@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskchangesequence',
+            name='pruned_seq',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
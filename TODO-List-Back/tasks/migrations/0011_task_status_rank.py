@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+STATUS_RANKS = {'Active': 1, 'Completed': 2, 'Overdue': 3, 'Late': 4}
+
+
+def fill_status_rank(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    for status, rank in STATUS_RANKS.items():
+        Task.objects.filter(status=status).update(status_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_change_sequence_pruned_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='status_rank',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(fill_status_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status_rank', 'id'], name='task_status_rank_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.16 on 2026-10-18 16:40
+
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def refill_counters(apps, schema_editor):
+    # 0006 заполняла счётчики через router, а не в мигрируемой БД (например, реплике):
+    # пересчитываем их заново на этом соединении. Раскладка - как в 0006
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounter = apps.get_model('tasks', 'TaskCounter')
+    db_alias = schema_editor.connection.alias
+    counts = Counter()
+    groups = Task.objects.using(db_alias).order_by().values_list('priority', 'is_completed_by_user', 'deadline') \
+        .annotate(total=Count('id'))
+    for priority, completed, deadline, total in groups:
+        counts[('priority', priority)] += total
+        counts[('done' if completed else 'open', str(deadline) if deadline else '')] += total
+    TaskCounter.objects.using(db_alias).all().delete()
+    TaskCounter.objects.using(db_alias).bulk_create([
+        TaskCounter(dimension=dimension, key=key, count=count)
+        for (dimension, key), count in counts.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_task_status_rank'),
+    ]
+
+    operations = [
+        migrations.RunPython(refill_counters, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
 from itertools import filterfalse
 
-from django.db import models
+from django.db import DatabaseError, connections, models, router, transaction
 from django.utils import timezone
 
+from .search import FTS_TABLE, FTSDocumentField
+
 class Task(models.Model):
     # Перечисления
     class Status(models.TextChoices):
@@ -17,6 +19,21 @@ class Task(models.Model):
         HIGH = 'High', 'High'
         CRITICAL = 'Critical', 'Critical'
 
+    # Числовой ранг приоритета: сортировка по индексу вместо CASE
+    PRIORITY_RANKS = {
+        Priority.LOW: 1,
+        Priority.MEDIUM: 2,
+        Priority.HIGH: 3,
+        Priority.CRITICAL: 4,
+    }
+    # Ранг статуса для сортировки task_status: Active → Completed → Overdue → Late
+    STATUS_RANKS = {
+        Status.ACTIVE: 1,
+        Status.COMPLETED: 2,
+        Status.OVERDUE: 3,
+        Status.LATE: 4,
+    }
+
     # Атрибуты задачи
     title = models.CharField( max_length=255)
     description = models.TextField(blank=True, default='')
@@ -26,22 +43,62 @@ class Task(models.Model):
         choices=Status.choices,
         default=Status.ACTIVE
     )
+    status_rank = models.PositiveSmallIntegerField(default=1, editable=False)  # синхронизируется с status
     priority = models.CharField(
         max_length=10,
         choices=Priority.choices,
         default=Priority.MEDIUM
     )
+    priority_rank = models.PositiveSmallIntegerField(default=2, editable=False)  # синхронизируется с priority
     created_at = models.DateField(auto_now_add=True)  # недоступно для редактирования
     updated_at = models.DateField(null=True, blank=True)  # можно null
+    # Точное время изменения и версия строки для ETag / Last-Modified
+    modified_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # Номер последнего изменения для GET /api/tasks/changes/ (TaskChangeSequence)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    # change_seq изменения, в котором сменился status (событие status в /api/tasks/events/)
+    status_changed_seq = models.BigIntegerField(default=0, editable=False)
 
     def save(self, *args, **kwargs):
         if self.pk:  # если объект уже существует (редактирование)
             self.updated_at = timezone.now().date()
+        if not self._state.adding:
+            # Инкремент в SQL, чтобы параллельные сохранения не получили одну версию
+            self.version = models.F('version') + 1
+            # Только UPDATE: если строку уже удалили, Django иначе попробовал бы INSERT с F()
+            if not kwargs.get('force_insert'):
+                kwargs['force_update'] = True
         self._update_status()
-        super().save(*args, **kwargs)
+        self._update_priority_rank()
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        try:
+            with transaction.atomic(using=using):
+                self.change_seq = TaskChangeSequence.allocate(using)
+                super().save(*args, **kwargs)
+        except DatabaseError:
+            # UPDATE не нашёл строку - задачу удалили параллельным запросом
+            if kwargs.get('force_update') and not Task.objects.using(using).filter(pk=self.pk).exists():
+                raise self.DoesNotExist(f'Task {self.pk} was deleted.') from None
+            raise
 
     is_completed_by_user = models.BooleanField(default=False)
 
+    class Meta:
+        # Индексы под фильтры и сортировки списка, id - тайбрейк keyset-пагинации
+        indexes = [
+            models.Index(fields=['title', 'id'], name='task_title_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='task_created_id_idx'),
+            models.Index(fields=['deadline', 'id'], name='task_deadline_id_idx'),
+            models.Index(fields=['priority_rank', 'id'], name='task_prio_rank_id_idx'),
+            models.Index(fields=['status_rank', 'id'], name='task_status_rank_id_idx'),
+            models.Index(fields=['is_completed_by_user', 'id'], name='task_completed_id_idx'),
+            models.Index(fields=['priority', 'title', 'id'], name='task_prio_title_idx'),
+            models.Index(fields=['is_completed_by_user', 'deadline'], name='task_completed_dl_idx'),
+            models.Index(fields=['status', 'deadline'], name='task_status_dl_idx'),
+            models.Index(fields=['change_seq', 'id'], name='task_change_seq_id_idx'),
+        ]
+
 
     def _update_status(self):
         now = timezone.now().date()
@@ -56,11 +113,110 @@ class Task(models.Model):
                 self.status = self.Status.OVERDUE
             else:
                 self.status = self.Status.ACTIVE
+        self.status_rank = self.STATUS_RANKS[self.status]
+
+    def _update_priority_rank(self):
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, len(self.PRIORITY_RANKS) + 1)
 
     def edit_mark(self):
         self.is_completed_by_user = True if not self.is_completed_by_user else False
         self.save()
 
+    async def aedit_mark(self):
+        self.is_completed_by_user = not self.is_completed_by_user
+        await self.asave()
+
+
+    def __str__(self):
+        return f"{self.title} [{self.status}]"
+
+
+class TaskSearchIndex(models.Model):
+    """
+    FTS5-индекс задач (tasks/search.py) для JOIN в поиске: rowid - id задачи.
+    Таблицу создаёт и поддерживает install_fts, миграции Django её не трогают.
+    """
+    task = models.OneToOneField(
+        Task, primary_key=True, db_column='rowid', related_name='search_index',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    document = FTSDocumentField(db_column=FTS_TABLE)
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
+class TaskTombstone(models.Model):
+    """Запись об удалённой задаче: нужна, чтобы изменение списка было видно и после удаления."""
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+    change_seq = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['change_seq', 'task_id'], name='tombstone_change_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted task {self.task_id}"
+
+
+class TaskChangeSequence(models.Model):
+    """
+    Последний выданный номер изменения задач (одна строка).
+    Номер берётся внутри транзакции записи: строка остаётся заблокированной
+    до COMMIT, поэтому транзакции фиксируются в порядке номеров и клиент,
+    прочитавший изменения до номера N, не пропустит меньший номер позже.
+    """
+    value = models.BigIntegerField(default=0)
+    # Записи TaskTombstone с номером до pruned_seq включительно удалены (prune_tombstones):
+    # токен ленты изменений не новее этого номера уже не даёт полного списка удалений
+    pruned_seq = models.BigIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls, using=None):
+        """Следующий номер одним INSERT ... ON CONFLICT ... RETURNING (SQLite 3.35+, PostgreSQL)."""
+        using = using or router.db_for_write(cls)
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        table, pk, value, pruned_seq = (quote(name) for name in (cls._meta.db_table, 'id', 'value', 'pruned_seq'))
+        with connection.cursor() as cursor:
+            # Подставляются только имена таблицы и столбцов модели через quote_name, без ввода
+            cursor.execute(
+                f'INSERT INTO {table} ({pk}, {value}, {pruned_seq}) VALUES (1, 1, 0) '  # nosec B608
+                f'ON CONFLICT ({pk}) DO UPDATE SET {value} = {table}.{value} + 1 RETURNING {value}'
+            )
+            return cursor.fetchone()[0]
+
+
+class TaskImportCheckpoint(models.Model):
+    """Прогресс импорта файла: сохраняется в той же транзакции, что и пачка задач."""
+    source = models.CharField(max_length=1024, unique=True)  # абсолютный путь к файлу
+    offset = models.BigIntegerField(default=0)  # байт, с которого продолжать чтение
+    line = models.BigIntegerField(default=0)  # номер последней обработанной строки файла
+    created = models.BigIntegerField(default=0)
+    skipped = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.offset}"
+
+
+class TaskCounter(models.Model):
+    """
+    Количество задач по измерению: priority - по приоритету, open / done -
+    невыполненные / выполненные по дате дедлайна ('' - без дедлайна).
+    Поддерживается инкрементально (tasks/stats.py), сверяется reconcile_task_counters.
+    """
+    dimension = models.CharField(max_length=16)
+    key = models.CharField(max_length=16, blank=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='task_counter_dimension_key'),
+        ]
 
     def __str__(self):
-        return f"{self.title} [{self.status}]"
\ No newline at end of file
+        return f"{self.dimension}:{self.key} = {self.count}"
@@ -0,0 +1,195 @@
+import base64
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Case, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагинация по текущей сортировке queryset.
+
+    Ключи берутся из order_by (включая аннотации вроде deadline_order),
+    последний ключ всегда id, поэтому порядок стабилен. Следующая страница
+    выбирается условием WHERE по значениям последней строки, без OFFSET.
+    Включается, только если в запросе есть cursor или page_size, иначе
+    список отдаётся целиком, как раньше.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        if not queryset.query.order_by:
+            queryset = queryset.order_by('id')
+        self.ordering = self.get_ordering(queryset)
+
+        values = self.decode_cursor(request)
+        # Берём на одну строку больше, чтобы понять, есть ли следующая страница
+        try:
+            groups = self.get_groups(queryset)
+            if groups is None:
+                if values is not None:
+                    queryset = queryset.filter(self.get_keyset_filter(values, self.ordering))
+                results = list(queryset[:self.page_size + 1])
+            else:
+                results = self.fetch_groups(queryset, groups, values, self.page_size + 1)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def get_ordering(queryset):
+        """Превращает order_by в список (имя поля, по убыванию) с id в конце."""
+        ordering = []
+        for item in queryset.query.order_by:
+            name = item.lstrip('-')
+            ordering.append(('id' if name == 'pk' else name, item.startswith('-')))
+        if ordering[-1][0] != 'id':
+            ordering.append(('id', False))
+        return ordering
+
+    def get_groups(self, queryset):
+        """
+        Если первый ключ - CASE-аннотация с константами (deadline_order), то
+        [(значение, условие When)] в порядке сортировки, иначе None. По такой
+        аннотации нет индекса, поэтому группы выбираются отдельными запросами
+        по остальным ключам. Условия When должны покрывать все строки и не пересекаться.
+        """
+        name, is_desc = self.ordering[0]
+        annotation = queryset.query.annotations.get(name)
+        if not isinstance(annotation, Case) or len(self.ordering) < 2:
+            return None
+        groups = [(when.result.value, when.condition) for when in annotation.cases]
+        return sorted(groups, key=lambda group: group[0], reverse=is_desc)
+
+    def fetch_groups(self, queryset, groups, values, limit):
+        """
+        До limit строк, группа за группой: в каждой - диапазон по индексу
+        остальных ключей (для deadline - сначала (deadline, id), затем NULL по id).
+        """
+        ordering = self.ordering[1:]
+        queryset = queryset.order_by(*[('-' if is_desc else '') + name for name, is_desc in ordering])
+        if values is not None and values[0] not in [value for value, _ in groups]:
+            raise ValueError('Unknown keyset group')
+
+        results = []
+        started = values is None
+        for value, condition in groups:
+            if not started and value != values[0]:
+                continue
+            group = queryset.filter(condition)
+            if not started:
+                # Группа курсора: продолжаем после его строки
+                group = group.filter(self.get_keyset_filter(values[1:], ordering))
+                started = True
+            results += group[:limit - len(results)]
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def get_keyset_filter(values, ordering):
+        """
+        k1 >= v1 AND ((k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...) с учётом направления
+        каждого ключа. Ведущее условие по k1 даёт поиск по индексу (k1, ...) вместо
+        просмотра с начала. NULL встречается только у deadline, а группы NULL/не NULL
+        выбираются отдельно (get_groups), поэтому для NULL достаточно равенства.
+        """
+        conditions = []
+        equal = Q()
+        for (name, is_desc), value in zip(ordering, values):
+            if value is None:
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                lookup = 'lt' if is_desc else 'gt'
+                conditions.append(equal & Q(**{f'{name}__{lookup}': value}))
+                same = Q(**{name: value})
+            equal &= same
+        if not conditions:
+            raise ValueError('Empty keyset')
+        keyset = reduce(operator.or_, conditions)
+        (name, is_desc), value = ordering[0], values[0]
+        if value is not None:
+            keyset &= Q(**{f'{name}__{"lte" if is_desc else "gte"}': value})
+        return keyset
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, name) for name, _ in self.ordering]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(values),
+        )
+
+    def encode_cursor(self, values):
+        payload = {'o': self.ordering_signature(), 'v': values}
+        raw = json.dumps(payload, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values = payload['v']
+            signature = payload['o']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # Курсор от другой сортировки применять нельзя
+        if signature != self.ordering_signature() or not isinstance(values, list) \
+                or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def ordering_signature(self):
+        return [('-' if is_desc else '') + name for name, is_desc in self.ordering]
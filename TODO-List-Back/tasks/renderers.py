@@ -0,0 +1,11 @@
+from rest_framework.renderers import JSONRenderer
+
+from .instrumentation import measure_serialization
+
+
+class TaskJSONRenderer(JSONRenderer):
+    """JSONRenderer с учётом времени сериализации в метриках запроса (tasks.instrumentation)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,59 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Закреплён ли текущий запрос (поток / async-задача) за основной БД
+_pinned = contextvars.ContextVar('tasks_db_pinned', default=False)
+
+
+def replica_alias():
+    """Алиас реплики, если она настроена в DATABASES, иначе None."""
+    alias = settings.TASKS_REPLICA_ALIAS
+    return alias if alias in connections.databases else None
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def pin_to_primary():
+    """Закрепляет текущий контекст за основной БД; возвращает токен для unpin."""
+    return _pinned.set(True)
+
+
+def unpin(token):
+    _pinned.reset(token)
+
+
+@contextmanager
+def use_primary():
+    token = pin_to_primary()
+    try:
+        yield
+    finally:
+        unpin(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Чтение - с реплики, запись - в основную БД. Закреплённый контекст
+    (запрос на запись или клиент, недавно писавший) читает из основной БД,
+    чтобы видеть свои изменения несмотря на отставание реплики.
+    """
+
+    def db_for_read(self, model, **hints):
+        if is_pinned():
+            return DEFAULT_DB_ALIAS
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и основная БД
+        databases = {DEFAULT_DB_ALIAS, settings.TASKS_REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,152 @@
+import re
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F, FloatField, Func, Lookup, Q, TextField, Value
+
+# Внешний FTS5-индекс по tasks_task (content=tasks_task), синхронизируется триггерами,
+# поэтому учитываются и bulk_create, и queryset.update()
+FTS_TABLE = 'tasks_task_fts'
+
+# Вес title и description в bm25
+FTS_WEIGHTS = (10.0, 1.0)
+
+# Атрибут соединения с результатом fts_available: таблица проверяется один раз на соединение
+FTS_AVAILABLE_ATTR = 'tasks_fts_available'
+
+# В SQL этого модуля подставляются только константы (FTS_TABLE, FTS_TRIGGERS, FTS_WEIGHTS),
+# пользовательский ввод передаётся параметрами MATCH - отсюда nosec B608
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': (
+        f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN '  # nosec B608
+        f'INSERT INTO {FTS_TABLE}(rowid, title, description) '
+        f'VALUES (new.id, new.title, new.description); '
+        f'END'
+    ),
+    f'{FTS_TABLE}_ad': (
+        f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN '  # nosec B608
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) '
+        f"VALUES ('delete', old.id, old.title, old.description); "
+        f'END'
+    ),
+    f'{FTS_TABLE}_au': (
+        f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON tasks_task BEGIN '  # nosec B608
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) '
+        f"VALUES ('delete', old.id, old.title, old.description); "
+        f'INSERT INTO {FTS_TABLE}(rowid, title, description) '
+        f'VALUES (new.id, new.title, new.description); '
+        f'END'
+    ),
+}
+
+
+def install_fts(connection):
+    """
+    Создаёт FTS5-таблицу и триггеры, если их нет (только SQLite со сборкой FTS5).
+    SQLite теряет триггеры при пересоздании tasks_task в миграциях,
+    поэтому функция вызывается и после каждого migrate; индекс
+    перестраивается только если чего-то не хватало.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+        if 'tasks_task' not in existing:
+            return False
+        missing = [name for name in FTS_TRIGGERS if name not in existing]
+        if FTS_TABLE in existing and not missing:
+            return True
+
+        try:
+            with transaction.atomic(using=connection.alias):
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                    f"title, description, content='tasks_task', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                )
+        except DatabaseError:
+            # SQLite собран без FTS5 - остаётся поиск через LIKE
+            return False
+
+        for name in missing:
+            cursor.execute(FTS_TRIGGERS[name])
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")  # nosec B608
+    setattr(connection, FTS_AVAILABLE_ATTR, True)
+    return True
+
+
+def uninstall_fts(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in FTS_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    setattr(connection, FTS_AVAILABLE_ATTR, False)
+
+
+def fts_available(using='default'):
+    """Есть ли FTS5-индекс; проверяется один раз на соединение, install_fts / uninstall_fts сбрасывают ответ."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    available = getattr(connection, FTS_AVAILABLE_ATTR, None)
+    if available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            available = cursor.fetchone() is not None
+        setattr(connection, FTS_AVAILABLE_ATTR, available)
+    return available
+
+
+class FTSDocumentField(TextField):
+    """Скрытый столбец FTS5-таблицы с её именем: левая часть MATCH и первый аргумент bm25."""
+
+
+@FTSDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+def build_match_query(text):
+    """
+    Превращает пользовательский ввод в запрос MATCH: каждое слово в кавычках
+    с префиксным '*', слова объединяются через AND. Синтаксис FTS5 из ввода
+    не пробрасывается.
+    """
+    tokens = re.findall(r'\w+', text)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_tasks(queryset, text):
+    """
+    Фильтр по title и description: FTS5, если доступен, иначе LIKE.
+    С FTS задачи соединяются с индексом (TaskSearchIndex) по rowid: MATCH
+    выполняется один раз на запрос, а search_rank_expression берёт ранг из того же JOIN.
+    """
+    match = build_match_query(text)
+    if not match:
+        return queryset
+    if fts_available(queryset.db):
+        return queryset.filter(search_index__document__match=match)
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def search_rank_expression(text, using='default'):
+    """
+    bm25-ранг совпадения (меньше - релевантнее) или None без FTS.
+    Только для queryset после search_tasks: bm25 вычисляется по строкам MATCH.
+    """
+    match = build_match_query(text)
+    if not match or not fts_available(using):
+        return None
+    return Func(
+        F('search_index__document'), *(Value(weight) for weight in FTS_WEIGHTS),
+        function='bm25', output_field=FloatField(),
+    )
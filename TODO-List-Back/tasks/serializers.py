@@ -1,5 +1,17 @@
+from functools import lru_cache
+
 from rest_framework import serializers
 from .models import Task
+from .search import build_match_query
+
+# Компактное представление списка (?view=summary): только то, что показывает доска
+TASK_SUMMARY_FIELDS = ('id', 'title', 'deadline', 'priority', 'is_completed_by_user')
+# Представления ответа; None - все поля TaskSerializer
+TASK_VIEWS = {'full': None, 'summary': TASK_SUMMARY_FIELDS}
+# Сколько id можно запросить за раз в GET /api/tasks/batch/
+TASK_BATCH_LIMIT = 100
+# Верхняя граница BigAutoField: большее число SQLite не примет в параметрах запроса
+TASK_ID_MAX = 2 ** 63 - 1
 
 class LenientDateField(serializers.DateField):
     def to_internal_value(self, value):
@@ -18,7 +30,112 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = '__all__'
+        exclude = ('priority_rank', 'status_rank', 'modified_at', 'version', 'change_seq', 'status_changed_seq')
+
+    def __init__(self, *args, fields=None, **kwargs):
+        # fields - набор полей ответа (task_fieldset), None - все
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def _requested_fields(params, name, keys):
+    value = params.get(name)
+    if not value:
+        return None
+    names = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [item for item in names if item not in keys]
+    if unknown:
+        raise serializers.ValidationError({name: [f'Unknown fields: {", ".join(unknown)}.']})
+    return names
+
+
+def task_fieldset(params):
+    """
+    Поля ответа по ?view=, ?fields= и ?exclude= в порядке TaskSerializer;
+    fields заменяет набор представления, exclude убирает из него поля.
+    None - все поля. Неизвестные поля и представления - ValidationError (400).
+    """
+    keys, _ = task_list_layout()
+    view = params.get('view') or 'full'
+    if view not in TASK_VIEWS:
+        message = f'Unknown view "{view}", expected one of: {", ".join(TASK_VIEWS)}.'
+        raise serializers.ValidationError({'view': [message]})
+    selected = _requested_fields(params, 'fields', keys) or TASK_VIEWS[view]
+    exclude = _requested_fields(params, 'exclude', keys)
+    if selected is None and exclude is None:
+        return None
+    selected = set(keys if selected is None else selected) - set(exclude or ())
+    if not selected:
+        raise serializers.ValidationError({'fields': ['No fields selected.']})
+    return tuple(key for key in keys if key in selected)
+
+
+@lru_cache(maxsize=None)
+def task_list_layout(fields=None):
+    """Порядок ключей TaskSerializer (или набора fields) и позиции полей-дат, вычисляются один раз."""
+    serializer_fields = TaskSerializer().fields
+    keys = fields or tuple(serializer_fields)
+    date_positions = tuple(
+        index for index, key in enumerate(keys)
+        if isinstance(serializer_fields[key], serializers.DateField)
+    )
+    return keys, date_positions
+
+
+def iter_task_rows(queryset, chunk_size=None, fields=None):
+    """
+    Кортежи values_list() в словари с ключами и датами как у TaskSerializer,
+    без ModelSerializer на каждую задачу. С chunk_size строки читаются
+    курсором БД порциями, и весь набор не держится в памяти.
+    С fields в SELECT попадают только эти столбцы.
+    """
+    keys, _ = task_list_layout(fields)
+    rows = queryset.values_list(*keys)
+    if chunk_size:
+        rows = rows.iterator(chunk_size=chunk_size)
+    return task_rows_to_dicts(rows, fields)
+
+
+def task_rows_to_dicts(rows, fields=None):
+    keys, date_positions = task_list_layout(fields)
+    for row in rows:
+        if date_positions:
+            row = list(row)
+            for index in date_positions:
+                if row[index] is not None:
+                    row[index] = row[index].isoformat()
+        yield dict(zip(keys, row))
+
+
+def task_list_data(queryset, fields=None):
+    """
+    Быстрый путь для списка: JSONRenderer выдаёт для этих словарей
+    те же байты, что и для TaskSerializer(many=True, fields=fields).data.
+    """
+    return list(iter_task_rows(queryset, fields=fields))
+
+
+def task_batch_data(queryset, ids, fields=None):
+    """
+    Задачи с id из ids одним запросом id IN (...), в порядке ids;
+    возвращает (данные задач, id, которых нет).
+    """
+    # id нужен для порядка, даже если его нет среди полей ответа
+    lookup = fields if fields is None or 'id' in fields else ('id', *fields)
+    found = {row['id']: row for row in iter_task_rows(queryset.filter(id__in=ids), fields=lookup)}
+    if lookup is not fields:
+        for row in found.values():
+            del row['id']
+    return [found[pk] for pk in ids if pk in found], [pk for pk in ids if pk not in found]
+
+
+async def atask_list_data(queryset, fields=None):
+    """task_list_data через async ORM."""
+    keys, _ = task_list_layout(fields)
+    rows = [row async for row in queryset.values_list(*keys)]
+    return list(task_rows_to_dicts(rows, fields))
 
 
 # Для создания и изменения (POST, PUT, PATCH)
@@ -32,5 +149,78 @@ class TaskCreateAndUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = '__all__' # title, description, deadline, priority
-        read_only_fields = ('id', 'is_completed_by_user', 'created_at', 'updated_at', 'status')
\ No newline at end of file
+        exclude = ('priority_rank', 'status_rank', 'modified_at', 'version', 'change_seq', 'status_changed_seq') # title, description, deadline, priority
+        read_only_fields = ('id', 'is_completed_by_user', 'created_at', 'updated_at', 'status')
+
+
+# Параметры services.filter_tasks и значения, при которых фильтр применяется;
+# остальные значения filter_tasks молча пропускает
+TASK_FILTERS = {
+    'title': lambda value: bool(value.strip()),
+    'q': lambda value: bool(build_match_query(value)),
+    'priority': lambda value: value in Task.Priority.values,
+    'status': lambda value: value in ('true', 'false'),
+    'task_status': lambda value: value in Task.Status.values,
+}
+
+
+# Выбор задач для массовых операций: список id или фильтр как в GET /api/tasks/
+class TaskBulkSelectionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = serializers.DictField(child=serializers.CharField(allow_blank=True), required=False)
+
+    def validate_filter(self, value):
+        # Опечатка в ключе или значении не должна превращать фильтр в "все задачи"
+        unknown = sorted(set(value) - set(TASK_FILTERS))
+        if unknown:
+            raise serializers.ValidationError(
+                f'Unknown filter keys: {", ".join(unknown)}. Expected: {", ".join(TASK_FILTERS)}.'
+            )
+        invalid = sorted(key for key, item in value.items() if item.strip() and not TASK_FILTERS[key](item))
+        if invalid:
+            raise serializers.ValidationError(f'Invalid filter values: {", ".join(invalid)}.')
+        if not any(TASK_FILTERS[key](item) for key, item in value.items()):
+            raise serializers.ValidationError('Filter must restrict the selection: give at least one non-empty value.')
+        return value
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Specify exactly one of "ids" or "filter".')
+        return attrs
+
+
+class TaskBulkUpdateSerializer(TaskBulkSelectionSerializer):
+    patch = serializers.DictField()
+
+    def validate_patch(self, value):
+        if not value:
+            raise serializers.ValidationError('Patch must not be empty.')
+        serializer = TaskCreateAndUpdateSerializer(data=value, partial=True)
+        serializer.is_valid(raise_exception=True)
+        # Поля только для чтения отбрасываются сериализатором
+        if not serializer.validated_data:
+            raise serializers.ValidationError('Patch has no editable fields.')
+        return serializer.validated_data
+
+
+class CommaSeparatedIntegersField(serializers.ListField):
+    """Список чисел из query-параметра: ?ids=1,2,3 или ?ids=1&ids=2."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        if isinstance(data, list):
+            data = [item.strip() for value in data for item in str(value).split(',') if item.strip()]
+        return super().to_internal_value(data)
+
+
+# ?ids= для GET /api/tasks/batch/
+class TaskBatchSerializer(serializers.Serializer):
+    ids = CommaSeparatedIntegersField(
+        child=serializers.IntegerField(min_value=1, max_value=TASK_ID_MAX),
+        allow_empty=False, max_length=TASK_BATCH_LIMIT,
+    )
+
+    def validate_ids(self, value):
+        # Повторы отдаются один раз, на месте первого упоминания
+        return list(dict.fromkeys(value))
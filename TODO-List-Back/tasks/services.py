@@ -0,0 +1,353 @@
+from collections import Counter
+
+from django.db import connections, router, transaction
+from django.db.models import Case, CharField, F, IntegerField, Q, Value, When
+from django.db.models.lookups import Exact
+from django.utils import timezone
+
+from . import cache
+from .events import notify_subscribers
+from .models import Task, TaskChangeSequence, TaskTombstone
+from .search import search_rank_expression, search_tasks
+from .stats import add_rows, apply_deltas, grouped_rows, task_counter_row
+
+# Размер пачки для bulk_create (Django сам уменьшит его под лимиты backend)
+BULK_CHUNK_SIZE = 1000
+
+# Условия-константы для status_expression
+ALWAYS = Q(pk__isnull=False)
+NEVER = Q(pk__in=[])
+
+
+def row_change_fields(status=None):
+    """
+    Поля, которые save() меняет при любой правке; для queryset.update().
+    Вызывается внутри транзакции записи: номер изменения общий для всех строк UPDATE.
+    status - новое значение или выражение статуса; строкам, где он действительно
+    меняется, проставляется status_changed_seq.
+    """
+    change_seq = TaskChangeSequence.allocate()
+    fields = {'modified_at': timezone.now(), 'version': F('version') + 1, 'change_seq': change_seq}
+    if status is not None:
+        fields['status'] = status
+        fields['status_rank'] = status_rank_expression(status)
+        # В SET справа видны старые значения строки
+        fields['status_changed_seq'] = Case(
+            When(status=status, then=F('status_changed_seq')),
+            default=Value(change_seq),
+        )
+    return fields
+
+
+def filter_tasks(queryset, params):
+    """Фильтры списка задач: те же параметры, что в GET /api/tasks/."""
+    # --- Фильтрация по названию ---
+    title_filter = params.get('title')
+    if title_filter:
+        queryset = queryset.filter(title__icontains=title_filter)
+
+    # --- Полнотекстовый поиск по названию и описанию ---
+    search_query = params.get('q')
+    if search_query:
+        queryset = search_tasks(queryset, search_query)
+
+    # --- Фильтрация по приоритету ---
+    priority_filter = params.get('priority')
+    if priority_filter in ('Low', 'Medium', 'High', 'Critical'):
+        queryset = queryset.filter(priority=priority_filter)
+
+    # --- Фильтрация по статусу ---
+    is_completed_by_user = params.get('status')
+    if is_completed_by_user in ('true', 'false'):
+        queryset = queryset.filter(is_completed_by_user=(is_completed_by_user == 'true'))
+
+    # --- Фильтрация по фактическому статусу на сегодня (в SQL, не по полю status) ---
+    task_status = params.get('task_status')
+    if task_status in Task.Status.values:
+        queryset = queryset.filter(status_conditions()[task_status])
+
+    return queryset
+
+
+def sort_tasks(queryset, params):
+    """Сортировка списка задач по sort/order; id - последний ключ для keyset-пагинации."""
+    search_query = params.get('q')
+    sort_param = params.get('sort', 'relevance' if search_query else 'title')
+    order_param = params.get('order', 'asc')
+
+    is_desc = order_param == 'desc'
+    # id как последний ключ сортировки: стабильный порядок для keyset-пагинации
+    tiebreaker = '-id' if is_desc else 'id'
+
+    search_rank = None
+    if sort_param == 'relevance' and search_query:
+        search_rank = search_rank_expression(search_query, queryset.db)
+
+    if search_rank is not None:
+        # По релевантности bm25: меньше - лучше, поэтому asc - самые релевантные первыми
+        queryset = queryset.annotate(search_rank=search_rank)
+        ordering = '-search_rank' if is_desc else 'search_rank'
+        queryset = queryset.order_by(ordering, tiebreaker)
+    elif sort_param == 'priority':
+        # Low (1) → Medium (2) → High (3) → Critical (4), по индексу priority_rank
+        ordering = '-priority_rank' if is_desc else 'priority_rank'
+        queryset = queryset.order_by(ordering, tiebreaker)
+
+    elif sort_param == 'deadline':
+        # Сортировка по дедлайну: NULLы в конце (или в начале). Обе группы заданы явно:
+        # keyset-пагинация выбирает их отдельными запросами по индексу (deadline, id)
+        null_group, dated_group = (0, 1) if is_desc else (1, 0)
+        queryset = queryset.annotate(
+            deadline_order=Case(
+                When(deadline__isnull=False, then=Value(dated_group)),
+                When(deadline__isnull=True, then=Value(null_group)),
+                output_field=IntegerField()
+            )
+        ).order_by('deadline_order', '-deadline' if is_desc else 'deadline', tiebreaker)
+    elif sort_param in ('title', 'relevance'):
+        # relevance без FTS (другой backend) - сортировка по названию
+        ordering = '-title' if is_desc else 'title'
+        queryset = queryset.order_by(ordering, tiebreaker)
+    elif sort_param == 'created_at':
+        ordering = '-created_at' if is_desc else 'created_at'
+        queryset = queryset.order_by(ordering, tiebreaker)
+    elif sort_param == 'status':
+        # Статус: незавершённые (False) → завершённые (True), по индексу
+        ordering = '-is_completed_by_user' if is_desc else 'is_completed_by_user'
+        queryset = queryset.order_by(ordering, tiebreaker)
+    elif sort_param == 'task_status':
+        # Active → Completed → Overdue → Late, по индексу status_rank.
+        # Порядок по сохранённому статусу: просрочку за прошедшие дни досчитывает recompute_statuses
+        ordering = '-status_rank' if is_desc else 'status_rank'
+        queryset = queryset.order_by(ordering, tiebreaker)
+
+    return queryset
+
+
+def select_task_fields(queryset, fields):
+    """
+    only() по полям ответа и полям сортировки: их значения нужны курсору
+    keyset-пагинации, а остальные столбцы (description) не читаются из БД.
+    """
+    if fields is None:
+        return queryset
+    model_fields = {field.name for field in Task._meta.concrete_fields}
+    ordering = {item.lstrip('-') for item in queryset.query.order_by} & model_fields
+    return queryset.only(*fields, *ordering)
+
+
+def status_conditions(today=None):
+    """Условия Q для каждого статуса на дату today, как в Task._update_status."""
+    today = today or timezone.now().date()
+    overdue = Q(deadline__lt=today)
+    completed = Q(is_completed_by_user=True)
+    not_completed = Q(is_completed_by_user=False)
+    return {
+        Task.Status.ACTIVE: not_completed & ~overdue,
+        Task.Status.COMPLETED: completed & ~overdue,
+        Task.Status.OVERDUE: not_completed & overdue,
+        Task.Status.LATE: completed & overdue,
+    }
+
+
+def status_rank_expression(status):
+    """Task.STATUS_RANKS для значения или SQL-выражения статуса."""
+    if isinstance(status, str):
+        return Task.STATUS_RANKS[status]
+    return Case(
+        *[When(Exact(status, Value(value)), then=Value(rank)) for value, rank in Task.STATUS_RANKS.items()],
+        output_field=IntegerField(),
+    )
+
+
+def status_expression(today=None, completed=None, overdue=None):
+    """
+    SQL-аналог Task._update_status.
+    completed и overdue - условия Q; по умолчанию берутся из текущих
+    значений is_completed_by_user и deadline строки.
+    """
+    today = today or timezone.now().date()
+    if completed is None:
+        completed = Q(is_completed_by_user=True)
+    if overdue is None:
+        overdue = Q(deadline__lt=today)
+    return Case(
+        When(completed & overdue, then=Value(Task.Status.LATE)),
+        When(completed, then=Value(Task.Status.COMPLETED)),
+        When(overdue, then=Value(Task.Status.OVERDUE)),
+        default=Value(Task.Status.ACTIVE),
+        output_field=CharField(),
+    )
+
+
+def bulk_create_tasks(items, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Создаёт задачи из уже провалидированных данных одной транзакцией.
+    Статус считается в Python для каждой строки, save() не вызывается.
+    Возвращает количество созданных задач.
+    """
+    return len(bulk_create_task_objects(items, chunk_size))
+
+
+def bulk_create_task_objects(items, chunk_size=BULK_CHUNK_SIZE):
+    """То же, что bulk_create_tasks, но возвращает созданные задачи (с id) в порядке items."""
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(items), chunk_size):
+            tasks = []
+            change_seq = TaskChangeSequence.allocate()
+            for data in items[start:start + chunk_size]:
+                task = Task(**data, change_seq=change_seq)
+                task._update_status()
+                task._update_priority_rank()
+                tasks.append(task)
+            Task.objects.bulk_create(tasks, batch_size=chunk_size)
+            apply_deltas(add_rows(Counter(), [(*task_counter_row(task), 1) for task in tasks]))
+            created += tasks
+    cache.invalidate()
+    notify_subscribers()
+    return created
+
+
+def bulk_update_tasks(queryset, data):
+    """
+    Применяет одинаковый патч ко всем задачам queryset одним UPDATE.
+    Статус пересчитывается в SQL с учётом нового дедлайна.
+    """
+    today = timezone.now().date()
+    overdue = None
+    if 'deadline' in data:
+        deadline = data['deadline']
+        overdue = ALWAYS if deadline and deadline < today else NEVER
+    if 'priority' in data:
+        data = {**data, 'priority_rank': Task.PRIORITY_RANKS[data['priority']]}
+    with transaction.atomic():
+        if 'priority' in data or 'deadline' in data:
+            # Счётчики: группы задач до патча уходят, те же группы с новыми значениями приходят
+            groups = counted_groups(queryset)
+            patched = [
+                (data.get('priority', priority), completed, data.get('deadline', deadline), total)
+                for priority, completed, deadline, total in groups
+            ]
+            apply_deltas(add_rows(add_rows(Counter(), groups, sign=-1), patched))
+        updated = queryset.update(
+            **data,
+            updated_at=today,
+            **row_change_fields(status=status_expression(today, overdue=overdue)),
+        )
+    cache.invalidate()
+    notify_subscribers()
+    return updated
+
+
+def bulk_toggle_tasks(queryset):
+    """
+    Переключает is_completed_by_user у всех задач queryset одним UPDATE.
+    В SET используются старые значения строки, поэтому статус считается
+    по инвертированному признаку выполнения.
+    """
+    today = timezone.now().date()
+    with transaction.atomic():
+        groups = counted_groups(queryset)
+        toggled_groups = [
+            (priority, not completed, deadline, total) for priority, completed, deadline, total in groups
+        ]
+        apply_deltas(add_rows(add_rows(Counter(), groups, sign=-1), toggled_groups))
+        toggled = queryset.update(
+            is_completed_by_user=Case(
+                When(is_completed_by_user=True, then=Value(False)),
+                default=Value(True),
+            ),
+            updated_at=today,
+            **row_change_fields(status=status_expression(today, completed=Q(is_completed_by_user=False))),
+        )
+    cache.invalidate()
+    notify_subscribers()
+    return toggled
+
+
+def bulk_delete_tasks(queryset):
+    """
+    Удаляет задачи queryset одним DELETE, возвращает количество.
+    _raw_delete не загружает строки ради post_delete-сигналов,
+    их эффект (tombstone, сброс кэша) выполняется здесь set-based.
+    """
+    # queryset без for_write читался бы с реплики
+    queryset = queryset.using(router.db_for_write(queryset.model))
+    with transaction.atomic(using=queryset.db):
+        apply_deltas(add_rows(Counter(), counted_groups(queryset), sign=-1), queryset.db)
+        create_tombstones(queryset, TaskChangeSequence.allocate(queryset.db))
+        deleted = queryset._raw_delete(queryset.db)
+    cache.invalidate()
+    notify_subscribers()
+    return deleted
+
+
+def counted_groups(queryset):
+    """Группы задач queryset для счётчиков статистики, из основной БД."""
+    return list(grouped_rows(queryset.using(router.db_for_write(queryset.model))))
+
+
+def create_tombstones(queryset, change_seq):
+    """INSERT ... SELECT записей об удалении для всех задач queryset."""
+    ids_sql, params = queryset.order_by().values('id').query.sql_with_params()
+    table = TaskTombstone._meta.db_table
+    with connections[queryset.db].cursor() as cursor:
+        # ids_sql собран ORM с плейсхолдерами, значения фильтра и таблица - из модели, ввод идёт параметрами
+        cursor.execute(
+            f'INSERT INTO {table} (task_id, deleted_at, change_seq) SELECT id, %s, %s FROM ({ids_sql}) AS deleted',  # nosec B608
+            [timezone.now(), change_seq, *params],
+        )
+
+
+def update_changed(queryset, status):
+    """
+    UPDATE статуса с row_change_fields, только если есть строки: иначе номер
+    изменения не выделяется и ничего не сдвигается. Возвращает количество строк.
+    """
+    if not queryset.exists():
+        return 0
+    return queryset.update(**row_change_fields(status=status))
+
+
+# Переходы статуса через границу даты: (из, в, признак выполнения, просрочена ли)
+STATUS_TRANSITIONS = [
+    (Task.Status.ACTIVE, Task.Status.OVERDUE, False, True),
+    (Task.Status.COMPLETED, Task.Status.LATE, True, True),
+    (Task.Status.OVERDUE, Task.Status.ACTIVE, False, False),
+    (Task.Status.LATE, Task.Status.COMPLETED, True, False),
+]
+
+
+def recompute_statuses(today=None, full=False):
+    """
+    Приводит сохранённый status в соответствие с датой без загрузки задач в Python.
+    Каждый переход - один UPDATE по условию. С full=True дополнительно
+    исправляются прочие расхождения (например, после прямой записи в БД);
+    это требует просмотра всей таблицы, поэтому по умолчанию выключено.
+    Возвращает словарь {'Active -> Overdue': количество, ...}.
+    """
+    today = today or timezone.now().date()
+    overdue = Q(deadline__lt=today)
+    # Не просрочена: дедлайн не прошёл или его нет; без NOT, чтобы шёл поиск по (status, deadline)
+    not_overdue = Q(deadline__gte=today) | Q(deadline__isnull=True)
+    counts = {}
+    with transaction.atomic():
+        for old_status, new_status, completed, is_overdue in STATUS_TRANSITIONS:
+            queryset = Task.objects.filter(
+                overdue if is_overdue else not_overdue,
+                status=old_status,
+                is_completed_by_user=completed,
+            )
+            counts[f'{old_status} -> {new_status}'] = update_changed(queryset, status=new_status)
+
+        if full:
+            expected = status_expression(today)
+            queryset = Task.objects \
+                .alias(expected_status=expected, expected_rank=status_rank_expression(expected)) \
+                .exclude(status=F('expected_status'), status_rank=F('expected_rank'))
+            counts['other'] = update_changed(queryset, status=expected)
+    if any(counts.values()):
+        cache.invalidate()
+        notify_subscribers()
+    return counts
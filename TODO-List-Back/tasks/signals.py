@@ -0,0 +1,56 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache
+from .events import notify_subscribers
+from .models import Task, TaskChangeSequence, TaskTombstone
+from .stats import COUNTED_FIELDS, add_rows, apply_deltas, task_counter_row
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_cache(sender, **kwargs):
+    cache.invalidate()
+
+
+@receiver(post_delete, sender=Task)
+def create_task_tombstone(sender, instance, using, **kwargs):
+    # delete() выполняется в транзакции, номер выдаётся в ней же
+    TaskTombstone.objects.using(using).create(task_id=instance.pk, change_seq=TaskChangeSequence.allocate(using))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def notify_event_subscribers(sender, using, **kwargs):
+    # Подписчики /api/tasks/events/ дочитают ленту изменений после COMMIT
+    notify_subscribers(using)
+
+
+@receiver(pre_save, sender=Task)
+def remember_previous_row(sender, instance, using, **kwargs):
+    # Прежние значения читаются из основной БД, а не с реплики
+    instance._counted_row = None
+    if not instance._state.adding:
+        row = Task.objects.using(using).filter(pk=instance.pk).values_list('status', *COUNTED_FIELDS).first()
+        if row is not None:
+            previous_status, *counted = row
+            instance._counted_row = tuple(counted)
+            if previous_status != instance.status:
+                instance.status_changed_seq = instance.change_seq
+
+
+# --- Счётчики статистики (TaskCounter) ---
+
+@receiver(post_save, sender=Task)
+def update_counters_on_save(sender, instance, using, **kwargs):
+    deltas = add_rows(Counter(), [(*task_counter_row(instance), 1)])
+    if instance._counted_row is not None:
+        add_rows(deltas, [(*instance._counted_row, 1)], sign=-1)
+    apply_deltas(deltas, using)
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_delete(sender, instance, using, **kwargs):
+    apply_deltas(add_rows(Counter(), [(*task_counter_row(instance), 1)], sign=-1), using)
@@ -0,0 +1,126 @@
+import datetime
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Task, TaskCounter
+
+# Поля задачи, от которых зависят счётчики
+COUNTED_FIELDS = ('priority', 'is_completed_by_user', 'deadline')
+
+
+def counter_keys(priority, is_completed_by_user, deadline):
+    """Строки TaskCounter, в которые входит задача с такими значениями."""
+    return (
+        ('priority', priority),
+        ('done' if is_completed_by_user else 'open', str(deadline) if deadline else ''),
+    )
+
+
+def task_counter_row(task):
+    return tuple(getattr(task, name) for name in COUNTED_FIELDS)
+
+
+def grouped_rows(queryset):
+    """[(priority, is_completed_by_user, deadline, количество)] одним GROUP BY."""
+    return queryset.order_by().values_list(*COUNTED_FIELDS).annotate(total=Count('id'))
+
+
+def add_rows(deltas, rows, sign=1):
+    """Добавляет в deltas вклад строк (priority, is_completed_by_user, deadline, количество)."""
+    for *values, total in rows:
+        for key in counter_keys(*values):
+            deltas[key] += sign * total
+    return deltas
+
+
+def apply_deltas(deltas, using=None):
+    """
+    Изменяет счётчики одним INSERT ... ON CONFLICT DO UPDATE (SQLite 3.24+, PostgreSQL):
+    строка создаётся при первом обращении, count увеличивается атомарно в SQL.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    using = using or router.db_for_write(TaskCounter)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(TaskCounter._meta.db_table)
+    dimension, key, count = (quote(name) for name in ('dimension', 'key', 'count'))
+    values = ', '.join(['(%s, %s, %s)'] * len(deltas))
+    params = [value for (name, value), delta in deltas.items() for value in (name, value, delta)]
+    with connection.cursor() as cursor:
+        # В SQL подставляются только имена из модели через quote_name и плейсхолдеры %s,
+        # значения счётчиков передаются параметрами
+        cursor.execute(
+            f'INSERT INTO {table} ({dimension}, {key}, {count}) VALUES {values} '  # nosec B608
+            f'ON CONFLICT ({dimension}, {key}) DO UPDATE SET {count} = {table}.{count} + excluded.{count}',
+            params,
+        )
+
+
+def task_stats(today=None):
+    """
+    Количество задач по фактическому статусу на today, по приоритету,
+    просроченные и со сроком в ближайшие TASKS_DUE_SOON_DAYS дней.
+    Один агрегат по TaskCounter, таблица задач не читается.
+    """
+    today = today or timezone.now().date()
+    due_soon_days = settings.TASKS_DUE_SOON_DAYS
+    past = Q(key__gt='', key__lt=today.isoformat())
+    soon = Q(key__gte=today.isoformat(), key__lte=(today + datetime.timedelta(days=due_soon_days)).isoformat())
+    sums = {
+        'open': Sum('count', filter=Q(dimension='open')),
+        'done': Sum('count', filter=Q(dimension='done')),
+        'overdue': Sum('count', filter=Q(dimension='open') & past),
+        'late': Sum('count', filter=Q(dimension='done') & past),
+        'due_soon': Sum('count', filter=Q(dimension='open') & soon),
+        **{
+            f'priority_{priority}': Sum('count', filter=Q(dimension='priority', key=priority))
+            for priority in Task.Priority.values
+        },
+    }
+    counts = {name: value or 0 for name, value in TaskCounter.objects.aggregate(**sums).items()}
+
+    return {
+        'total': counts['open'] + counts['done'],
+        'status': {
+            Task.Status.ACTIVE: counts['open'] - counts['overdue'],
+            Task.Status.COMPLETED: counts['done'] - counts['late'],
+            Task.Status.OVERDUE: counts['overdue'],
+            Task.Status.LATE: counts['late'],
+        },
+        'priority': {priority: counts[f'priority_{priority}'] for priority in Task.Priority.values},
+        'overdue': counts['overdue'],
+        'due_soon': counts['due_soon'],
+        'due_soon_days': due_soon_days,
+    }
+
+
+def reconcile_counters():
+    """
+    Пересчитывает счётчики полным GROUP BY по задачам и исправляет расхождения
+    (после прямой записи в БД или сбоя между записью задачи и счётчика).
+    Возвращает {(измерение, ключ): (было, стало)} для исправленных строк.
+    """
+    using = router.db_for_write(TaskCounter)
+    with transaction.atomic(using=using):
+        expected = add_rows(Counter(), grouped_rows(Task.objects.using(using)))
+        current = {
+            (counter.dimension, counter.key): counter
+            for counter in TaskCounter.objects.using(using).select_for_update()
+        }
+
+        fixed = {}
+        for key in expected.keys() | current.keys():
+            counter = current.get(key)
+            old = counter.count if counter else 0
+            if old != expected[key]:
+                fixed[key] = (old, expected[key])
+        apply_deltas({key: new - old for key, (old, new) in fixed.items()}, using)
+        # Нулевые строки больше не нужны
+        TaskCounter.objects.using(using).filter(count=0).delete()
+    return fixed
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import django
+import pytest
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш ответов не откатывается вместе с БД, поэтому очищается перед каждым тестом."""
+    cache.clear()
+    yield
+
+
+@pytest.fixture
+def delete_task_before_save(monkeypatch):
+    """
+    Удаляет строку задачи в save() до его транзакции - как параллельный DELETE,
+    зафиксированный между чтением задачи и её UPDATE.
+    """
+    from tasks.models import Task
+    update_status = Task._update_status
+
+    def delete_then_update_status(task):
+        if not task._state.adding:
+            Task.objects.filter(pk=task.pk).delete()
+        update_status(task)
+
+    monkeypatch.setattr(Task, '_update_status', delete_then_update_status)
+
+
+def migrations_fingerprint():
+    """Хэш файлов миграций всех приложений и версий Django/SQLite: изменилась миграция - новый снимок."""
+    digest = hashlib.sha1(f'{django.get_version()} {sqlite3.sqlite_version}'.encode(), usedforsecurity=False)
+    for app_config in apps.get_app_configs():
+        for path in sorted((Path(app_config.path) / 'migrations').glob('*.py')):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def uses_memory_db():
+    test_name = connection.settings_dict['TEST']['NAME'] or ':memory:'
+    return (
+        len(settings.DATABASES) == 1
+        and connection.vendor == 'sqlite'
+        and connection.creation.is_in_memory_db(test_name)
+    )
+
+
+def save_snapshot(path):
+    """Копирует тестовую базу в файл; через временный файл, чтобы воркеры xdist не прочли его недописанным."""
+    for stale in path.parent.glob('*.sqlite3'):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(descriptor)
+    target = sqlite3.connect(temporary)
+    try:
+        connection.ensure_connection()
+        connection.connection.backup(target)
+    finally:
+        target.close()
+    os.replace(temporary, path)
+
+
+def clone_snapshot(path):
+    """Тестовая база в памяти из снимка - то же, что create_test_db, но без миграций."""
+    old_name = connection.settings_dict['NAME']
+    test_name = connection.creation._get_test_db_name()
+    connection.close()
+    settings.DATABASES[connection.alias]['NAME'] = test_name
+    connection.settings_dict['NAME'] = test_name
+    connection.ensure_connection()
+    source = sqlite3.connect(path)
+    try:
+        source.backup(connection.connection)
+    finally:
+        source.close()
+    return old_name
+
+
+@pytest.fixture(scope='session')
+def django_db_snapshot(request, django_db_use_migrations):
+    """
+    Путь к снимку мигрированной тестовой базы в кэше pytest (.pytest_cache) или None,
+    если снимок не используется: не SQLite в памяти, --nomigrations или -p no:cacheprovider.
+    """
+    if not django_db_use_migrations or not uses_memory_db() or getattr(request.config, 'cache', None) is None:
+        return None
+    return request.config.cache.mkdir('django_db_snapshot') / f'{migrations_fingerprint()}.sqlite3'
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(
+    request,
+    django_test_environment,
+    django_db_blocker,
+    django_db_keepdb,
+    django_db_createdb,
+    django_db_modify_db_settings,
+    django_db_snapshot,
+):
+    """
+    Вместо миграций на каждый запуск тестовая база копируется из снимка (sqlite3 backup).
+    Снимка нет, устарел или передан --create-db - база мигрируется как обычно и снимок сохраняется.
+    serialized_rollback в тестах не используется, поэтому база не сериализуется.
+    """
+    verbosity = request.config.option.verbose
+    with django_db_blocker.unblock():
+        if django_db_snapshot is not None and django_db_snapshot.exists() and not django_db_createdb:
+            db_cfg = [(connection, clone_snapshot(django_db_snapshot), True)]
+        else:
+            db_cfg = setup_databases(
+                verbosity=verbosity,
+                interactive=False,
+                keepdb=django_db_keepdb and not django_db_createdb,
+                serialized_aliases=set(),
+            )
+            if django_db_snapshot is not None:
+                save_snapshot(django_db_snapshot)
+
+    yield
+
+    if not django_db_keepdb:
+        with django_db_blocker.unblock():
+            teardown_databases(db_cfg, verbosity=verbosity)
@@ -0,0 +1,174 @@
+# tasks/tests/test_task_async_views.py
+
+import pytest
+import datetime
+import importlib
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+import tasks.urls
+import todolist.urls
+from tasks.async_views import TaskDetailAsyncView, TaskEditStatusAsyncView, TaskListAsyncView
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+def reload_urls():
+    importlib.reload(tasks.urls)
+    importlib.reload(todolist.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_views(settings):
+    settings.TASKS_ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.TASKS_ASYNC_VIEWS = False
+    reload_urls()
+
+
+class SyncAsyncClient:
+    """AsyncClient с синхронными методами: запрос идёт через ASGIHandler."""
+
+    def __init__(self):
+        self.client = AsyncClient()
+
+    def __getattr__(self, method):
+        async def request(*args, **kwargs):
+            return await getattr(self.client, method)(*args, **kwargs)
+        return async_to_sync(request)
+
+
+def sync_get(view_class, path, params=None, **kwargs):
+    """Ответ TaskViewSet для сравнения с async-представлением."""
+    response = view_class.sync_view(APIRequestFactory().get(path, params), **kwargs)
+    return response.render()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('async_views')
+class TestAsyncViews:
+    """
+    Тесты async-представлений (TASKS_ASYNC_VIEWS): ответы совпадают с TaskViewSet.
+    """
+
+    def setup_method(self):
+        self.client = SyncAsyncClient()
+        today = timezone.now().date()
+        self.task = create_test_task(title="Async task", deadline=today - datetime.timedelta(days=1))
+        create_test_task(title="Another task", priority=Task.Priority.HIGH, is_completed_by_user=True)
+
+    def test_routes(self):
+        assert resolve(reverse('task-list')).func.view_class is TaskListAsyncView
+        assert resolve(reverse('task-detail', kwargs={'pk': 1})).func.view_class is TaskDetailAsyncView
+        assert resolve(reverse('task-edit-status', kwargs={'pk': 1})).func.view_class is TaskEditStatusAsyncView
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {'sort': 'priority', 'order': 'desc'},
+        {'sort': 'deadline'},
+        {'task_status': 'Overdue'},
+        {'q': 'async'},
+        {'view': 'summary'},
+        {'fields': 'id,title,deadline', 'exclude': 'title'},
+        {'fields': 'title,unknown'},
+    ])
+    def test_list_same_as_sync(self, params):
+        response = self.client.get(reverse('task-list'), params)
+        assert response.status_code == (400 if 'unknown' in params.get('fields', '') else 200)
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == sync_get(TaskListAsyncView, reverse('task-list'), params).content
+
+    def test_list_cached_and_conditional(self):
+        first = self.client.get(reverse('task-list'))
+        second = self.client.get(reverse('task-list'))
+        assert (first['X-Cache'], second['X-Cache']) == ('MISS', 'HIT')
+        assert second.content == first.content
+
+        not_modified = self.client.get(reverse('task-list'), headers={'If-None-Match': first['ETag']})
+        assert not_modified.status_code == 304
+
+    def test_filtered_list_without_last_modified(self):
+        """Как в TaskViewSet: у отфильтрованного списка только ETag."""
+        assert self.client.get(reverse('task-list')).has_header('Last-Modified')
+        filtered = self.client.get(reverse('task-list'), {'priority': 'High'})
+        assert filtered.has_header('ETag')
+        assert not filtered.has_header('Last-Modified')
+
+    def test_pagination_uses_sync_view(self):
+        response = self.client.get(reverse('task-list'), {'page_size': 1})
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 1
+        assert response.json()['next']
+
+    def test_retrieve(self):
+        url = reverse('task-detail', kwargs={'pk': self.task.pk})
+        response = self.client.get(url)
+        assert response.status_code == 200
+        assert response.content == sync_get(TaskDetailAsyncView, url, pk=self.task.pk).content
+
+        not_modified = self.client.get(url, headers={'If-None-Match': response['ETag']})
+        assert not_modified.status_code == 304
+
+    def test_retrieve_missing(self):
+        response = self.client.get(reverse('task-detail', kwargs={'pk': 9999}))
+        assert response.status_code == 404
+        assert response.json() == {'detail': 'No Task matches the given query.'}
+
+    def test_create(self):
+        payload = {'title': 'Created async', 'priority': 'Critical', 'deadline': '2030-01-01'}
+        response = self.client.post(reverse('task-list'), payload, content_type='application/json')
+
+        assert response.status_code == 201
+        task = Task.objects.get(title='Created async')
+        url = reverse('task-detail', kwargs={'pk': task.pk})
+        assert response.json() == sync_get(TaskDetailAsyncView, url, pk=task.pk).data
+        assert task.priority_rank == 4
+
+    @pytest.mark.parametrize("body, error_key", [
+        ({'title': 'Abc'}, 'title'),
+        ({'title': 'Valid title', 'priority': 'Urgent'}, 'priority'),
+        ({'title': 'Valid title', 'deadline': '31.12.2025'}, 'deadline'),
+    ])
+    def test_create_invalid(self, body, error_key):
+        response = self.client.post(reverse('task-list'), body, content_type='application/json')
+        assert response.status_code == 400
+        assert error_key in response.json()
+        assert Task.objects.count() == 2
+
+    def test_create_bad_json(self):
+        response = self.client.post(reverse('task-list'), '{bad', content_type='application/json')
+        assert response.status_code == 400
+        assert response.json()['detail'].startswith('JSON parse error')
+
+    def test_edit_status(self):
+        url = reverse('task-edit-status', kwargs={'pk': self.task.pk})
+        response = self.client.post(url)
+
+        assert response.status_code == 200
+        assert response.json()['is_completed_by_user'] is True
+        assert response.json()['status'] == 'Late'
+        self.task.refresh_from_db()
+        assert (self.task.status, self.task.version) == ('Late', 2)
+
+    def test_edit_status_missing(self):
+        response = self.client.post(reverse('task-edit-status', kwargs={'pk': 9999}))
+        assert response.status_code == 404
+
+    def test_edit_status_deleted_meanwhile(self, delete_task_before_save):
+        response = self.client.post(reverse('task-edit-status', kwargs={'pk': self.task.pk}))
+        assert response.status_code == 404
+        assert response.json() == {'detail': 'No Task matches the given query.'}
+
+    def test_other_methods_use_sync_view(self):
+        url = reverse('task-detail', kwargs={'pk': self.task.pk})
+        response = self.client.patch(url, {'title': 'Patched async'}, content_type='application/json')
+        assert response.status_code == 200
+        assert response.json()['title'] == 'Patched async'
+
+        assert self.client.delete(url).status_code == 204
+        assert not Task.objects.filter(pk=self.task.pk).exists()
@@ -0,0 +1,88 @@
+# tasks/tests/test_task_batch.py
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.serializers import TASK_BATCH_LIMIT, TASK_ID_MAX, TASK_SUMMARY_FIELDS
+from tasks.tests.utilits.create_test_task import create_test_tasks
+
+
+@pytest.mark.django_db
+class TestTaskBatch:
+    """
+    Тесты получения нескольких задач по id (GET /api/tasks/batch/?ids=).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('task-batch')
+        self.tasks = create_test_tasks([dict(title=f"Task {index:02}") for index in range(5)])
+        self.ids = [task.pk for task in self.tasks]
+
+    def get(self, ids, **params):
+        return self.client.get(self.url, {'ids': ids, **params})
+
+    def detail(self, pk):
+        return self.client.get(reverse('task-detail', kwargs={'pk': pk})).json()
+
+    def test_request_order(self, django_assert_num_queries):
+        ids = [self.ids[3], self.ids[0], self.ids[4]]
+        with django_assert_num_queries(1):
+            response = self.get(','.join(map(str, ids)))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'results': [self.detail(pk) for pk in ids], 'missing': []}
+
+    def test_missing(self):
+        absent = max(self.ids) + 1
+        response = self.get(f'{absent},{self.ids[1]},{TASK_ID_MAX}')
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.json()['results']] == [self.ids[1]]
+        assert response.json()['missing'] == [absent, TASK_ID_MAX]
+
+    def test_duplicates_and_spaces(self):
+        response = self.get(f' {self.ids[2]} , {self.ids[0]},,{self.ids[2]}')
+        assert [task['id'] for task in response.json()['results']] == [self.ids[2], self.ids[0]]
+
+    def test_repeated_param(self):
+        response = self.client.get(f'{self.url}?ids={self.ids[1]}&ids={self.ids[0]},{self.ids[4]}')
+        assert [task['id'] for task in response.json()['results']] == [self.ids[1], self.ids[0], self.ids[4]]
+
+    @pytest.mark.parametrize("params, expected", [
+        ({'view': 'summary'}, TASK_SUMMARY_FIELDS),
+        ({'fields': 'title,status'}, ('title', 'status')),
+    ])
+    def test_fieldset(self, params, expected):
+        ids = [self.ids[4], self.ids[2]]
+        response = self.get(f'{ids[0]},{ids[1]}', **params)
+        results = response.json()['results']
+        assert all(tuple(task) == expected for task in results)
+        assert [task['title'] for task in results] == ["Task 04", "Task 02"]
+
+    def test_limit(self):
+        ids = list(range(1, TASK_BATCH_LIMIT + 1))
+        assert self.get(','.join(map(str, ids))).status_code == status.HTTP_200_OK
+        response = self.get(','.join(map(str, ids + [TASK_BATCH_LIMIT + 1])))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.json()) == ['ids']
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {'ids': ''},
+        {'ids': ' , '},
+        {'ids': '1,abc'},
+        {'ids': '0'},
+        {'ids': '-1'},
+        {'ids': '1.5'},
+        {'ids': str(TASK_ID_MAX + 1)},
+    ])
+    def test_invalid(self, params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.json()) == ['ids']
+
+    def test_invalid_fields(self):
+        response = self.get(str(self.ids[0]), fields='secret')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.json()) == ['fields']
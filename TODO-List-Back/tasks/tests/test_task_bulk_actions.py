@@ -0,0 +1,213 @@
+# tasks/tests/test_task_bulk_actions.py
+
+import pytest
+import datetime
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task, TaskTombstone
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+def statement_kinds(queries):
+    """Первые слова SQL-запросов без SAVEPOINT / RELEASE."""
+    sql = [query['sql'] for query in queries]
+    return [statement.split()[0] for statement in sql if 'SAVEPOINT' not in statement]
+
+
+@pytest.mark.django_db
+class TestBulkActions:
+    """
+    Тесты массовых операций:
+    POST /api/tasks/bulk_update/, /api/tasks/bulk_delete/, /api/tasks/bulk_edit_status/.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.update_url = reverse('task-bulk-update')
+        self.delete_url = reverse('task-bulk-delete')
+        self.toggle_url = reverse('task-bulk-edit-status')
+        self.today = timezone.now().date()
+        self.yesterday = self.today - datetime.timedelta(days=1)
+        self.tomorrow = self.today + datetime.timedelta(days=1)
+
+        self.task_active = create_test_task(
+            title="Active Task", priority=Task.Priority.LOW, deadline=self.tomorrow,
+        )
+        self.task_overdue = create_test_task(
+            title="Overdue Task", priority=Task.Priority.LOW, deadline=self.yesterday,
+        )
+        self.task_completed = create_test_task(
+            title="Completed Task", priority=Task.Priority.HIGH, deadline=self.tomorrow,
+            is_completed_by_user=True,
+        )
+        self.task_late = create_test_task(
+            title="Late Task", priority=Task.Priority.HIGH, deadline=self.yesterday,
+            is_completed_by_user=True,
+        )
+        self.all_tasks = [self.task_active, self.task_overdue, self.task_completed, self.task_late]
+
+    # --- bulk_update ---
+
+    def test_bulk_update_by_ids(self):
+        """Патч применяется только к выбранным задачам, updated_at проставляется."""
+        ids = [self.task_active.pk, self.task_overdue.pk]
+        payload = {'ids': ids, 'patch': {'priority': 'Critical', 'description': 'bulk'}}
+
+        response = self.client.post(self.update_url, payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'updated': 2}
+        for task in Task.objects.filter(pk__in=ids):
+            assert task.priority == Task.Priority.CRITICAL
+            assert task.description == 'bulk'
+            assert task.updated_at == self.today
+        self.task_late.refresh_from_db()
+        assert self.task_late.priority == Task.Priority.HIGH
+
+    @pytest.mark.parametrize("deadline_offset, expected", [
+        (-1, {'Active Task': 'Overdue', 'Overdue Task': 'Overdue', 'Completed Task': 'Late', 'Late Task': 'Late'}),
+        (1, {'Active Task': 'Active', 'Overdue Task': 'Active', 'Completed Task': 'Completed', 'Late Task': 'Completed'}),
+        (None, {'Active Task': 'Active', 'Overdue Task': 'Active', 'Completed Task': 'Completed', 'Late Task': 'Completed'}),
+    ])
+    def test_bulk_update_deadline_recomputes_status(self, deadline_offset, expected):
+        """При смене дедлайна статус пересчитывается в SQL."""
+        deadline = None if deadline_offset is None else (self.today + datetime.timedelta(days=deadline_offset)).isoformat()
+        payload = {'filter': {'title': 'task'}, 'patch': {'deadline': deadline}}
+
+        response = self.client.post(self.update_url, payload, format='json')
+
+        assert response.data == {'updated': 4}
+        assert {task.title: task.status for task in Task.objects.all()} == expected
+
+    def test_bulk_update_by_filter(self):
+        """Выбор задач фильтром с теми же параметрами, что у списка."""
+        payload = {'filter': {'priority': 'High', 'status': 'true'}, 'patch': {'title': 'Renamed'}}
+
+        response = self.client.post(self.update_url, payload, format='json')
+
+        assert response.data == {'updated': 2}
+        assert set(Task.objects.filter(title='Renamed').values_list('pk', flat=True)) == {
+            self.task_completed.pk, self.task_late.pk,
+        }
+
+    def test_bulk_update_constant_queries(self):
+        """Одним UPDATE независимо от количества задач; счётчики - GROUP BY и upsert, плюс номер изменения."""
+        payload = {'filter': {'title': 'task'}, 'patch': {'priority': 'Medium'}}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.update_url, payload, format='json')
+        assert statement_kinds(queries) == ['SELECT', 'INSERT', 'INSERT', 'UPDATE']
+
+    def test_bulk_update_title_skips_counters(self):
+        """Патч без priority/deadline счётчики не меняет."""
+        payload = {'filter': {'title': 'task'}, 'patch': {'title': 'Renamed'}}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.update_url, payload, format='json')
+        assert statement_kinds(queries) == ['INSERT', 'UPDATE']
+
+    @pytest.mark.parametrize("payload", [
+        {'patch': {'title': 'Valid title'}},  # нет выбора задач
+        {'ids': [1], 'filter': {'title': 'late'}, 'patch': {'title': 'Valid title'}},  # оба способа выбора
+        {'ids': [], 'patch': {'title': 'Valid title'}},
+        {'ids': ['x'], 'patch': {'title': 'Valid title'}},
+        {'ids': [1]},  # нет патча
+        {'ids': [1], 'patch': {}},
+        {'ids': [1], 'patch': {'title': 'Abc'}},
+        {'ids': [1], 'patch': {'priority': 'Urgent'}},
+        {'ids': [1], 'patch': {'deadline': '31.12.2025'}},
+        {'ids': [1], 'patch': {'status': 'Late'}},  # только read-only поля
+    ])
+    def test_bulk_update_invalid(self, payload):
+        """Некорректный запрос возвращает 400 и ничего не меняет."""
+        response = self.client.post(self.update_url, payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Task.objects.filter(updated_at__isnull=False).exists()
+
+    # --- bulk_delete ---
+
+    def test_bulk_delete_by_ids(self):
+        """Удаляются только выбранные задачи, несуществующие id игнорируются."""
+        payload = {'ids': [self.task_active.pk, self.task_late.pk, 9999]}
+
+        response = self.client.post(self.delete_url, payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'deleted': 2}
+        assert set(Task.objects.values_list('pk', flat=True)) == {self.task_overdue.pk, self.task_completed.pk}
+
+    def test_bulk_delete_by_filter(self):
+        response = self.client.post(self.delete_url, {'filter': {'title': 'late'}}, format='json')
+        assert response.data == {'deleted': 1}
+        assert not Task.objects.filter(pk=self.task_late.pk).exists()
+
+    def test_bulk_delete_constant_queries(self):
+        """Tombstone-записи, счётчики и удаление - по одному запросу на всю выборку."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.delete_url, {'filter': {'title': 'task'}}, format='json')
+        # Группы для счётчиков, upsert счётчиков, номер изменения, tombstone-записи, удаление
+        assert statement_kinds(queries) == ['SELECT', 'INSERT', 'INSERT', 'INSERT', 'DELETE']
+        assert Task.objects.count() == 0
+        assert TaskTombstone.objects.count() == 4
+
+    @pytest.mark.parametrize("selection", [
+        {'filter': {}},
+        {'filter': {'title': '', 'priority': ''}},
+        {'filter': {'title': '   '}},
+        {'filter': {'q': '!!!'}},  # без слов поиск не применяется
+        {'filter': {'prioirty': 'Low'}},
+        {'filter': {'priority': 'Low', 'sort': 'title'}},
+        {'filter': {'priority': 'Urgent'}},
+        {'filter': {'title': 'late', 'status': 'yes'}},
+    ])
+    @pytest.mark.parametrize("url_name", ['task-bulk-update', 'task-bulk-delete', 'task-bulk-edit-status'])
+    def test_filter_must_restrict_selection(self, url_name, selection):
+        """Неизвестный ключ, недопустимое или пустое значение фильтра - 400, а не выбор всех задач."""
+        payload = {**selection, 'patch': {'title': 'Renamed'}} if url_name == 'task-bulk-update' else selection
+        response = self.client.post(reverse(url_name), payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ['filter']
+        assert Task.objects.count() == 4
+        assert not Task.objects.filter(updated_at__isnull=False).exists()
+
+    def test_bulk_delete_requires_selection(self):
+        response = self.client.post(self.delete_url, {}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Task.objects.count() == 4
+
+    # --- bulk_edit_status ---
+
+    def test_bulk_toggle(self):
+        """Отметка о выполнении инвертируется, статус пересчитывается по новому значению."""
+        response = self.client.post(self.toggle_url, {'filter': {'title': 'task'}}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'toggled': 4}
+        result = {task.pk: (task.is_completed_by_user, task.status) for task in Task.objects.all()}
+        assert result == {
+            self.task_active.pk: (True, Task.Status.COMPLETED),
+            self.task_overdue.pk: (True, Task.Status.LATE),
+            self.task_completed.pk: (False, Task.Status.ACTIVE),
+            self.task_late.pk: (False, Task.Status.OVERDUE),
+        }
+
+    def test_bulk_toggle_matches_edit_status(self):
+        """Результат совпадает с поштучным edit_status."""
+        self.client.post(self.toggle_url, {'ids': [self.task_overdue.pk]}, format='json')
+        bulk_task = Task.objects.get(pk=self.task_overdue.pk)
+
+        single = create_test_task(title="Overdue Task 2", deadline=self.yesterday)
+        self.client.post(reverse('task-edit-status', kwargs={'pk': single.pk}))
+        single.refresh_from_db()
+
+        assert (bulk_task.is_completed_by_user, bulk_task.status, bulk_task.updated_at) == \
+               (single.is_completed_by_user, single.status, single.updated_at)
+
+    def test_bulk_toggle_constant_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.toggle_url, {'ids': [task.pk for task in self.all_tasks]}, format='json')
+        # INSERT счётчиков пропускается, если изменения взаимно погасились
+        assert statement_kinds(queries) in (['SELECT', 'INSERT', 'INSERT', 'UPDATE'], ['SELECT', 'INSERT', 'UPDATE'])
@@ -0,0 +1,189 @@
+# tasks/tests/test_task_cache.py
+
+import pytest
+import importlib
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+import todolist.settings
+from tasks import cache as task_cache
+from tasks.cache import check_backend
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+@pytest.mark.django_db
+class TestTaskResponseCache:
+    """
+    Тесты версионного кэша ответов списка и карточки задачи.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        self.stats_url = reverse('task-cache-stats')
+        self.task = create_test_task(title="Cached task", priority=Task.Priority.LOW)
+        self.detail_url = reverse('task-detail', kwargs={'pk': self.task.pk})
+
+    def test_list_hit_without_queries(self):
+        """Повторный запрос отдаётся из кэша вместе с ETag: ни выборки, ни агрегата."""
+        first = self.client.get(self.list_url, {'sort': 'priority'})
+        assert first['X-Cache'] == 'MISS'
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.list_url, {'sort': 'priority'})
+            not_modified = self.client.get(self.list_url, {'sort': 'priority'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert second['X-Cache'] == not_modified['X-Cache'] == 'HIT'
+        assert len(queries) == 0
+        assert second.data == first.data
+        assert (second['ETag'], second['Last-Modified']) == (first['ETag'], first['Last-Modified'])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_page_validators_without_list_aggregate(self):
+        """Страница keyset-пагинации: ETag по её данным, без агрегата по всему списку."""
+        create_test_task(title="Second task")
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(self.list_url, {'page_size': 1})
+        assert first['X-Cache'] == 'MISS'
+        assert not any('COUNT(' in query['sql'] for query in queries)
+        assert not first.has_header('Last-Modified')
+
+        second = self.client.get(first.data['next'], HTTP_IF_NONE_MATCH=first['ETag'])
+        assert second.status_code == status.HTTP_200_OK and second['ETag'] != first['ETag']
+        not_modified = self.client.get(self.list_url, {'page_size': 1}, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        self.client.patch(self.detail_url, {'title': 'A changed task'}, format='json')
+        changed = self.client.get(self.list_url, {'page_size': 1}, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert changed.status_code == status.HTTP_200_OK and changed['X-Cache'] == 'MISS'
+
+    def test_params_are_normalized(self):
+        """Значения по умолчанию и порядок параметров не влияют на ключ."""
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url, {'order': 'asc', 'sort': 'title', 'title': ''})
+        assert response['X-Cache'] == 'HIT'
+
+        response = self.client.get(self.list_url, {'priority': 'Low'})
+        assert response['X-Cache'] == 'MISS'
+
+    def test_detail_cached(self):
+        assert self.client.get(self.detail_url)['X-Cache'] == 'MISS'
+        assert self.client.get(self.detail_url)['X-Cache'] == 'HIT'
+
+    def test_detail_hit_without_queries(self):
+        """Карточка в кэше вместе с ETag и Last-Modified: при попадании, и для 304, БД не нужна."""
+        first = self.client.get(self.detail_url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.detail_url)
+            not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert len(queries) == 0
+        assert (second['ETag'], second['Last-Modified']) == (first['ETag'], first['Last-Modified'])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_not_found_not_cached(self):
+        url = reverse('task-detail', kwargs={'pk': 9999})
+        assert self.client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert self.client.get(url).get('X-Cache') != 'HIT'
+
+    @pytest.mark.parametrize("write", [
+        lambda s: s.client.post(s.list_url, {'title': 'New task'}, format='json'),
+        lambda s: s.client.put(s.detail_url, {'title': 'Put title', 'priority': 'High'}, format='json'),
+        lambda s: s.client.patch(s.detail_url, {'title': 'Patched title'}, format='json'),
+        lambda s: s.client.delete(s.detail_url),
+        lambda s: s.client.post(reverse('task-edit-status', kwargs={'pk': s.task.pk})),
+        lambda s: s.client.post(reverse('task-load-tasks'), [{'title': 'Loaded task'}], format='json'),
+        lambda s: s.client.post(reverse('task-bulk-update'), {'filter': {'title': 'task'}, 'patch': {'priority': 'High'}}, format='json'),
+        lambda s: s.client.post(reverse('task-bulk-delete'), {'ids': [s.task.pk]}, format='json'),
+        lambda s: s.client.post(reverse('task-bulk-edit-status'), {'ids': [s.task.pk]}, format='json'),
+    ])
+    def test_writes_invalidate(self, write):
+        """Любая запись увеличивает версию, и список запрашивается заново."""
+        before = self.client.get(self.list_url)
+        assert self.client.get(self.list_url)['X-Cache'] == 'HIT'
+
+        write(self)
+
+        after = self.client.get(self.list_url)
+        assert after['X-Cache'] == 'MISS'
+        assert after.data != before.data
+
+    def test_stats(self):
+        before = self.client.get(self.stats_url).data
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+
+        stats = self.client.get(self.stats_url).data
+        assert stats['hits'] - before['hits'] == 2
+        assert stats['misses'] - before['misses'] == 1
+        assert stats['version'] is not None
+
+    def test_stats_not_written_to_cache(self, monkeypatch):
+        """Попадания и промахи считаются в процессе: запрос не пишет в общий кэш."""
+        self.client.get(self.list_url)
+        writes = []
+        backend = task_cache.get_cache()
+        for method in ('set', 'add', 'incr'):
+            monkeypatch.setattr(backend, method, lambda *args, method=method, **kwargs: writes.append(method))
+        assert self.client.get(self.list_url)['X-Cache'] == 'HIT'
+        assert writes == []
+
+    def test_disabled(self, settings):
+        settings.TASKS_CACHE_ENABLED = False
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url)
+        assert 'X-Cache' not in response
+
+
+
+class TestCacheBackendCheck:
+    """
+    Тесты проверки backend кэша при запуске: общий с атомарным incr, кэш в памяти
+    процесса - только для одного процесса.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.TASKS_CACHE_ENABLED = True
+        settings.TASKS_CACHE_SINGLE_PROCESS = False
+
+    def test_locmem_rejected(self):
+        with pytest.raises(ImproperlyConfigured, match='LocMemCache'):
+            check_backend()
+
+    def test_locmem_allowed(self, settings):
+        settings.TASKS_CACHE_SINGLE_PROCESS = True
+        check_backend()
+        settings.TASKS_CACHE_SINGLE_PROCESS = False
+        settings.TASKS_CACHE_ENABLED = False
+        check_backend()
+
+    def test_atomic_shared_backend(self, settings):
+        # Клиент redis подключается только при первом обращении к кэшу
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                'LOCATION': 'redis://127.0.0.1:1',
+            }
+        }
+        check_backend()
+
+    @pytest.mark.parametrize("backend", [
+        'django.core.cache.backends.filebased.FileBasedCache',
+        'django.core.cache.backends.db.DatabaseCache',
+    ])
+    def test_non_atomic_backend_rejected(self, settings, tmp_path, backend):
+        settings.CACHES = {'default': {'BACKEND': backend, 'LOCATION': str(tmp_path)}}
+        with pytest.raises(ImproperlyConfigured, match='not atomic'):
+            check_backend()
+        settings.TASKS_CACHE_ENABLED = False
+        check_backend()
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Без TASKS_CACHE_ENABLED в окружении (todolist/settings.py) кэш ответов выключен."""
+        monkeypatch.delenv('TASKS_CACHE_ENABLED', raising=False)
+        assert importlib.reload(todolist.settings).TASKS_CACHE_ENABLED is False
@@ -0,0 +1,145 @@
+# tasks/tests/test_task_changes.py
+
+import pytest
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task, TaskTombstone
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+@pytest.mark.django_db
+class TestTaskChanges:
+    """
+    Тесты ленты изменений (GET /api/tasks/changes/?since=<token>).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('task-changes')
+        self.first = create_test_task(title="First task")
+        self.second = create_test_task(title="Second task")
+
+    def changes(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def titles(self, data):
+        return [task['title'] for task in data['tasks']]
+
+    def test_initial_sync(self):
+        data = self.changes()
+        assert self.titles(data) == ["First task", "Second task"]
+        assert data['deleted'] == []
+        assert data['has_more'] is False
+        # Формат задач - как в списке
+        assert data['tasks'][0] == self.client.get(reverse('task-list')).data[0]
+
+    def test_no_changes(self):
+        token = self.changes()['next']
+        data = self.changes(token)
+        assert data == {'tasks': [], 'deleted': [], 'next': token, 'has_more': False}
+
+    def test_only_changed_tasks(self):
+        token = self.changes()['next']
+        self.client.patch(reverse('task-detail', kwargs={'pk': self.first.pk}), {'title': 'Patched task'}, format='json')
+        self.client.post(reverse('task-list'), {'title': 'Created task'}, format='json')
+
+        data = self.changes(token)
+        assert self.titles(data) == ["Patched task", "Created task"]
+        assert self.changes(data['next'])['tasks'] == []
+
+    def test_edit_status(self):
+        token = self.changes()['next']
+        self.client.post(reverse('task-edit-status', kwargs={'pk': self.second.pk}))
+        data = self.changes(token)
+        assert [(task['id'], task['is_completed_by_user']) for task in data['tasks']] == [(self.second.pk, True)]
+
+    def test_deleted_tasks(self):
+        token = self.changes()['next']
+        self.client.patch(reverse('task-detail', kwargs={'pk': self.first.pk}), {'title': 'Patched task'}, format='json')
+        self.client.delete(reverse('task-detail', kwargs={'pk': self.first.pk}))
+
+        data = self.changes(token)
+        assert data['tasks'] == []
+        assert data['deleted'] == [self.first.pk]
+
+    def test_bulk_operations(self):
+        token = self.changes()['next']
+        self.client.post(reverse('task-load-tasks'), [{'title': 'Loaded task'}], format='json')
+        self.client.post(reverse('task-bulk-update'), {'ids': [self.first.pk], 'patch': {'priority': 'High'}}, format='json')
+        self.client.post(reverse('task-bulk-delete'), {'ids': [self.second.pk]}, format='json')
+
+        data = self.changes(token)
+        assert self.titles(data) == ["Loaded task", "First task"]
+        assert data['tasks'][1]['priority'] == 'High'
+        assert data['deleted'] == [self.second.pk]
+
+    def test_limit_splits_one_bulk_update(self):
+        """Строки одной массовой операции с общим номером отдаются по частям без пропусков и повторов."""
+        for index in range(3):
+            create_test_task(title=f"Extra task {index}")
+        token = self.changes()['next']
+        self.client.post(reverse('task-bulk-edit-status'), {'filter': {'title': 'task'}}, format='json')
+        create_test_task(title="Last task")
+
+        received = []
+        while True:
+            data = self.changes(token, limit=2)
+            received += [task['id'] for task in data['tasks']]
+            token = data['next']
+            if not data['has_more']:
+                break
+        ids = sorted(Task.objects.exclude(title="Last task").values_list('id', flat=True))
+        assert received == [*ids, Task.objects.get(title="Last task").pk]
+
+    def test_change_seq_increases(self):
+        before = Task.objects.get(pk=self.first.pk).change_seq
+        self.first.title = "Saved again"
+        self.first.save()
+        assert Task.objects.get(pk=self.first.pk).change_seq > before > 0
+
+    def test_constant_queries(self):
+        for index in range(10):
+            create_test_task(title=f"Extra task {index}")
+        with CaptureQueriesContext(connection) as queries:
+            self.changes()
+        assert len(queries) == 3
+
+    @pytest.mark.parametrize("since", ['abc', '1.x', '.'])
+    def test_invalid_token(self, since):
+        response = self.client.get(self.url, {'since': since})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.data == {'detail': 'Invalid token'}
+
+    def test_pruned_tombstones_expire_old_tokens(self):
+        """После удаления старых записей об удалениях старый токен - 410, новый и пустой работают."""
+        old_token = self.changes()['next']
+        self.client.delete(reverse('task-detail', kwargs={'pk': self.first.pk}))
+        TaskTombstone.objects.update(deleted_at=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+        recent_token = self.changes(old_token)['next']
+
+        out = StringIO()
+        call_command('prune_task_tombstones', stdout=out)
+        assert out.getvalue().splitlines() == ['Pruned 1 tombstones']
+        assert not TaskTombstone.objects.exists()
+
+        response = self.client.get(self.url, {'since': old_token})
+        assert response.status_code == status.HTTP_410_GONE
+        assert self.titles(self.changes()) == ["Second task"]
+        assert self.changes(recent_token)['deleted'] == []
+
+    def test_recent_tombstones_kept(self):
+        token = self.changes()['next']
+        self.client.delete(reverse('task-detail', kwargs={'pk': self.first.pk}))
+        call_command('prune_task_tombstones', days=1, stdout=StringIO())
+        assert self.changes(token)['deleted'] == [self.first.pk]
@@ -0,0 +1,237 @@
+# tasks/tests/test_task_compression.py
+
+import pytest
+import json
+import os
+import zlib
+from functools import partial
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.compression import CODECS, brotli, compression, negotiate, zstandard
+from tasks.exports import EXPORT_FORMATS
+from tasks.middleware import CompressionMiddleware
+from tasks.tests.utilits.create_test_task import create_test_tasks
+
+ENCODINGS = list(CODECS)
+
+
+def decompressor(encoding):
+    """Функция распаковки очередного куска потока."""
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == 'br':
+        return brotli.Decompressor().process
+    return zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+def decompress(encoding, data):
+    return decompressor(encoding)(data)
+
+
+class TestNegotiate:
+    """
+    Тесты выбора кодировки по Accept-Encoding.
+    """
+
+    @pytest.mark.parametrize("header, expected", [
+        ('gzip', 'gzip'),
+        ('gzip, deflate', 'gzip'),
+        ('deflate', None),
+        ('', None),
+        ('identity', None),
+        ('gzip;q=0', None),
+        ('*', 'zstd'),
+        ('*;q=0.5, gzip', 'gzip'),
+        ('*, zstd;q=0', 'br'),
+        ('GZIP ; q=0.8, br;q=0.9', 'br'),
+        ('gzip, br, zstd', 'zstd'),
+        ('gzip;q=bad, br;q=0.1', 'br'),
+    ])
+    def test_negotiate(self, header, expected):
+        pytest.importorskip('brotli')
+        pytest.importorskip('zstandard')
+        assert negotiate(header, ['zstd', 'br', 'gzip']) == expected
+
+    def test_server_order(self):
+        assert negotiate('gzip, br, zstd', ['gzip', 'br', 'zstd']) == 'gzip'
+        assert negotiate('gzip, br', ['br']) == ('br' if 'br' in CODECS else None)
+
+    def test_unavailable_encoding_skipped(self):
+        assert negotiate('snappy, gzip;q=0.1', ['snappy', 'gzip']) == 'gzip'
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    """
+    Тесты сжатия ответов API (CompressionMiddleware).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        create_test_tasks([dict(title=f"Задача {index:03}") for index in range(50)])
+        self.plain = self.client.get(self.list_url)
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    def test_list_compressed(self, encoding):
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING=encoding)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Encoding'] == encoding
+        assert response['Vary'].endswith('Accept-Encoding')
+        assert int(response['Content-Length']) == len(response.content) < len(self.plain.content)
+        assert decompress(encoding, response.content) == self.plain.content
+
+    def test_not_accepted(self):
+        assert not self.plain.has_header('Content-Encoding')
+        assert 'Accept-Encoding' in self.plain['Vary']
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='identity')
+        assert not response.has_header('Content-Encoding')
+        assert response.content == self.plain.content
+
+    def test_below_min_size(self, settings):
+        settings.TASKS_COMPRESSION_MIN_SIZE = len(self.plain.content) + 1
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding')
+        assert response.content == self.plain.content
+
+    def test_small_response_not_compressed(self):
+        response = self.client.get(self.list_url, {'page_size': 1}, HTTP_ACCEPT_ENCODING='gzip')
+        assert len(response.content) < 1024
+        assert not response.has_header('Content-Encoding')
+
+    def test_weak_etag(self):
+        """Сжатый ответ получает слабый ETag; If-None-Match с ним даёт 304."""
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['ETag'] == 'W/' + self.plain['ETag']
+        again = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+        plain = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert plain.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_cached_response_compressed(self, settings):
+        """В кэше несжатый ответ: HIT сжимается под Accept-Encoding каждого клиента."""
+        settings.TASKS_CACHE_ENABLED = True
+        assert self.client.get(self.list_url)['X-Cache'] == 'HIT'  # закэширован в setup_method
+        for encoding in ENCODINGS:
+            response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING=encoding)
+            assert (response['X-Cache'], response['Content-Encoding']) == ('HIT', encoding)
+            assert decompress(encoding, response.content) == self.plain.content
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    @pytest.mark.parametrize("export_format", ['ndjson', 'csv'])
+    def test_export_compressed_incrementally(self, encoding, export_format, monkeypatch):
+        """Экспорт сжимается по кускам: каждый кусок распаковывается сразу, без конца потока."""
+        stream, *rest = EXPORT_FORMATS[export_format]
+        monkeypatch.setitem(EXPORT_FORMATS, export_format, (partial(stream, chunk_size=10), *rest))
+        url = reverse('task-export')
+        plain = b''.join(self.client.get(url, {'export_format': export_format}).streaming_content)
+
+        response = self.client.get(url, {'export_format': export_format}, HTTP_ACCEPT_ENCODING=encoding)
+        assert response['Content-Encoding'] == encoding
+        assert not response.has_header('Content-Length')
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 2
+
+        decompress_chunk = decompressor(encoding)
+        first = decompress_chunk(chunks[0])
+        assert first and plain.startswith(first)
+        assert first + b''.join(map(decompress_chunk, chunks[1:])) == plain
+
+    def test_event_stream_not_compressed(self, settings):
+        settings.TASKS_SSE_MAX_AGE = 0
+        response = self.client.get(reverse('task-events'), HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Type'] == 'text/event-stream'
+        assert not response.has_header('Content-Encoding')
+
+    def test_disabled(self, settings):
+        settings.TASKS_COMPRESSION = False
+        response = APIClient().get(self.list_url, HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding')
+        assert 'Vary' not in response or 'Accept-Encoding' not in response['Vary']
+
+
+class TestCompressionDecorator:
+    """
+    Тесты настроек сжатия отдельного представления (декоратор compression).
+    """
+    body = json.dumps([{'title': 'Task'}] * 100).encode()
+
+    def process(self, view, encoding='gzip'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(view)(request)
+
+    def view(self):
+        return HttpResponse(self.body, content_type='application/json')
+
+    def test_disabled_for_view(self):
+        response = self.process(compression(enabled=False)(lambda request: self.view()))
+        assert not response.has_header('Content-Encoding')
+        assert response.content == self.body
+
+    def test_options(self):
+        view = compression(min_size=len(self.body) + 1)(lambda request: self.view())
+        assert not self.process(view).has_header('Content-Encoding')
+
+        view = compression(encodings=['gzip'], levels={'gzip': 1})(lambda request: self.view())
+        assert self.process(view, 'zstd, gzip;q=0.5')['Content-Encoding'] == 'gzip'
+
+    def test_default(self):
+        response = self.process(lambda request: self.view())
+        assert response['Content-Encoding'] in CODECS
+        assert decompress(response['Content-Encoding'], response.content) == self.body
+
+    def test_not_smaller_kept(self):
+        body = os.urandom(2048)
+        response = self.process(lambda request: HttpResponse(body, content_type='text/plain'))
+        assert not response.has_header('Content-Encoding')
+        assert response.content == body
+
+    def test_async_view_and_stream(self):
+        """Async-представление и асинхронный поток сжимаются без перехода в поток."""
+        async def chunks():
+            for index in range(5):
+                yield b'{"index": %d}\n' % index
+
+        @compression(encodings=['gzip'])
+        async def view(request):
+            return StreamingHttpResponse(chunks(), content_type='application/x-ndjson')
+
+        async def consume():
+            request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+            response = await CompressionMiddleware(view)(request)
+            assert response.is_async
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        response, content = async_to_sync(consume)()
+        assert response['Content-Encoding'] == 'gzip'
+        assert decompress('gzip', content) == b''.join(b'{"index": %d}\n' % index for index in range(5))
+
+
+@pytest.mark.django_db
+class TestJSONRendering:
+    """
+    Тесты JSON ответов: компактный, без \\u-экранирования (COMPACT_JSON и UNICODE_JSON DRF).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        create_test_tasks([dict(title="Купить молоко")])
+
+    def test_compact(self):
+        response = self.client.get(self.list_url, HTTP_ACCEPT='application/json')
+        assert response.status_code == status.HTTP_200_OK
+        assert b'\n' not in response.content
+        assert b'", "' not in response.content and b'": ' not in response.content
+        assert 'Купить молоко'.encode() in response.content
+        assert response.json()[0]['title'] == "Купить молоко"
+
+    def test_browsable_api_indented(self):
+        response = self.client.get(self.list_url, HTTP_ACCEPT='text/html')
+        assert response.status_code == status.HTTP_200_OK
+        assert '\n    {\n        &quot;id&quot;' in response.content.decode()
@@ -0,0 +1,137 @@
+# tasks/tests/test_task_conditional_get.py
+
+import pytest
+import datetime
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """
+    Тесты условных GET (ETag / If-None-Match, Last-Modified / If-Modified-Since).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        self.task = create_test_task(title="Polled task")
+        self.other = create_test_task(title="Other task", priority=Task.Priority.HIGH)
+        self.detail_url = reverse('task-detail', kwargs={'pk': self.task.pk})
+
+    def test_version_increments_on_save(self):
+        assert self.task.version == 1
+        old_modified = self.task.modified_at
+
+        self.task.title = "Polled task v2"
+        self.task.save()
+        self.task.refresh_from_db()
+
+        assert self.task.version == 2
+        assert self.task.modified_at > old_modified
+
+    def test_fields_not_in_response(self):
+        response = self.client.get(self.detail_url)
+        assert 'version' not in response.data
+        assert 'modified_at' not in response.data
+
+    @pytest.mark.parametrize("url_name", ['list', 'detail'])
+    def test_if_none_match_returns_304(self, url_name):
+        url = self.list_url if url_name == 'list' else self.detail_url
+        first = self.client.get(url)
+        assert first.status_code == status.HTTP_200_OK
+        etag = first['ETag']
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second.content == b''
+        assert second['ETag'] == etag
+
+    @pytest.mark.parametrize("url_name", ['list', 'detail'])
+    def test_if_modified_since_returns_304(self, url_name):
+        url = self.list_url if url_name == 'list' else self.detail_url
+        last_modified = self.client.get(url)['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_if_modified_since_older_returns_200(self):
+        old = http_date((self.task.modified_at - datetime.timedelta(days=1)).timestamp())
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=old)
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("change", [
+        lambda s: s.client.patch(reverse('task-detail', kwargs={'pk': s.task.pk}), {'title': 'Changed'}, format='json'),
+        lambda s: s.client.post(reverse('task-edit-status', kwargs={'pk': s.task.pk})),
+        lambda s: s.client.post(reverse('task-bulk-update'), {'ids': [s.task.pk], 'patch': {'priority': 'Low'}}, format='json'),
+        lambda s: s.client.post(reverse('task-bulk-edit-status'), {'ids': [s.task.pk]}, format='json'),
+    ])
+    def test_detail_etag_changes_after_write(self, change):
+        etag = self.client.get(self.detail_url)['ETag']
+        change(self)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    @pytest.mark.parametrize("change", [
+        lambda s: s.client.post(s.list_url, {'title': 'Created task'}, format='json'),
+        lambda s: s.client.delete(reverse('task-detail', kwargs={'pk': s.other.pk})),
+        lambda s: s.client.post(reverse('task-bulk-delete'), {'ids': [s.other.pk]}, format='json'),
+        lambda s: s.client.patch(reverse('task-detail', kwargs={'pk': s.other.pk}), {'title': 'Changed'}, format='json'),
+        lambda s: s.client.post(reverse('task-load-tasks'), [{'title': 'Loaded task'}], format='json'),
+    ])
+    def test_list_etag_changes_after_write(self, change):
+        etag = self.client.get(self.list_url)['ETag']
+        change(self)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_etag_depends_on_params(self):
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, {'priority': 'High'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_last_modified_moves_on_delete(self):
+        """Удаление (через tombstone) сдвигает Last-Modified списка."""
+        # Правки были давно, поэтому Last-Modified списка - вчерашний
+        Task.objects.update(modified_at=self.task.modified_at - datetime.timedelta(days=1))
+        before = self.client.get(self.list_url)['Last-Modified']
+        self.client.delete(reverse('task-detail', kwargs={'pk': self.other.pk}))
+
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=before)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_filtered_list_task_leaves_filter(self):
+        """Задача ушла из ?priority=High: max(modified_at) оставшихся не изменился, но 304 быть не должно."""
+        url = self.list_url
+        moved = create_test_task(title="Moved task", priority=Task.Priority.HIGH)
+        Task.objects.update(modified_at=self.task.modified_at - datetime.timedelta(days=1))
+        first = self.client.get(url, {'priority': 'High'})
+        assert [task['id'] for task in first.json()] == [moved.pk, self.other.pk]
+        # У отфильтрованного списка только ETag
+        assert not first.has_header('Last-Modified')
+
+        moved.priority = Task.Priority.LOW
+        moved.save()
+        Task.objects.filter(pk=moved.pk).update(modified_at=self.task.modified_at - datetime.timedelta(days=1))
+        since = http_date(self.task.modified_at.timestamp())
+        response = self.client.get(url, {'priority': 'High'}, HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.json()] == [self.other.pk]
+        response = self.client.get(url, {'priority': 'High'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_missing_task_still_404(self):
+        url = reverse('task-detail', kwargs={'pk': 9999})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"task-9999-1"')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize("pk", ['abc', '12abc'])
+    def test_non_numeric_pk_404(self, pk):
+        response = self.client.get(f'{self.list_url}{pk}/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,121 @@
+# tasks/tests/test_task_db_profile.py
+
+import pytest
+import importlib
+import os
+import time
+from unittest import mock
+from django.db import OperationalError, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+import todolist.settings
+
+
+def open_connection(path, alias):
+    """Отдельное соединение с файловой SQLite-базой с настройками default."""
+    settings_dict = {**connections['default'].settings_dict, 'NAME': str(path)}
+    wrapper = DatabaseWrapper(settings_dict, alias=alias)
+    wrapper.ensure_connection()
+    return wrapper
+
+
+def conn_max_age(value=None):
+    """CONN_MAX_AGE из todolist/settings.py при DB_CONN_MAX_AGE=value (None - переменной нет)."""
+    try:
+        with mock.patch.dict(os.environ):
+            os.environ.pop('DB_CONN_MAX_AGE', None)
+            if value is not None:
+                os.environ['DB_CONN_MAX_AGE'] = value
+            return importlib.reload(todolist.settings).DATABASES['default']['CONN_MAX_AGE']
+    finally:
+        # Модуль настроек - снова по текущему окружению
+        importlib.reload(todolist.settings)
+
+
+def pragma(wrapper, name):
+    return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestDatabaseProfile:
+    """
+    Тесты профиля БД: PRAGMA на соединении, постоянные соединения, WAL.
+    """
+
+    def setup_method(self):
+        self.wrappers = []
+
+    def teardown_method(self):
+        for wrapper in self.wrappers:
+            wrapper.close()
+
+    def connect(self, path, alias='profile'):
+        wrapper = open_connection(path, alias)
+        self.wrappers.append(wrapper)
+        return wrapper
+
+    @pytest.mark.parametrize("value, expected", [
+        (None, 60),
+        ('0', 0),
+        ('15', 15),
+        ('None', None),
+        ('', None),
+    ])
+    def test_conn_max_age_from_env(self, value, expected):
+        """DB_CONN_MAX_AGE приводится int_or_none, по умолчанию 60 секунд."""
+        assert conn_max_age(value) == expected
+
+    def test_test_settings_keep_connection_profile(self, settings):
+        """settings_test берёт постоянные соединения из todolist/settings.py, а не задаёт свои."""
+        defaults = todolist.settings.DATABASES['default']
+        assert settings.DATABASES['default']['CONN_MAX_AGE'] == defaults['CONN_MAX_AGE']
+        assert settings.DATABASES['default']['CONN_HEALTH_CHECKS'] is defaults['CONN_HEALTH_CHECKS'] is True
+
+    def test_pragmas_applied_on_connect(self, tmp_path, settings):
+        wrapper = self.connect(tmp_path / 'profile.sqlite3')
+        assert pragma(wrapper, 'journal_mode') == 'wal'
+        assert pragma(wrapper, 'synchronous') == 1  # NORMAL
+        assert pragma(wrapper, 'busy_timeout') == settings.SQLITE_PRAGMAS['busy_timeout']
+        assert pragma(wrapper, 'cache_size') == settings.SQLITE_PRAGMAS['cache_size']
+
+    def test_invalid_pragma_rejected(self, tmp_path, settings):
+        settings.SQLITE_PRAGMAS = {'journal_mode': 'wal; DROP TABLE tasks_task'}
+        with pytest.raises(ValueError):
+            self.connect(tmp_path / 'profile.sqlite3')
+
+    @pytest.mark.parametrize("journal_mode, reader_blocked", [
+        ('wal', False),
+        ('delete', True),
+    ])
+    def test_readers_do_not_wait_for_writer(self, tmp_path, settings, journal_mode, reader_blocked):
+        """
+        Писатель держит эксклюзивную блокировку (как при коммите). В WAL читатель
+        сразу видит последнее зафиксированное состояние, в режиме delete ждёт
+        busy_timeout и получает "database is locked".
+        """
+        settings.SQLITE_PRAGMAS = {**settings.SQLITE_PRAGMAS, 'journal_mode': journal_mode, 'busy_timeout': 200}
+        path = tmp_path / 'concurrency.sqlite3'
+        writer = self.connect(path, 'writer')
+        writer.connection.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, title TEXT)')
+        writer.connection.execute("INSERT INTO item (title) VALUES ('committed')")
+        reader = self.connect(path, 'reader')
+
+        writer.connection.execute('BEGIN EXCLUSIVE')
+        writer.connection.execute("UPDATE item SET title = 'uncommitted'")
+
+        started = time.perf_counter()
+        if reader_blocked:
+            with pytest.raises(OperationalError, match='locked'):
+                with reader.cursor() as cursor:
+                    cursor.execute('SELECT title FROM item')
+            assert time.perf_counter() - started >= 0.2
+        else:
+            with reader.cursor() as cursor:
+                cursor.execute('SELECT title FROM item')
+                assert cursor.fetchone() == ('committed',)
+            assert time.perf_counter() - started < 0.1
+
+        writer.connection.execute('COMMIT')
+        with reader.cursor() as cursor:
+            cursor.execute('SELECT title FROM item')
+            assert cursor.fetchone() == ('uncommitted',)
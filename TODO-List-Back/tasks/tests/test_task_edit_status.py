@@ -81,3 +81,8 @@ class TestEditStatusTask:
         """Тест: Вызов edit_status для несуществующей задачи возвращает 404."""
         response = self.client.post(self.non_existent_url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_edit_status_task_deleted_meanwhile(self, delete_task_before_save):
+        """Тест: задачу удалили между чтением и UPDATE - 404, а не 500."""
+        response = self.client.post(self.url_active)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
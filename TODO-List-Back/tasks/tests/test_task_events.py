@@ -0,0 +1,230 @@
+# tasks/tests/test_task_events.py
+
+import pytest
+import asyncio
+import datetime
+import json
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks import events
+from tasks.changes import current_token, fetch_changes, prune_tombstones
+from tasks.events import broker
+from tasks.models import TaskTombstone
+from tasks.services import recompute_statuses
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+def parse_events(content):
+    """[(event, id, data)] из тела text/event-stream, без комментариев и retry."""
+    events = []
+    for block in content.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields['id'], json.loads(fields['data'])))
+    return events
+
+
+@pytest.mark.django_db
+class TestTaskEvents:
+    """
+    Тесты SSE-потока событий задач (GET /api/tasks/events/).
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        # Поток отдаёт накопленные события и сразу закрывается
+        settings.TASKS_SSE_MAX_AGE = 0
+        self.client = APIClient()
+        self.url = reverse('task-events')
+        self.task = create_test_task(title="Existing task")
+        self.token = current_token()
+
+    def events(self, last_event_id=None):
+        headers = {'Last-Event-ID': last_event_id} if last_event_id else {}
+        response = self.client.get(self.url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+        assert response['Cache-Control'] == 'no-cache'
+        return parse_events(b''.join(response.streaming_content))
+
+    def kinds(self, events):
+        return [(kind, data['id']) for kind, _, data in events]
+
+    def test_starts_from_now(self):
+        response = self.client.get(self.url)
+        assert b''.join(response.streaming_content) == b'retry: 3000\n\n'
+
+    def test_resume_from_last_event_id(self):
+        other = create_test_task(title="Other task")
+        token = current_token()
+        self.client.post(reverse('task-list'), {'title': 'Created task'}, format='json')
+        created = self.client.get(reverse('task-list'), {'title': 'Created'}).data[0]
+        self.client.post(reverse('task-edit-status', kwargs={'pk': self.task.pk}))
+        self.client.delete(reverse('task-detail', kwargs={'pk': other.pk}))
+
+        events = self.events(token)
+        assert self.kinds(events) == [
+            ('created', created['id']),
+            ('status', self.task.pk),
+            ('deleted', other.pk),
+        ]
+        assert events[0][2] == created
+        assert events[1][2]['status'] == 'Completed'
+
+        # Продолжение с середины отдаёт только последующие события
+        assert self.kinds(self.events(events[0][1])) == self.kinds(events[1:])
+        assert self.events(events[-1][1]) == []
+
+    def test_replay_coalesces_changes(self):
+        """При повторе изменения одной задачи схлопываются в последнее состояние."""
+        self.client.patch(reverse('task-detail', kwargs={'pk': self.task.pk}), {'title': 'Patched task'}, format='json')
+        self.client.post(reverse('task-edit-status', kwargs={'pk': self.task.pk}))
+        self.client.patch(reverse('task-detail', kwargs={'pk': self.task.pk}), {'priority': 'Low'}, format='json')
+        [(kind, _, data)] = self.events(self.token)
+        assert (kind, data['title'], data['status']) == ('updated', 'Patched task', 'Completed')
+
+    def test_updated_without_status_change(self):
+        self.client.patch(reverse('task-detail', kwargs={'pk': self.task.pk}), {'priority': 'High'}, format='json')
+        [(kind, _, data)] = self.events(self.token)
+        assert (kind, data['priority']) == ('updated', 'High')
+
+    def test_bulk_operations(self):
+        other = create_test_task(title="Other task")
+        token = current_token()
+        self.client.post(reverse('task-bulk-edit-status'), {'ids': [self.task.pk]}, format='json')
+        self.client.post(reverse('task-bulk-update'), {'filter': {'title': 'task'}, 'patch': {'title': 'Renamed'}}, format='json')
+        self.client.post(reverse('task-bulk-delete'), {'ids': [other.pk]}, format='json')
+
+        assert self.kinds(self.events(token)) == [
+            ('updated', self.task.pk),  # status изменён ранее, этот UPDATE его не менял
+            ('deleted', other.pk),
+        ]
+
+    def test_bulk_status_transition(self):
+        self.client.post(reverse('task-bulk-edit-status'), {'ids': [self.task.pk]}, format='json')
+        assert self.kinds(self.events(self.token)) == [('status', self.task.pk)]
+
+    def test_recompute_statuses(self):
+        self.task.deadline = timezone.now().date() + datetime.timedelta(days=1)
+        self.task.save()
+        token = current_token()
+        recompute_statuses(today=timezone.now().date() + datetime.timedelta(days=2))
+
+        [(kind, _, data)] = self.events(token)
+        assert (kind, data['status']) == ('status', 'Overdue')
+
+    @pytest.mark.parametrize("last_event_id", ['abc', '1.x'])
+    def test_invalid_last_event_id(self, last_event_id):
+        response = self.client.get(self.url, headers={'Last-Event-ID': last_event_id})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': 'Invalid token'}
+
+    def test_read_events_yields_each_page(self, monkeypatch):
+        """Страница отдаётся сразу после выборки, следующая читается по запросу."""
+        for index in range(3):
+            create_test_task(title=f"Paged task {index}")
+        calls = []
+
+        def fetch_page(token):
+            calls.append(token)
+            return fetch_changes(token, limit=2)
+
+        monkeypatch.setattr(events, 'fetch_changes', fetch_page)
+        pages = events.read_events(self.token)
+        first, _ = next(pages)
+        assert (len(first), len(calls)) == (2, 1)
+        assert [len(page) for page, _ in pages] == [1]
+        assert len(calls) == 2
+
+    def test_expired_last_event_id(self):
+        self.task.delete()
+        TaskTombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(days=365))
+        prune_tombstones()
+        response = self.client.get(self.url, headers={'Last-Event-ID': self.token})
+        assert response.status_code == status.HTTP_410_GONE
+
+
+@pytest.mark.django_db
+class TestTaskEventsLive:
+    """
+    Тесты доставки событий открытому потоку под ASGI.
+    """
+
+    def test_live_events(self, settings, django_capture_on_commit_callbacks):
+        settings.TASKS_SSE_HEARTBEAT = 10
+        settings.TASKS_SSE_MAX_AGE = 10
+
+        def create_task():
+            with django_capture_on_commit_callbacks(execute=True):
+                return create_test_task(title="Live task")
+
+        async def scenario():
+            response = await AsyncClient().get(reverse('task-events'))
+            stream = response.streaming_content
+            assert await stream.__anext__() == b'retry: 3000\n\n'
+
+            pending = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.05)
+            assert not pending.done()  # ждёт изменения, не опрашивая БД
+            assert broker.subscribers == 1
+
+            task = await sync_to_async(create_task)()
+            chunk = await asyncio.wait_for(pending, timeout=5)
+            assert [(kind, data['id']) for kind, _, data in parse_events(chunk)] == [('created', task.pk)]
+            await stream.aclose()
+
+        async_to_sync(scenario)()
+
+    def test_one_poll_for_all_subscribers(self, settings, monkeypatch, django_capture_on_commit_callbacks):
+        """Изменение читается из БД один раз и раздаётся всем открытым потокам."""
+        settings.TASKS_SSE_HEARTBEAT = 10
+        settings.TASKS_SSE_MAX_AGE = 10
+        polls = []
+
+        def fetch_page(token):
+            polls.append(token)
+            return fetch_changes(token)
+
+        monkeypatch.setattr(events, 'fetch_changes', fetch_page)
+
+        def create_task():
+            with django_capture_on_commit_callbacks(execute=True):
+                return create_test_task(title="Shared task")
+
+        async def scenario():
+            streams = []
+            for _ in range(3):
+                response = await AsyncClient().get(reverse('task-events'))
+                streams.append(response.streaming_content)
+                assert await streams[-1].__anext__() == b'retry: 3000\n\n'
+            pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+            await asyncio.sleep(0.05)
+            polls.clear()
+
+            task = await sync_to_async(create_task)()
+            chunks = await asyncio.wait_for(asyncio.gather(*pending), timeout=5)
+            assert all(parse_events(chunk) == parse_events(chunks[0]) for chunk in chunks)
+            assert [(kind, data['id']) for kind, _, data in parse_events(chunks[0])] == [('created', task.pk)]
+            assert len(polls) == 1
+            for stream in streams:
+                await stream.aclose()
+
+        async_to_sync(scenario)()
+
+    def test_heartbeat_and_close(self, settings):
+        settings.TASKS_SSE_HEARTBEAT = 0
+        settings.TASKS_SSE_MAX_AGE = 0.2
+
+        async def scenario():
+            response = await AsyncClient().get(reverse('task-events'))
+            return [chunk async for chunk in response.streaming_content]
+
+        chunks = async_to_sync(scenario)()
+        assert chunks[0] == b'retry: 3000\n\n'
+        assert b': ping\n\n' in chunks
+        assert broker.subscribers == 0
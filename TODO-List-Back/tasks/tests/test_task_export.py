@@ -0,0 +1,72 @@
+# tasks/tests/test_task_export.py
+
+import pytest
+import csv
+import io
+import json
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.exports import stream_ndjson
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+def read_stream(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestTaskExport:
+    """
+    Тесты потокового экспорта (GET /api/tasks/export/?export_format=ndjson|csv).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('task-export')
+        self.list_url = reverse('task-list')
+        create_test_task(title="B task", priority=Task.Priority.HIGH, description='Line\nbreak, "quoted"')
+        create_test_task(title="A task", priority=Task.Priority.LOW, is_completed_by_user=True)
+        create_test_task(title="C task", priority=Task.Priority.HIGH)
+
+    def test_ndjson_matches_list(self):
+        """Каждая строка NDJSON - задача в том же виде и порядке, что в списке."""
+        response = self.client.get(self.url)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert 'tasks.ndjson' in response['Content-Disposition']
+
+        lines = read_stream(response).splitlines()
+        assert [json.loads(line) for line in lines] == self.client.get(self.list_url).data
+
+    def test_filters_and_sort_applied(self):
+        params = {'export_format': 'ndjson', 'priority': 'High', 'sort': 'title', 'order': 'desc'}
+        lines = read_stream(self.client.get(self.url, params)).splitlines()
+        assert [json.loads(line)['title'] for line in lines] == ["C task", "B task"]
+
+    def test_csv(self):
+        response = self.client.get(self.url, {'export_format': 'csv'})
+        assert response['Content-Type'] == 'text/csv'
+
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert [row['title'] for row in rows] == ["A task", "B task", "C task"]
+        assert rows[1]['description'] == 'Line\nbreak, "quoted"'
+        assert rows[0]['is_completed_by_user'] == 'true'
+        assert rows[0]['deadline'] == ''
+
+    def test_empty_export(self):
+        Task.objects.all().delete()
+        assert read_stream(self.client.get(self.url)) == ''
+        assert read_stream(self.client.get(self.url, {'export_format': 'csv'})).startswith('id,title')
+
+    def test_invalid_format(self):
+        response = self.client.get(self.url, {'export_format': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_streamed_in_chunks(self):
+        """Данные отдаются порциями по chunk_size строк."""
+        chunks = list(stream_ndjson(Task.objects.order_by('id'), chunk_size=2))
+        assert [chunk.count(b'\n') for chunk in chunks] == [2, 1]
@@ -0,0 +1,104 @@
+# tasks/tests/test_task_get_list_pagination.py
+
+import pytest
+import datetime
+from urllib.parse import parse_qs, urlparse
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_tasks
+
+
+def collect_pages(client, url, params):
+    """Проходит по всем страницам через next и возвращает PK в порядке выдачи."""
+    pks = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        pks.extend(task['id'] for task in response.data['results'])
+        if response.data['next'] is None:
+            return pks
+        response = client.get(response.data['next'])
+
+
+@pytest.mark.django_db
+class TestTaskGetListPagination:
+    """
+    Тесты keyset-пагинации списка задач (GET /api/tasks/?page_size=&cursor=).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        self.today = timezone.now().date()
+
+        # Повторяющиеся значения сортируемых полей, чтобы проверить тайбрейк по id
+        priorities = [Task.Priority.LOW, Task.Priority.MEDIUM, Task.Priority.HIGH, Task.Priority.CRITICAL]
+        self.tasks = create_test_tasks([
+            dict(
+                title=f"Task {i % 5}",
+                priority=priorities[i % 4],
+                deadline=None if i % 4 == 0 else self.today + datetime.timedelta(days=i % 3 - 1),
+                is_completed_by_user=(i % 3 == 0),
+            )
+            for i in range(13)
+        ])
+
+    def test_without_params_returns_plain_list(self):
+        """Без cursor/page_size ответ остаётся обычным списком."""
+        response = self.client.get(self.list_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == len(self.tasks)
+
+    def test_first_page_shape(self):
+        """Первая страница содержит page_size задач и ссылку next."""
+        response = self.client.get(self.list_url, {'page_size': 5})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 5
+        assert response.data['next'] is not None
+
+    @pytest.mark.parametrize("sort_param", ['title', 'created_at', 'priority', 'deadline', 'status', 'task_status'])
+    @pytest.mark.parametrize("order_param", ['asc', 'desc'])
+    @pytest.mark.parametrize("page_size", [1, 4, 5])
+    def test_pages_match_unpaginated_order(self, sort_param, order_param, page_size):
+        """Склеенные страницы совпадают с полным списком при любой сортировке."""
+        params = {'sort': sort_param, 'order': order_param}
+        expected = [task['id'] for task in self.client.get(self.list_url, params).data]
+
+        paged = collect_pages(self.client, self.list_url, {**params, 'page_size': page_size})
+        assert paged == expected
+
+    def test_pagination_with_filter(self):
+        """Фильтры сохраняются в ссылке next."""
+        params = {'priority': Task.Priority.LOW, 'sort': 'deadline', 'order': 'desc'}
+        expected = [task['id'] for task in self.client.get(self.list_url, params).data]
+
+        paged = collect_pages(self.client, self.list_url, {**params, 'page_size': 2})
+        assert paged == expected
+
+    def test_page_size_is_capped(self):
+        """page_size больше максимума обрезается, некорректный заменяется дефолтом."""
+        response = self.client.get(self.list_url, {'page_size': 100000})
+        assert len(response.data['results']) == len(self.tasks)
+
+        response = self.client.get(self.list_url, {'page_size': 'abc'})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == len(self.tasks)
+
+    @pytest.mark.parametrize("cursor", ['not-base64!', 'e30=', 'W10=', 'eyJvIjpbInRpdGxlIiwiaWQiXSwidiI6WzEsImEiXX0='])
+    def test_invalid_cursor(self, cursor):
+        """Битый или подделанный курсор возвращает 404."""
+        response = self.client.get(self.list_url, {'cursor': cursor})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_from_other_sort_rejected(self):
+        """Курсор, выданный для одной сортировки, не принимается другой."""
+        response = self.client.get(self.list_url, {'sort': 'title', 'page_size': 2})
+        cursor = parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+
+        response = self.client.get(self.list_url, {'sort': 'priority', 'cursor': cursor})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -8,7 +8,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from tasks.models import Task
-from tasks.tests.utilits.create_test_task import create_test_task
+from tasks.tests.utilits.create_test_task import create_test_tasks
 
 def get_pks_from_response(response):
     """Извлекает список PK задач из ответа API (предполагается список)."""
@@ -29,37 +29,47 @@ class TestTaskGetListWithFiltersAndSorts:
         self.list_url = reverse('task-list') # URL для списка задач
         self.today = timezone.now().date()
 
-        # --- Создаем разнообразный набор задач ---
+        # --- Создаем разнообразный набор задач (одним bulk_create) ---
         # Имена задач выбраны так, чтобы упростить проверку сортировки по title (A, B, C...)
         # Статусы: Active (будущее), Overdue (прошлое), Completed (будущее), Late (прошлое), No Deadline
-        self.task_a_med_overdue = create_test_task(
-            title="A Task Medium Overdue", priority=Task.Priority.MEDIUM,
-            deadline=self.today - datetime.timedelta(days=2), is_completed_by_user=False
-        ) # Status: OVERDUE
-        self.task_b_high_active = create_test_task(
-            title="B Task High Active", priority=Task.Priority.HIGH,
-            deadline=self.today + datetime.timedelta(days=5), is_completed_by_user=False
-        ) # Status: ACTIVE
-        self.task_c_low_active_nodl = create_test_task(
-            title="C Task Low Active NoDL", priority=Task.Priority.LOW,
-            deadline=None, is_completed_by_user=False
-        ) # Status: ACTIVE
-        self.task_d_low_late = create_test_task(
-            title="D Task Low Late", priority=Task.Priority.LOW,
-            deadline=self.today - datetime.timedelta(days=1), is_completed_by_user=True
-        ) # Status: LATE
-        self.task_e_crit_completed_nodl = create_test_task(
-            title="E Task Crit Completed NoDL", priority=Task.Priority.CRITICAL,
-            deadline=None, is_completed_by_user=True
-        ) # Status: COMPLETED
-        self.task_f_med_completed = create_test_task(
-            title="F Task Medium Completed", priority=Task.Priority.MEDIUM,
-            deadline=self.today + datetime.timedelta(days=10), is_completed_by_user=True
-        ) # Status: COMPLETED
-        self.task_g_med_active = create_test_task(
-            title="G Task Medium Active", priority=Task.Priority.MEDIUM,
-            deadline=self.today + datetime.timedelta(days=3), is_completed_by_user=False
-        ) # Status: ACTIVE
+        (
+            self.task_a_med_overdue,
+            self.task_b_high_active,
+            self.task_c_low_active_nodl,
+            self.task_d_low_late,
+            self.task_e_crit_completed_nodl,
+            self.task_f_med_completed,
+            self.task_g_med_active,
+        ) = create_test_tasks([
+            dict(
+                title="A Task Medium Overdue", priority=Task.Priority.MEDIUM,
+                deadline=self.today - datetime.timedelta(days=2), is_completed_by_user=False,
+            ),  # Status: OVERDUE
+            dict(
+                title="B Task High Active", priority=Task.Priority.HIGH,
+                deadline=self.today + datetime.timedelta(days=5), is_completed_by_user=False,
+            ),  # Status: ACTIVE
+            dict(
+                title="C Task Low Active NoDL", priority=Task.Priority.LOW,
+                deadline=None, is_completed_by_user=False,
+            ),  # Status: ACTIVE
+            dict(
+                title="D Task Low Late", priority=Task.Priority.LOW,
+                deadline=self.today - datetime.timedelta(days=1), is_completed_by_user=True,
+            ),  # Status: LATE
+            dict(
+                title="E Task Crit Completed NoDL", priority=Task.Priority.CRITICAL,
+                deadline=None, is_completed_by_user=True,
+            ),  # Status: COMPLETED
+            dict(
+                title="F Task Medium Completed", priority=Task.Priority.MEDIUM,
+                deadline=self.today + datetime.timedelta(days=10), is_completed_by_user=True,
+            ),  # Status: COMPLETED
+            dict(
+                title="G Task Medium Active", priority=Task.Priority.MEDIUM,
+                deadline=self.today + datetime.timedelta(days=3), is_completed_by_user=False,
+            ),  # Status: ACTIVE
+        ])
 
         # Список всех PK для удобства проверки полноты ответа
         self.all_task_pks = sorted([
@@ -249,3 +259,39 @@ class TestTaskGetListWithFiltersAndSorts:
             self.task_a_med_overdue.pk    # -2d
         ]
         assert returned_pks == expected_pks
+
+    # --- Фильтрация и сортировка по фактическому статусу (task_status) ---
+
+    @pytest.mark.parametrize("task_status_query, expected_pks_func", [
+        ('Active', lambda s: sorted([s.task_b_high_active.pk, s.task_c_low_active_nodl.pk, s.task_g_med_active.pk])),
+        ('Completed', lambda s: sorted([s.task_e_crit_completed_nodl.pk, s.task_f_med_completed.pk])),
+        ('Overdue', lambda s: [s.task_a_med_overdue.pk]),
+        ('Late', lambda s: [s.task_d_low_late.pk]),
+        ('late', lambda s: s.all_task_pks),  # Невалидное значение игнорируется
+    ])
+    def test_list_filter_by_task_status(self, task_status_query, expected_pks_func):
+        """Тест фильтрации по фактическому статусу."""
+        response = self.client.get(self.list_url, {'task_status': task_status_query})
+        returned_pks = sorted(get_pks_from_response(response))
+        assert returned_pks == expected_pks_func(self)
+
+    def test_list_filter_by_task_status_ignores_stale_column(self):
+        """Фильтр считает статус по дате, даже если сохранённый status устарел."""
+        # Дедлайн прошёл, но задачу никто не пересохранил
+        Task.objects.filter(pk=self.task_g_med_active.pk).update(deadline=self.today - datetime.timedelta(days=1))
+
+        response = self.client.get(self.list_url, {'task_status': 'Overdue'})
+        returned_pks = sorted(get_pks_from_response(response))
+        assert returned_pks == sorted([self.task_a_med_overdue.pk, self.task_g_med_active.pk])
+
+    @pytest.mark.parametrize("order_param, expected_groups", [
+        ('asc', ['Active', 'Completed', 'Overdue', 'Late']),
+        ('desc', ['Late', 'Overdue', 'Completed', 'Active']),
+    ])
+    def test_list_sort_by_task_status(self, order_param, expected_groups):
+        """Тест сортировки по фактическому статусу: группы идут в порядке Task.Status."""
+        response = self.client.get(self.list_url, {'sort': 'task_status', 'order': order_param})
+        statuses = [task['status'] for task in response.data]
+        groups = [status_value for i, status_value in enumerate(statuses) if i == 0 or statuses[i - 1] != status_value]
+        assert groups == expected_groups
+        assert len(statuses) == len(self.all_task_pks)
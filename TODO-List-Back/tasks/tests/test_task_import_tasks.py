@@ -0,0 +1,179 @@
+# tasks/tests/test_task_import_tasks.py
+
+import pytest
+import json
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tasks.exports import stream_csv
+from tasks.models import Task, TaskImportCheckpoint
+from tasks.services import bulk_create_tasks
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+def write_ndjson(path, items):
+    path.write_text(''.join(json.dumps(item) + '\n' for item in items), encoding='utf-8')
+    return path
+
+
+def run_import(path, *args):
+    out, err = StringIO(), StringIO()
+    call_command('import_tasks', str(path), *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportTasks:
+    """
+    Тесты команды import_tasks (потоковый импорт NDJSON/CSV с контрольной точкой).
+    """
+
+    def test_import_ndjson(self, tmp_path):
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [
+            {'title': 'First task', 'priority': 'High', 'deadline': '2030-01-01'},
+            {'title': 'Second task', 'description': 'Юникод', 'deadline': ''},
+        ])
+
+        out, err = run_import(path)
+
+        assert 'Imported 2 tasks, skipped 0 invalid rows' in out
+        assert 'tasks/s' in out
+        assert err == ''
+        first, second = Task.objects.order_by('id')
+        assert (first.title, first.priority, first.priority_rank, first.status) == ('First task', 'High', 3, 'Active')
+        assert (second.description, second.deadline, second.priority) == ('Юникод', None, 'Medium')
+
+    def test_import_csv_roundtrip_from_export(self, tmp_path):
+        """Файл экспорта CSV загружается обратно; read-only колонки игнорируются."""
+        create_test_task(title="Exported task", description='Line\nbreak, "quoted"', priority=Task.Priority.LOW)
+        create_test_task(title="Another task", deadline=None)
+        path = tmp_path / 'tasks.csv'
+        path.write_bytes(b''.join(stream_csv(Task.objects.order_by('id'))))
+        Task.objects.all().delete()
+
+        out, _ = run_import(path)
+
+        assert 'Imported 2 tasks' in out
+        assert list(Task.objects.order_by('id').values_list('title', 'description', 'priority')) == [
+            ('Exported task', 'Line\nbreak, "quoted"', 'Low'),
+            ('Another task', 'Initial description', 'Medium'),
+        ]
+
+    def test_invalid_rows_skipped_and_reported(self, tmp_path):
+        path = tmp_path / 'tasks.ndjson'
+        path.write_text('\n'.join([
+            json.dumps({'title': 'Valid task'}),
+            json.dumps({'title': 'Abc'}),
+            json.dumps({'title': 'Bad priority', 'priority': 'Urgent'}),
+            json.dumps({'title': 'Bad deadline', 'deadline': '31.12.2025'}),
+            '{not json',
+            '[1, 2]',
+            '',
+            json.dumps({'title': 'Valid task 2'}),
+        ]) + '\n', encoding='utf-8')
+
+        out, err = run_import(path)
+
+        assert 'Imported 2 tasks, skipped 5 invalid rows' in out
+        assert [line.split(':')[0] for line in err.splitlines()] == ['Line 2', 'Line 3', 'Line 4', 'Line 5', 'Line 6']
+        assert set(Task.objects.values_list('title', flat=True)) == {'Valid task', 'Valid task 2'}
+
+    def test_invalid_utf8_csv_rows_reported(self, tmp_path):
+        """Строка CSV не в UTF-8 - ошибка этой записи, как некорректная строка NDJSON."""
+        path = tmp_path / 'tasks.csv'
+        path.write_bytes(
+            b'title,description\n'
+            b'Valid task,ok\n'
+            b'Broken \xff task,bad\n'
+            b'Quoted task,"first\n\xfe second"\n'
+            b'Valid task 2,ok\n'
+        )
+
+        out, err = run_import(path)
+
+        assert 'Imported 2 tasks, skipped 2 invalid rows' in out
+        assert [line.split(':')[0] for line in err.splitlines()] == ['Line 3', 'Line 5']
+        assert 'Invalid UTF-8' in err
+        assert set(Task.objects.values_list('title', flat=True)) == {'Valid task', 'Valid task 2'}
+
+    def test_invalid_utf8_csv_header(self, tmp_path):
+        path = tmp_path / 'tasks.csv'
+        path.write_bytes(b'title,\xffdescription\nValid task,ok\n')
+        with pytest.raises(CommandError, match='Line 1: Invalid UTF-8 in header'):
+            run_import(path, '--strict')
+        assert Task.objects.count() == 0
+
+    def test_strict_stops_on_invalid_row(self, tmp_path):
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [
+            {'title': 'Valid task'}, {'title': 'Valid task 2'}, {'title': 'Abc'},
+        ])
+        with pytest.raises(CommandError, match='Line 3'):
+            run_import(path, '--strict', '--chunk-size', '1')
+        assert Task.objects.count() == 2
+
+    def test_resume_after_interruption(self, tmp_path):
+        """После сбоя импорт продолжается с последней пачки, задачи не дублируются."""
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [{'title': f'Task {index:04}'} for index in range(10)])
+
+        calls = []
+
+        def failing_bulk_create(items, chunk_size):
+            calls.append(len(items))
+            if len(calls) == 3:
+                raise RuntimeError('Connection lost')
+            return bulk_create_tasks(items, chunk_size)
+
+        target = 'tasks.management.commands.import_tasks.bulk_create_tasks'
+        with mock.patch(target, failing_bulk_create), pytest.raises(RuntimeError):
+            run_import(path, '--chunk-size', '3')
+
+        assert Task.objects.count() == 6
+        checkpoint = TaskImportCheckpoint.objects.get()
+        assert (checkpoint.line, checkpoint.created) == (6, 6)
+
+        out, _ = run_import(path, '--chunk-size', '3')
+
+        assert 'Resuming from line 6' in out
+        assert 'Imported 4 tasks' in out
+        titles = list(Task.objects.order_by('id').values_list('title', flat=True))
+        assert titles == [f'Task {index:04}' for index in range(10)]
+
+    def test_resume_csv(self, tmp_path):
+        path = tmp_path / 'tasks.csv'
+        path.write_text('title,priority\nTask one,Low\nTask two,High\n', encoding='utf-8')
+        run_import(path)
+
+        with path.open('a', encoding='utf-8') as file:
+            file.write('Task three,Critical\n')
+        out, _ = run_import(path)
+
+        assert 'Imported 1 tasks' in out
+        assert list(Task.objects.order_by('id').values_list('title', 'priority')) == [
+            ('Task one', 'Low'), ('Task two', 'High'), ('Task three', 'Critical'),
+        ]
+
+    def test_rerun_finished_import_is_noop(self, tmp_path):
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [{'title': 'Only task'}])
+        run_import(path)
+        out, _ = run_import(path)
+        assert 'Imported 0 tasks' in out
+        assert Task.objects.count() == 1
+
+    def test_restart(self, tmp_path):
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [{'title': 'Only task'}])
+        run_import(path)
+        run_import(path, '--restart')
+        assert Task.objects.count() == 2
+
+    def test_checkpoint_past_end_of_file(self, tmp_path):
+        path = write_ndjson(tmp_path / 'tasks.ndjson', [{'title': 'First task'}, {'title': 'Second task'}])
+        run_import(path)
+        write_ndjson(path, [{'title': 'New'}])
+        with pytest.raises(CommandError, match='--restart'):
+            run_import(path)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError, match='File not found'):
+            run_import(tmp_path / 'missing.ndjson')
@@ -0,0 +1,117 @@
+# tasks/tests/test_task_instrumentation.py
+
+import pytest
+import json
+import logging
+import re
+import time
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+import tasks.serializers
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_tasks
+
+TIMING = re.compile(
+    r'^total;dur=(?P<total>[\d.]+), sql;dur=(?P<sql>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r'serialize;dur=(?P<serialize>[\d.]+)$'
+)
+
+
+@pytest.mark.django_db
+class TestInstrumentation:
+    """
+    Тесты InstrumentationMiddleware: Server-Timing и строка лога с метриками запроса.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.TASKS_INSTRUMENTATION = True
+        settings.TASKS_CACHE_ENABLED = False
+        # Middleware собирается при первом запросе клиента, поэтому клиент - после настроек
+        self.client = APIClient()
+        self.url = reverse('task-list')
+        create_test_tasks([{'title': f"Task number {index}"} for index in range(3)])
+
+    def timing(self, response):
+        match = TIMING.match(response['Server-Timing'])
+        assert match, response['Server-Timing']
+        return match
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        timing = self.timing(response)
+        assert int(timing['queries']) == len(queries)
+        assert float(timing['total']) >= float(timing['sql'])
+        assert float(timing['serialize']) > 0
+
+    @pytest.mark.parametrize("path, params", [
+        ('list', {}),
+        ('list', {'page_size': 2}),
+        ('detail', {}),
+    ])
+    def test_serialize_includes_view_serialization(self, monkeypatch, path, params):
+        """serialize - это и построение данных ответа (TaskSerializer, task_list_data), не только рендеринг."""
+        to_representation = tasks.serializers.TaskSerializer.to_representation
+        rows_to_dicts = tasks.serializers.task_rows_to_dicts
+
+        def slow_representation(serializer, instance):
+            time.sleep(0.02)
+            return to_representation(serializer, instance)
+
+        def slow_rows_to_dicts(rows, fields=None):
+            time.sleep(0.02)
+            return rows_to_dicts(rows, fields)
+
+        monkeypatch.setattr(tasks.serializers.TaskSerializer, 'to_representation', slow_representation)
+        monkeypatch.setattr(tasks.serializers, 'task_rows_to_dicts', slow_rows_to_dicts)
+        url = self.url if path == 'list' else reverse('task-detail', kwargs={'pk': Task.objects.first().pk})
+        response = self.client.get(url, params)
+        assert response.status_code == 200
+        assert float(self.timing(response)['serialize']) >= 20
+
+    def test_counts_write_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'title': 'Created task'}, format='json')
+        assert response.status_code == 201
+        assert int(self.timing(response)['queries']) == len(queries)
+
+    def test_log_line(self, caplog):
+        with caplog.at_level(logging.INFO, logger='tasks.instrumentation'):
+            self.client.get(self.url, {'priority': 'Medium'})
+
+        [record] = caplog.records
+        fields = json.loads(record.getMessage())
+        assert fields == record.metrics
+        assert (fields['method'], fields['path'], fields['status']) == ('GET', '/api/tasks/', 200)
+        assert fields['queries'] >= 2
+        assert set(fields) == {'method', 'path', 'status', 'total_ms', 'sql_ms', 'queries', 'serialize_ms'}
+
+    def test_log_threshold_and_no_header(self, settings, caplog):
+        settings.TASKS_INSTRUMENTATION_LOG_MS = 60000
+        settings.TASKS_INSTRUMENTATION_HEADER = False
+        with caplog.at_level(logging.INFO, logger='tasks.instrumentation'):
+            response = self.client.get(self.url)
+        assert 'Server-Timing' not in response
+        assert caplog.records == []
+
+    def test_asgi_counts_queries_in_threads(self):
+        """Запросы из sync_to_async-потоков тоже попадают в метрики запроса."""
+        async def get():
+            return await AsyncClient().get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = async_to_sync(get)()
+        assert int(self.timing(response)['queries']) == len(queries) > 0
+
+    def test_disabled(self, settings):
+        settings.TASKS_INSTRUMENTATION = False
+        response = APIClient().get(self.url)
+        assert response.status_code == 200
+        assert 'Server-Timing' not in response
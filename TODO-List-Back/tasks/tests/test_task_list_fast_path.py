@@ -0,0 +1,64 @@
+# tasks/tests/test_task_list_fast_path.py
+
+import pytest
+import datetime
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from tasks.serializers import TaskSerializer, task_list_data
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+@pytest.mark.django_db
+class TestTaskListFastPath:
+    """
+    Тесты быстрого пути списка (values_list() вместо TaskSerializer на каждую задачу).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        today = timezone.now().date()
+
+        create_test_task(title="Plain task")
+        create_test_task(
+            title="Юникод и \"кавычки\"    ",
+            description="Line\nbreak\ttab \\ slash </script> 😀",
+            deadline=today - datetime.timedelta(days=3),
+            priority=Task.Priority.CRITICAL,
+            is_completed_by_user=True,
+        )
+        edited = create_test_task(title="Edited task", deadline=today + datetime.timedelta(days=7))
+        edited.description = "edited"
+        edited.save()  # updated_at заполнен
+
+    def render_serializer(self, queryset):
+        return JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+
+    def test_bytes_identical_to_serializer(self):
+        queryset = Task.objects.order_by('id')
+        assert JSONRenderer().render(task_list_data(queryset)) == self.render_serializer(queryset)
+
+    def test_keys_in_serializer_order(self):
+        data = task_list_data(Task.objects.all())
+        assert all(list(item) == list(TaskSerializer().fields) for item in data)
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {'sort': 'priority', 'order': 'desc'},
+        {'sort': 'deadline'},
+        {'sort': 'task_status'},
+        {'status': 'true'},
+    ])
+    def test_api_response_identical(self, params):
+        """Ответ API совпадает с ответом через TaskSerializer для того же queryset."""
+        response = self.client.get(self.list_url, params)
+
+        expected_pks = [item['id'] for item in response.data]
+        tasks = {task.pk: task for task in Task.objects.all()}
+        expected = self.render_serializer([tasks[pk] for pk in expected_pks])
+        assert response.content == expected
+        assert response['Content-Type'] == 'application/json'
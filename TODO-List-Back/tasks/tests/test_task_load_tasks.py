@@ -0,0 +1,96 @@
+# tasks/tests/test_task_load_tasks.py
+
+import pytest
+import datetime
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestLoadTasks:
+    """
+    Тесты bulk-загрузки задач (POST /api/tasks/load_tasks/).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('task-load-tasks')
+        self.today = timezone.now().date()
+
+    def test_load_tasks_success(self):
+        """Все задачи создаются, статус вычисляется по дедлайну."""
+        past = (self.today - datetime.timedelta(days=1)).isoformat()
+        future = (self.today + datetime.timedelta(days=1)).isoformat()
+        payload = [
+            {"title": "Overdue task", "deadline": past, "priority": "High"},
+            {"title": "Active task", "deadline": future},
+            {"title": "No deadline", "deadline": "", "description": "text"},
+        ]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {'created': 3}
+
+        tasks = {task.title: task for task in Task.objects.all()}
+        assert tasks["Overdue task"].status == Task.Status.OVERDUE
+        assert tasks["Overdue task"].priority == Task.Priority.HIGH
+        assert tasks["Active task"].status == Task.Status.ACTIVE
+        assert tasks["No deadline"].deadline is None
+        assert tasks["No deadline"].created_at == self.today
+        assert tasks["No deadline"].updated_at is None
+
+    def test_load_tasks_read_only_fields_ignored(self):
+        """Поля только для чтения (статус, отметка о выполнении) не принимаются из запроса."""
+        payload = [{"title": "Read only", "status": "Late", "is_completed_by_user": True}]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        task = Task.objects.get()
+        assert task.status == Task.Status.ACTIVE
+        assert task.is_completed_by_user is False
+
+    def test_load_tasks_many_chunks(self):
+        """Пачка больше размера чанка вставляется целиком."""
+        payload = [{"title": f"Task {i:04d}"} for i in range(2500)]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Task.objects.count() == 2500
+
+    def test_load_tasks_per_item_errors(self):
+        """Ошибки возвращаются по индексам, ни одна задача не создаётся."""
+        payload = [
+            {"title": "Valid title"},
+            {"title": "Abc"},
+            {"title": "Valid too", "priority": "Urgent"},
+            {"title": "Bad deadline", "deadline": "31.12.2025"},
+        ]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [error['index'] for error in response.data] == [1, 2, 3]
+        assert 'title' in response.data[0]['errors']
+        assert 'priority' in response.data[1]['errors']
+        assert 'deadline' in response.data[2]['errors']
+        assert Task.objects.count() == 0
+
+    @pytest.mark.parametrize("payload", [{"title": "Not a list"}, "text", None])
+    def test_load_tasks_not_a_list(self, payload):
+        """Тело запроса должно быть списком."""
+        response = self.client.post(self.url, payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Task.objects.count() == 0
+
+    def test_load_tasks_empty_list(self):
+        """Пустой список ничего не создаёт."""
+        response = self.client.post(self.url, [], format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {'created': 0}
@@ -0,0 +1,132 @@
+# tasks/tests/test_task_loadtest.py
+
+import pytest
+import json
+import random
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tasks.loadtest import TaskIdPool, build_request, parse_mix, percentile
+from tasks.models import Task
+from tasks.tests.utilits.create_test_task import create_test_tasks
+
+
+def run_command(**options):
+    out = StringIO()
+    call_command('loadtest', json=True, stdout=out, **options)
+    return json.loads(out.getvalue())
+
+
+class TestLoadtestHelpers:
+    """
+    Тесты разбора доли запросов, пула id и перцентилей.
+    """
+
+    def test_parse_mix(self):
+        assert parse_mix('list=40, detail=30,create=0') == {'list': 40.0, 'detail': 30.0, 'create': 0.0}
+
+    @pytest.mark.parametrize('value', ['list=40,unknown=1', 'list=abc', 'list=-1', 'list=0'])
+    def test_parse_mix_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_mix(value)
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.50) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+        assert percentile([7], 0.99) == 7
+
+    def test_empty_pool_falls_back_to_create(self):
+        """Без задач в пуле detail / patch / delete заменяются созданием."""
+        pool, rng = TaskIdPool([]), random.Random(0)  # nosec B311
+        for endpoint in ('detail', 'patch', 'edit_status', 'delete'):
+            name, method, path, body = build_request(endpoint, pool, rng, {})
+            assert (name, method, path) == ('create', 'POST', '/api/tasks/')
+            assert body['title']
+
+    def test_delete_takes_id_from_pool(self):
+        pool, rng = TaskIdPool([5]), random.Random(0)  # nosec B311
+        assert build_request('delete', pool, rng, {})[:3] == ('delete', 'DELETE', '/api/tasks/5/')
+        assert len(pool) == 0
+
+
+@pytest.mark.django_db
+class TestLoadtestCommand:
+    """
+    Тесты команды loadtest внутри процесса на текущей БД.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        create_test_tasks([{'title': f"Task number {index}"} for index in range(5)])
+
+    def test_report(self):
+        report = run_command(current_db=True, concurrency=1, requests=60, tasks=10, seed=1)
+
+        total = report['total']
+        assert total['requests'] == 60
+        assert total['errors'] == 0
+        assert sum(row['requests'] for row in report['endpoints'].values()) == 60
+        assert set(report['endpoints']) <= {'list', 'detail', 'edit_status', 'patch', 'create', 'delete'}
+        for row in report['endpoints'].values():
+            assert 0 < row['p50_ms'] <= row['p95_ms'] <= row['p99_ms'] <= row['max_ms']
+            assert row['rps'] > 0
+        # Недостающие до --tasks задачи созданы перед нагрузкой
+        created = report['endpoints'].get('create', {}).get('requests', 0)
+        deleted = report['endpoints'].get('delete', {}).get('requests', 0)
+        assert Task.objects.count() == 10 + created - deleted
+
+    def test_mix_and_list_params(self):
+        report = run_command(
+            current_db=True, concurrency=1, requests=20, tasks=0,
+            mix='list=1', list_params='page_size=2&sort=title',
+        )
+        assert report['endpoints']['list']['statuses'] == {'200': 20}
+        assert report['scenario']['list_params'] == {'page_size': '2', 'sort': 'title'}
+        assert Task.objects.count() == 5
+
+    def test_errors_are_counted(self):
+        report = run_command(current_db=True, concurrency=1, requests=5, tasks=0, mix='list=1', list_params='cursor=bad')
+        assert report['endpoints']['list']['statuses'] == {'404': 5}
+        assert report['total']['errors'] == 5
+        assert report['total']['error_rate'] == 1.0
+
+    def test_saved_scenario_is_reused(self, tmp_path):
+        path = tmp_path / 'scenario.json'
+        first = run_command(
+            current_db=True, concurrency=1, requests=15, tasks=0, mix='list=3,detail=1', save_scenario=str(path),
+        )
+        assert json.loads(path.read_text()) == first['scenario']
+
+        second = run_command(current_db=True, scenario=str(path), requests=5)
+        assert second['scenario'] == {**first['scenario'], 'requests': 5}
+        assert second['total']['requests'] == 5
+
+    def test_invalid_scenario(self, tmp_path):
+        path = tmp_path / 'scenario.json'
+        path.write_text(json.dumps({'workers': 3}))
+        with pytest.raises(CommandError, match='Unknown scenario keys: workers'):
+            run_command(current_db=True, scenario=str(path))
+        with pytest.raises(CommandError):
+            run_command(current_db=True, mix='list=1,nope=2')
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadtestLiveServer:
+    """
+    Нагрузка несколькими воркерами на запущенный сервер (--url).
+    """
+
+    def test_url(self, live_server):
+        create_test_tasks([{'title': f"Task number {index}"} for index in range(5)])
+
+        report = run_command(url=live_server.url, concurrency=3, requests=30, mix='list=1,detail=1', seed=2)
+        assert report['total']['requests'] == 30
+        assert report['total']['errors'] == 0
+        assert set(report['endpoints']) == {'list', 'detail'}
+
+    def test_invalid_url(self):
+        with pytest.raises(CommandError, match='Expected http'):
+            run_command(url='ftp://example.com')
@@ -156,4 +156,18 @@ class TestPatchTask:
 
         patch_data = {'title': 'Does not matter'}
         response = self.client.patch(self.non_existent_url, patch_data, format='json')
-        assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_patch_task_deleted_meanwhile(self, delete_task_before_save):
+        """Тест: задачу удалили между чтением и UPDATE - 404, а не 500."""
+        response = self.client.patch(self.detail_url, {'title': 'Too late'}, format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not Task.objects.filter(pk=self.task.pk).exists()
+
+    def test_save_deleted_task_raises_does_not_exist(self):
+        """Тест: сохранение устаревшего экземпляра не пытается вставить строку с F('version')."""
+        Task.objects.filter(pk=self.task.pk).delete()
+        self.task.title = 'Stale'
+        with pytest.raises(Task.DoesNotExist):
+            self.task.save()
+        assert not Task.objects.filter(pk=self.task.pk).exists()
@@ -0,0 +1,88 @@
+# tasks/tests/test_task_query_plans.py
+
+import datetime
+
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.models import Task
+from tasks.pagination import TaskKeysetPagination
+from tasks.services import bulk_update_tasks, recompute_statuses
+from tasks.tests.utilits.create_test_task import create_test_task
+from tasks.views import TaskViewSet
+
+pytestmark = pytest.mark.skipif(connection.vendor != 'sqlite', reason='Планы запросов проверяются для SQLite')
+
+
+def get_list_queryset(params):
+    """Queryset, который строит TaskViewSet.get_queryset для GET /api/tasks/ с params."""
+    view = TaskViewSet(action='list')
+    view.request = Request(APIRequestFactory().get('/api/tasks/', params))
+    return view.get_queryset()
+
+
+@pytest.mark.django_db
+class TestTaskQueryPlans:
+    """
+    EXPLAIN-тесты: сортировки списка идут по индексу, без сортировки всей выборки.
+    """
+
+    def setup_method(self):
+        for priority in Task.Priority.values:
+            create_test_task(title=f"Task {priority}", priority=priority)
+
+    @pytest.mark.parametrize("params, index_name", [
+        ({'sort': 'priority', 'order': 'asc'}, 'task_prio_rank_id_idx'),
+        ({'sort': 'priority', 'order': 'desc'}, 'task_prio_rank_id_idx'),
+        ({'sort': 'task_status', 'order': 'asc'}, 'task_status_rank_id_idx'),
+        ({'sort': 'task_status', 'order': 'desc'}, 'task_status_rank_id_idx'),
+        ({'sort': 'status', 'order': 'asc'}, 'task_completed_id_idx'),
+        ({'sort': 'status', 'order': 'desc'}, 'task_completed_id_idx'),
+        ({'sort': 'title', 'order': 'asc'}, 'task_title_id_idx'),
+        ({'sort': 'created_at', 'order': 'desc'}, 'task_created_id_idx'),
+        ({'priority': 'High'}, 'task_prio_title_idx'),
+    ])
+    def test_sort_uses_index(self, params, index_name):
+        """Первая страница читается по индексу, временное B-дерево для ORDER BY не строится."""
+        plan = get_list_queryset(params)[:50].explain()
+        assert index_name in plan
+        assert 'TEMP B-TREE' not in plan
+
+    @pytest.mark.parametrize("ordering, values, index_name", [
+        ([('priority_rank', False), ('id', False)], [3, 2], 'task_prio_rank_id_idx'),
+        ([('status_rank', True), ('id', True)], [2, 3], 'task_status_rank_id_idx'),
+        ([('title', False), ('id', False)], ['Task High', 3], 'task_title_id_idx'),
+        ([('deadline', False), ('id', False)], ['2026-01-01', 3], 'task_deadline_id_idx'),
+    ])
+    def test_cursor_page_seeks_index(self, ordering, values, index_name):
+        """Страница после курсора начинается с поиска по индексу, а не с его начала."""
+        keyset = TaskKeysetPagination.get_keyset_filter(values, ordering)
+        queryset = Task.objects.filter(keyset).order_by(*[('-' if desc else '') + name for name, desc in ordering])
+        plan = queryset[:50].explain()
+        assert f'SEARCH tasks_task USING INDEX {index_name}' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_priority_rank_in_sync(self):
+        """priority_rank соответствует priority после создания и изменения."""
+        for task in Task.objects.all():
+            assert task.priority_rank == Task.PRIORITY_RANKS[task.priority]
+
+        task = Task.objects.get(priority=Task.Priority.LOW)
+        task.priority = Task.Priority.CRITICAL
+        task.save()
+        task.refresh_from_db()
+        assert task.priority_rank == 4
+
+    def test_status_rank_in_sync(self):
+        """status_rank соответствует status после save(), массовых правок и пересчёта по дате."""
+        task = Task.objects.get(priority=Task.Priority.LOW)
+        task.is_completed_by_user = True
+        task.save()
+        bulk_update_tasks(Task.objects.filter(priority=Task.Priority.HIGH), {'deadline': datetime.date(2000, 1, 1)})
+        Task.objects.filter(priority=Task.Priority.MEDIUM).update(deadline=datetime.date(2000, 1, 1))
+        recompute_statuses()
+        for task in Task.objects.all():
+            assert task.status_rank == Task.STATUS_RANKS[task.status]
+        assert set(Task.objects.values_list('status', flat=True)) == {'Active', 'Completed', 'Overdue'}
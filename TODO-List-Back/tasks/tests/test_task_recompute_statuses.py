@@ -0,0 +1,105 @@
+# tasks/tests/test_task_recompute_statuses.py
+
+import pytest
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from tasks.models import Task, TaskChangeSequence
+from tasks.services import recompute_statuses
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+@pytest.mark.django_db
+class TestRecomputeStatuses:
+    """
+    Тесты пересчёта статусов (services.recompute_statuses и команда recompute_statuses).
+    """
+
+    def setup_method(self):
+        self.today = timezone.now().date()
+        self.yesterday = self.today - datetime.timedelta(days=1)
+        self.tomorrow = self.today + datetime.timedelta(days=1)
+
+        # Задачи сохраняются с корректным статусом на сегодня
+        self.task_active = create_test_task(title="Active Task", deadline=self.today)
+        self.task_completed = create_test_task(title="Completed Task", deadline=self.today, is_completed_by_user=True)
+        self.task_overdue = create_test_task(title="Overdue Task", deadline=self.yesterday)
+        self.task_late = create_test_task(title="Late Task", deadline=self.yesterday, is_completed_by_user=True)
+        self.task_no_deadline = create_test_task(title="No deadline")
+
+    def get_statuses(self):
+        return dict(Task.objects.values_list('title', 'status'))
+
+    def test_nothing_to_do_today(self):
+        """Если статусы уже актуальны, ничего не обновляется."""
+        seq = TaskChangeSequence.allocate()
+        versions = dict(Task.objects.values_list('id', 'version'))
+        counts = recompute_statuses(today=self.today)
+        assert sum(counts.values()) == 0
+        # Номер изменения не выделялся, строки не тронуты
+        assert TaskChangeSequence.objects.get().value == seq
+        assert dict(Task.objects.values_list('id', 'version')) == versions
+
+    def test_deadline_passes(self):
+        """На следующий день Active -> Overdue и Completed -> Late."""
+        counts = recompute_statuses(today=self.tomorrow)
+
+        assert counts == {
+            'Active -> Overdue': 1,
+            'Completed -> Late': 1,
+            'Overdue -> Active': 0,
+            'Late -> Completed': 0,
+        }
+        assert self.get_statuses() == {
+            "Active Task": Task.Status.OVERDUE,
+            "Completed Task": Task.Status.LATE,
+            "Overdue Task": Task.Status.OVERDUE,
+            "Late Task": Task.Status.LATE,
+            "No deadline": Task.Status.ACTIVE,
+        }
+
+    def test_deadline_moved_back(self):
+        """Обратный переход, если дедлайн сдвинули в обход save()."""
+        Task.objects.filter(pk__in=[self.task_overdue.pk, self.task_late.pk]).update(deadline=self.tomorrow)
+
+        counts = recompute_statuses(today=self.today)
+
+        assert counts['Overdue -> Active'] == 1
+        assert counts['Late -> Completed'] == 1
+        assert self.get_statuses()["Overdue Task"] == Task.Status.ACTIVE
+        assert self.get_statuses()["Late Task"] == Task.Status.COMPLETED
+
+    def test_deadline_removed(self):
+        """Дедлайн сняли в обход save(): без дедлайна задача не просрочена."""
+        Task.objects.filter(pk__in=[self.task_overdue.pk, self.task_late.pk]).update(deadline=None)
+
+        counts = recompute_statuses(today=self.today)
+
+        assert (counts['Overdue -> Active'], counts['Late -> Completed']) == (1, 1)
+        assert self.get_statuses()["Overdue Task"] == Task.Status.ACTIVE
+        assert self.get_statuses()["Late Task"] == Task.Status.COMPLETED
+
+    def test_full_fixes_other_mismatches(self):
+        """С full=True исправляются и другие расхождения."""
+        Task.objects.filter(pk=self.task_no_deadline.pk).update(status=Task.Status.LATE)
+
+        assert 'other' not in recompute_statuses(today=self.today)
+        counts = recompute_statuses(today=self.today, full=True)
+
+        assert counts['other'] == 1
+        assert self.get_statuses()["No deadline"] == Task.Status.ACTIVE
+
+    def test_command_output(self):
+        out = StringIO()
+        call_command('recompute_statuses', '--date', self.tomorrow.isoformat(), stdout=out)
+        output = out.getvalue()
+        assert 'Active -> Overdue: 1' in output
+        assert 'Completed -> Late: 1' in output
+        assert 'Updated 2 tasks' in output
+
+    def test_command_invalid_date(self):
+        with pytest.raises(CommandError):
+            call_command('recompute_statuses', '--date', '31.12.2025', stdout=StringIO())
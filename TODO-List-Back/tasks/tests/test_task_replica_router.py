@@ -0,0 +1,144 @@
+# tasks/tests/test_task_replica_router.py
+
+import pytest
+import shutil
+import time
+from django.core.management import call_command
+from django.db import connections, router
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from tasks.routers import use_primary
+from tasks.services import bulk_delete_tasks
+from tasks.tests.utilits.create_test_task import create_test_task
+
+REPLICA = 'replica'
+
+
+def add_replica(name):
+    connections.settings[REPLICA] = {
+        **connections['default'].settings_dict,
+        'NAME': str(name),
+        'TEST': {'MIRROR': None},
+    }
+
+
+def remove_replica():
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture(scope='module')
+def replica_template(tmp_path_factory, django_db_setup, django_db_blocker, django_db_snapshot):
+    """Файл SQLite со схемой задач: снимок тестовой базы (conftest.py) или мигрируется один раз на модуль."""
+    if django_db_snapshot is not None and django_db_snapshot.exists():
+        return django_db_snapshot
+    path = tmp_path_factory.mktemp('replica') / 'template.sqlite3'
+    with django_db_blocker.unblock():
+        add_replica(path)
+        call_command('migrate', database=REPLICA, verbosity=0)
+        remove_replica()
+    return path
+
+
+@pytest.fixture
+def replica(replica_template, tmp_path, settings):
+    """
+    Реплика - отдельный файл SQLite со схемой, но без репликации: по тому,
+    какие данные видны, понятно, из какой БД было чтение.
+    """
+    path = tmp_path / 'replica.sqlite3'
+    shutil.copy(replica_template, path)
+    settings.TASKS_REPLICA_ALIAS = REPLICA
+    add_replica(path)
+    yield
+    remove_replica()
+
+
+@pytest.mark.django_db
+class TestReplicaRouter:
+    """
+    Тесты маршрутизации чтения на реплику и закрепления клиента за основной БД после записи.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, replica):
+        # Не setup_method: реплика должна быть подключена до создания задач
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        self.task = create_test_task(title="Primary task")
+        Task.objects.using(REPLICA).create(title="Replica task")
+
+    def titles(self, response):
+        return [item['title'] for item in response.data]
+
+    def test_router(self):
+        assert router.db_for_read(Task) == REPLICA
+        assert router.db_for_write(Task) == 'default'
+        with use_primary():
+            assert router.db_for_read(Task) == 'default'
+        assert router.db_for_read(Task) == REPLICA
+
+    def test_reads_go_to_replica(self):
+        assert self.titles(self.client.get(self.list_url)) == ["Replica task"]
+        detail = self.client.get(reverse('task-detail', kwargs={'pk': self.task.pk}))
+        assert detail.data['title'] == "Replica task"  # у реплики тот же id - её первая задача
+
+    def test_client_sticks_to_primary_after_write(self, settings):
+        settings.TASKS_CACHE_ENABLED = False
+        response = self.client.post(self.list_url, {'title': 'Just created'}, format='json')
+        assert response.status_code == 201
+        assert Task.objects.using('default').filter(title='Just created').exists()
+        assert not Task.objects.using(REPLICA).filter(title='Just created').exists()
+
+        # Пока действует cookie, клиент читает свою запись из основной БД
+        assert self.titles(self.client.get(self.list_url)) == ["Just created", "Primary task"]
+
+        # Другой клиент читает с реплики
+        assert self.titles(APIClient().get(self.list_url)) == ["Replica task"]
+
+    def test_pin_expires(self, settings):
+        self.client.post(self.list_url, {'title': 'Just created'}, format='json')
+        self.client.cookies[settings.TASKS_PRIMARY_COOKIE] = str(time.time() - 1)
+        assert self.titles(self.client.get(self.list_url)) == ["Replica task"]
+
+    def test_failed_write_does_not_pin(self, settings):
+        response = self.client.post(self.list_url, {'title': 'Abc'}, format='json')
+        assert response.status_code == 400
+        assert settings.TASKS_PRIMARY_COOKIE not in response.cookies
+
+    def test_write_requests_use_primary(self):
+        url = reverse('task-detail', kwargs={'pk': self.task.pk})
+        response = self.client.patch(url, {'title': 'Patched primary'}, format='json')
+        assert response.status_code == 200
+        assert Task.objects.using('default').get(pk=self.task.pk).title == 'Patched primary'
+        assert Task.objects.using(REPLICA).get().title == "Replica task"
+
+    def test_bulk_delete_outside_request_uses_primary(self):
+        assert bulk_delete_tasks(Task.objects.all()) == 1
+        assert not Task.objects.using('default').exists()
+        assert Task.objects.using(REPLICA).count() == 1
+
+    def test_export_reads_replica(self):
+        response = self.client.get(reverse('task-export'))
+        assert b'Replica task' in b''.join(response.streaming_content)
+
+    def test_replica_read_not_cached_right_after_write(self):
+        """Пока реплика может отставать, прочитанный с неё список не кэшируется."""
+        self.client.post(self.list_url, {'title': 'Just created'}, format='json')
+        other = APIClient()
+        assert other.get(self.list_url)['X-Cache'] == 'MISS'
+        assert other.get(self.list_url)['X-Cache'] == 'MISS'
+
+    def test_replica_read_cached_after_lag(self, settings):
+        settings.TASKS_REPLICA_LAG = 0
+        self.client.post(self.list_url, {'title': 'Just created'}, format='json')
+        other = APIClient()
+        assert other.get(self.list_url)['X-Cache'] == 'MISS'
+        assert other.get(self.list_url)['X-Cache'] == 'HIT'
+
+
+def test_no_replica_reads_default():
+    assert router.db_for_read(Task) == 'default'
@@ -0,0 +1,124 @@
+# tasks/tests/test_task_search.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from tasks.search import build_match_query, fts_available
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+def get_pks(response):
+    assert response.status_code == status.HTTP_200_OK
+    return [task['id'] for task in response.data]
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    """
+    Тесты полнотекстового поиска (GET /api/tasks/?q=).
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+
+        self.task_report = create_test_task(title="Quarterly report", description="Finance numbers")
+        self.task_reporting = create_test_task(title="Set up reporting", description="Dashboards")
+        self.task_milk = create_test_task(title="Buy milk", description="Report the price of milk to finance")
+        self.task_other = create_test_task(title="Walk the dog", description="")
+
+    @pytest.mark.parametrize("text, expected", [
+        ("report", '"report"*'),
+        ("  quarterly   report ", '"quarterly"* "report"*'),
+        ('report" OR title:*', '"report"* "OR"* "title"*'),  # синтаксис FTS не проходит
+        ("!!!", ''),
+    ])
+    def test_build_match_query(self, text, expected):
+        assert build_match_query(text) == expected
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 только для SQLite')
+    def test_fts_installed(self):
+        assert fts_available()
+
+    def test_search_title_and_description_with_prefix(self):
+        """Ищется по префиксу в title и description."""
+        response = self.client.get(self.list_url, {'q': 'repo'})
+        assert sorted(get_pks(response)) == sorted([self.task_report.pk, self.task_reporting.pk, self.task_milk.pk])
+
+    def test_search_all_words_required(self):
+        response = self.client.get(self.list_url, {'q': 'finance report'})
+        assert sorted(get_pks(response)) == sorted([self.task_report.pk, self.task_milk.pk])
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 только для SQLite')
+    def test_search_ranked_by_relevance(self):
+        """Без sort результаты ранжируются: совпадение в title важнее description."""
+        response = self.client.get(self.list_url, {'q': 'milk'})
+        assert get_pks(response) == [self.task_milk.pk]
+
+        response = self.client.get(self.list_url, {'q': 'report'})
+        pks = get_pks(response)
+        assert pks.index(self.task_report.pk) < pks.index(self.task_milk.pk)
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 только для SQLite')
+    @pytest.mark.parametrize("params", [{}, {'page_size': 2}, {'sort': 'title'}])
+    def test_single_match_per_query(self, params):
+        """MATCH выполняется один раз (JOIN с индексом), а не подзапросом на каждую строку; таблица FTS не перепроверяется."""
+        self.client.get(self.list_url, {'q': 'milk'})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {**params, 'q': 'report'})
+        assert response.status_code == status.HTTP_200_OK
+        searches = [query['sql'] for query in queries if 'MATCH' in query['sql']]
+        assert searches and all(sql.count('MATCH') == 1 for sql in searches)
+        assert all('JOIN "tasks_task_fts"' in sql for sql in searches)
+        assert not any('sqlite_master' in query['sql'] for query in queries)
+
+    def test_search_with_explicit_sort(self):
+        response = self.client.get(self.list_url, {'q': 'report', 'sort': 'title', 'order': 'desc'})
+        assert get_pks(response) == [self.task_reporting.pk, self.task_report.pk, self.task_milk.pk]
+
+    def test_search_combined_with_filters(self):
+        Task.objects.filter(pk=self.task_milk.pk).update(priority=Task.Priority.HIGH)
+        response = self.client.get(self.list_url, {'q': 'report', 'priority': 'High'})
+        assert get_pks(response) == [self.task_milk.pk]
+
+    def test_index_follows_changes(self, settings):
+        """Индекс синхронизирован при save(), update(), bulk_create и delete."""
+        # Прямые update()/bulk_create не сбрасывают кэш ответов, здесь проверяется только индекс
+        settings.TASKS_CACHE_ENABLED = False
+
+        self.task_other.title = "Walk the cat"
+        self.task_other.save()
+        assert get_pks(self.client.get(self.list_url, {'q': 'cat'})) == [self.task_other.pk]
+        assert get_pks(self.client.get(self.list_url, {'q': 'dog'})) == []
+
+        Task.objects.filter(pk=self.task_other.pk).update(description="Bring a leash")
+        assert get_pks(self.client.get(self.list_url, {'q': 'leash'})) == [self.task_other.pk]
+
+        Task.objects.bulk_create([Task(title="Leash shopping")])
+        assert len(get_pks(self.client.get(self.list_url, {'q': 'leash'}))) == 2
+
+        self.task_other.delete()
+        assert len(get_pks(self.client.get(self.list_url, {'q': 'leash'}))) == 1
+
+    def test_search_with_pagination(self):
+        params = {'q': 'report', 'page_size': 2}
+        first = self.client.get(self.list_url, params)
+        second = self.client.get(first.data['next'])
+        pks = [task['id'] for task in first.data['results'] + second.data['results']]
+        assert pks == get_pks(self.client.get(self.list_url, {'q': 'report'}))
+
+    def test_fallback_without_fts(self, monkeypatch):
+        """Без FTS поиск работает через LIKE по title и description."""
+        monkeypatch.setattr('tasks.search.fts_available', lambda using='default': False)
+
+        response = self.client.get(self.list_url, {'q': 'milk'})
+        assert get_pks(response) == [self.task_milk.pk]
+
+        # Сортировка по релевантности недоступна, используется title
+        response = self.client.get(self.list_url, {'q': 'report'})
+        assert get_pks(response) == [self.task_milk.pk, self.task_report.pk, self.task_reporting.pk]
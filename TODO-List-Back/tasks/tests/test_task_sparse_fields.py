@@ -0,0 +1,112 @@
+# tasks/tests/test_task_sparse_fields.py
+
+import pytest
+import datetime
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from tasks.serializers import TASK_SUMMARY_FIELDS, TaskSerializer
+from tasks.tests.test_task_get_list_pagination import collect_pages
+from tasks.tests.utilits.create_test_task import create_test_tasks
+
+ALL_FIELDS = tuple(TaskSerializer().fields)
+
+
+def task_selects(queries):
+    """SELECT строк задач, без агрегата для ETag."""
+    return [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT "tasks_task"') and 'COUNT(' not in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """
+    Тесты выбора полей списка: ?view=summary, ?fields=, ?exclude=.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.list_url = reverse('task-list')
+        today = timezone.now().date()
+        self.tasks = create_test_tasks([
+            dict(
+                title=f"Task {index:02}",
+                description="Long description " * 200,
+                deadline=today + datetime.timedelta(days=index - 3),
+                priority=Task.Priority.values[index % 4],
+                is_completed_by_user=index % 3 == 0,
+            )
+            for index in range(12)
+        ])
+
+    def test_summary_view(self):
+        """Компактное представление: только поля доски, в порядке TaskSerializer."""
+        full = self.client.get(self.list_url)
+        summary = self.client.get(self.list_url, {'view': 'summary'})
+        assert summary.status_code == status.HTTP_200_OK
+        assert all(tuple(task) == TASK_SUMMARY_FIELDS for task in summary.json())
+        assert [task['id'] for task in summary.json()] == [task['id'] for task in full.json()]
+        assert summary.json()[0] == {key: full.json()[0][key] for key in TASK_SUMMARY_FIELDS}
+        # Длинные описания не передаются: ответ в разы меньше
+        assert len(summary.content) * 10 < len(full.content)
+
+    @pytest.mark.parametrize("params, expected", [
+        ({'fields': 'title,id'}, ('id', 'title')),
+        ({'fields': ' deadline , status '}, ('deadline', 'status')),
+        ({'exclude': 'description'}, tuple(field for field in ALL_FIELDS if field != 'description')),
+        ({'view': 'summary', 'exclude': 'deadline,priority'}, ('id', 'title', 'is_completed_by_user')),
+        ({'view': 'summary', 'fields': 'id,status'}, ('id', 'status')),
+        ({'view': 'full'}, ALL_FIELDS),
+    ])
+    def test_selected_fields(self, params, expected):
+        response = self.client.get(self.list_url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert all(tuple(task) == expected for task in response.json())
+
+    @pytest.mark.parametrize("params", [{}, {'page_size': 5}])
+    def test_select_narrowed(self, params):
+        """Ненужные столбцы не читаются из БД - и в быстром пути, и на страницах пагинации."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {**params, 'view': 'summary'})
+        assert response.status_code == status.HTTP_200_OK
+        [select] = task_selects(queries)
+        assert '"tasks_task"."description"' not in select
+        assert '"tasks_task"."title"' in select
+
+    @pytest.mark.parametrize("sort_param", ['title', 'priority', 'deadline', 'status', 'task_status', 'created_at'])
+    def test_pagination_with_fields(self, sort_param):
+        """Курсор строится по полям сортировки, даже если их нет в ответе, без дозагрузки полей."""
+        params = {'sort': sort_param, 'order': 'desc', 'fields': 'id'}
+        expected = [task['id'] for task in self.client.get(self.list_url, params).json()]
+
+        with CaptureQueriesContext(connection) as queries:
+            paged = collect_pages(self.client, self.list_url, {**params, 'page_size': 5})
+        assert paged == expected
+        # deadline: страница на границе дат и NULL выбирается двумя запросами по индексу
+        assert len(task_selects(queries)) == (4 if sort_param == 'deadline' else 3)
+
+    @pytest.mark.parametrize("params, error_field", [
+        ({'fields': 'title,secret'}, 'fields'),
+        ({'exclude': 'priority_rank'}, 'exclude'),
+        ({'view': 'tiny'}, 'view'),
+        ({'fields': 'title', 'exclude': 'title'}, 'fields'),
+    ])
+    def test_invalid(self, params, error_field):
+        response = self.client.get(self.list_url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.json()) == [error_field]
+
+    def test_cache_key_includes_fields(self, settings):
+        settings.TASKS_CACHE_ENABLED = True
+        full = self.client.get(self.list_url)
+        summary = self.client.get(self.list_url, {'view': 'summary'})
+        assert (full['X-Cache'], summary['X-Cache']) == ('MISS', 'MISS')
+        assert tuple(summary.json()[0]) == TASK_SUMMARY_FIELDS
+        assert self.client.get(self.list_url, {'view': 'summary'})['X-Cache'] == 'HIT'
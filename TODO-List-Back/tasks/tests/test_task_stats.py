@@ -0,0 +1,135 @@
+# tasks/tests/test_task_stats.py
+
+import pytest
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.models import Task, TaskCounter
+from tasks.stats import reconcile_counters, task_stats
+from tasks.tests.utilits.create_test_task import create_test_task
+
+
+@pytest.mark.django_db
+class TestTaskStats:
+    """
+    Тесты статистики (GET /api/tasks/stats/) и счётчиков TaskCounter.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('task-stats')
+        self.today = timezone.now().date()
+        self.yesterday = self.today - datetime.timedelta(days=1)
+        self.soon = self.today + datetime.timedelta(days=2)
+        self.later = self.today + datetime.timedelta(days=30)
+
+        self.active = create_test_task(title="Active task", priority=Task.Priority.LOW, deadline=self.later)
+        self.due_soon = create_test_task(title="Due soon task", priority=Task.Priority.HIGH, deadline=self.soon)
+        self.overdue = create_test_task(title="Overdue task", priority=Task.Priority.HIGH, deadline=self.yesterday)
+        self.late = create_test_task(
+            title="Late task", priority=Task.Priority.CRITICAL, deadline=self.yesterday, is_completed_by_user=True,
+        )
+        self.completed = create_test_task(title="Completed task", is_completed_by_user=True)
+        self.no_deadline = create_test_task(title="No deadline task")
+
+    def assert_counters_consistent(self):
+        assert reconcile_counters() == {}
+
+    def test_stats(self):
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            'total': 6,
+            'status': {'Active': 3, 'Completed': 1, 'Overdue': 1, 'Late': 1},
+            'priority': {'Low': 1, 'Medium': 2, 'High': 2, 'Critical': 1},
+            'overdue': 1,
+            'due_soon': 1,
+            'due_soon_days': 3,
+        }
+
+    def test_stats_single_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            task_stats()
+        assert len(queries) == 1
+        assert 'tasks_task"' not in queries[0]['sql']
+
+    def test_stats_depend_on_date(self, settings):
+        """Статус по дедлайну считается на дату запроса, без пересчёта счётчиков."""
+        settings.TASKS_DUE_SOON_DAYS = 1
+        stats = task_stats(today=self.soon + datetime.timedelta(days=1))
+        assert stats['status']['Overdue'] == 2
+        assert stats['due_soon'] == 0
+
+        stats = task_stats(today=self.soon - datetime.timedelta(days=1))
+        assert stats['due_soon'] == 1
+
+    def test_counters_after_api_writes(self):
+        self.client.post(reverse('task-list'), {'title': 'Created task', 'priority': 'Critical'}, format='json')
+        self.client.patch(
+            reverse('task-detail', kwargs={'pk': self.active.pk}),
+            {'priority': 'High', 'deadline': self.yesterday.isoformat()},
+            format='json',
+        )
+        self.client.post(reverse('task-edit-status', kwargs={'pk': self.overdue.pk}))
+        self.client.delete(reverse('task-detail', kwargs={'pk': self.completed.pk}))
+        self.assert_counters_consistent()
+
+        stats = self.client.get(self.url).data
+        assert stats['total'] == 6
+        assert stats['status'] == {'Active': 3, 'Completed': 0, 'Overdue': 1, 'Late': 2}
+        assert stats['priority'] == {'Low': 0, 'Medium': 1, 'High': 3, 'Critical': 2}
+
+    def test_counters_after_bulk_writes(self):
+        self.client.post(
+            reverse('task-load-tasks'),
+            [{'title': 'Loaded task', 'deadline': self.soon.isoformat()}, {'title': 'Another loaded'}],
+            format='json',
+        )
+        self.assert_counters_consistent()
+
+        self.client.post(
+            reverse('task-bulk-update'),
+            {'filter': {'priority': 'High'}, 'patch': {'priority': 'Low', 'deadline': self.later.isoformat()}},
+            format='json',
+        )
+        self.assert_counters_consistent()
+
+        self.client.post(reverse('task-bulk-edit-status'), {'ids': [self.active.pk, self.late.pk]}, format='json')
+        self.assert_counters_consistent()
+
+        self.client.post(reverse('task-bulk-delete'), {'filter': {'priority': 'Medium'}}, format='json')
+        self.assert_counters_consistent()
+        assert self.client.get(self.url).data['total'] == 4
+
+    def test_counters_after_model_writes(self):
+        self.due_soon.edit_mark()
+        self.late.deadline = None
+        self.late.save()
+        self.no_deadline.delete()
+        self.assert_counters_consistent()
+
+    def test_reconcile_command_fixes_counters(self):
+        Task.objects.filter(pk=self.active.pk).update(priority=Task.Priority.CRITICAL)
+        TaskCounter.objects.create(dimension='open', key='2000-01-01', count=5)
+
+        out = StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert lines == [
+            'open:2000-01-01: 5 -> 0',
+            'priority:Critical: 1 -> 2',
+            'priority:Low: 1 -> 0',
+            'Fixed 3 counters',
+        ]
+        assert not TaskCounter.objects.filter(count=0).exists()
+        self.assert_counters_consistent()
+        assert task_stats()['priority']['Critical'] == 2
@@ -0,0 +1,63 @@
+# tasks/tests/test_task_test_fixtures.py
+
+import pytest
+import datetime
+import sqlite3
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.stats import reconcile_counters
+from tasks.tests.utilits.create_test_task import create_test_task, create_test_tasks
+
+
+@pytest.mark.django_db
+class TestCreateTestTasks:
+    """
+    Тесты фабрики create_test_tasks: одна вставка, статус и счётчики как у create_test_task.
+    """
+
+    def test_matches_create_test_task(self, django_assert_max_num_queries):
+        today = timezone.now().date()
+        items = [
+            dict(title="Overdue", deadline=today - datetime.timedelta(days=1)),
+            dict(title="Late", deadline=today - datetime.timedelta(days=1), is_completed_by_user=True),
+            dict(title="Completed", is_completed_by_user=True),
+            dict(title="Active", deadline=today + datetime.timedelta(days=1), priority=Task.Priority.CRITICAL),
+        ]
+        with django_assert_max_num_queries(6):
+            tasks = create_test_tasks(items, description="Bulk")
+
+        assert [task.title for task in tasks] == [item['title'] for item in items]
+        assert [task.pk for task in tasks] == sorted(task.pk for task in tasks)
+        for task, item in zip(tasks, items):
+            single = create_test_task(**item, description="Bulk")
+            stored = Task.objects.get(pk=task.pk)
+            assert (stored.status, stored.priority_rank) == (single.status, single.priority_rank)
+            assert stored.description == "Bulk"
+        # Счётчики /api/tasks/stats/ обновлены так же, как при save()
+        assert reconcile_counters() == {}
+
+
+@pytest.mark.django_db
+class TestDatabaseSnapshot:
+    """
+    Тесты снимка мигрированной тестовой базы (tasks/tests/conftest.py).
+    """
+
+    def test_snapshot_is_migrated(self, django_db_snapshot):
+        if django_db_snapshot is None:
+            pytest.skip('Снимок используется только для SQLite в памяти')
+        assert django_db_snapshot.exists()
+
+        loader = MigrationLoader(connection)
+        expected = set(loader.disk_migrations)
+        assert loader.applied_migrations.keys() == expected
+
+        snapshot = sqlite3.connect(django_db_snapshot)
+        try:
+            applied = set(snapshot.execute('SELECT app, name FROM django_migrations'))
+        finally:
+            snapshot.close()
+        assert applied == expected
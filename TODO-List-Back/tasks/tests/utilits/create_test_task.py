@@ -1,14 +1,27 @@
 from tasks.models import Task
+from tasks.services import bulk_create_task_objects
+
+TEST_TASK_DEFAULTS = {
+    'title': 'Initial Test Title',
+    'description': 'Initial description',
+    'deadline': None,
+    'priority': Task.Priority.MEDIUM,
+    'is_completed_by_user': False,
+}
+
 
 def create_test_task(**kwargs):
     """Создает тестовую задачу с дефолтными значениями."""
-    defaults = {
-        'title': 'Initial Test Title',
-        'description': 'Initial description',
-        'deadline': None,
-        'priority': Task.Priority.MEDIUM,
-        'is_completed_by_user': False,
-    }
+    defaults = dict(TEST_TASK_DEFAULTS)
     defaults.update(kwargs)
     task = Task.objects.create(**defaults)
     return task
+
+
+def create_test_tasks(items, **kwargs):
+    """
+    Создает задачи одним bulk_create, статус считается заранее в Python.
+    items - словари полей каждой задачи поверх дефолтов и kwargs; возвращает задачи с id в том же порядке.
+    Все задачи получают один change_seq, поэтому для тестов ленты изменений нужен create_test_task.
+    """
+    return bulk_create_task_objects([{**TEST_TASK_DEFAULTS, **kwargs, **item} for item in items])
@@ -1,11 +1,26 @@
 # tasks/urls.py
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import TaskEventStreamView
 from .views import TaskViewSet
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet)
 
 urlpatterns = [
+    # До маршрутов router: иначе 'events' совпал бы с tasks/<pk>/
+    path('tasks/events/', TaskEventStreamView.as_view(), name='task-events'),
     path('', include(router.urls)),
 ]
+
+if settings.TASKS_ASYNC_VIEWS:
+    # Под ASGI частые запросы обслуживаются async-представлениями,
+    # остальное - тем же TaskViewSet
+    from .async_views import TaskDetailAsyncView, TaskEditStatusAsyncView, TaskListAsyncView
+
+    urlpatterns = [
+        path('tasks/', TaskListAsyncView.as_view(), name='task-list'),
+        path('tasks/<int:pk>/', TaskDetailAsyncView.as_view(), name='task-detail'),
+        path('tasks/<int:pk>/edit_status/', TaskEditStatusAsyncView.as_view(), name='task-edit-status'),
+    ] + urlpatterns
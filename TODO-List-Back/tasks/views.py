@@ -1,109 +1,260 @@
 from django.core.serializers import get_serializer
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from django.db import router
+from django.http import Http404, StreamingHttpResponse
 from rest_framework.decorators import action
+from . import cache as task_cache
+from .compression import compression
+from .changes import CHANGES_LIMIT, MAX_CHANGES_LIMIT, changes_since
+from .conditional import (
+    detail_validators, list_validators, not_modified_response, page_validators, set_validators,
+)
+from .exports import EXPORT_COMPRESSION_LEVELS, EXPORT_FORMATS
+from .instrumentation import measure_serialization
 from .models import Task
-from django.db.models import Case, When, Value, IntegerField, Q
-from django.db.models.functions import Coalesce
 from drf_yasg import openapi
-from .serializers import TaskSerializer, TaskCreateAndUpdateSerializer
+from .pagination import TaskKeysetPagination
+from .serializers import (
+    TASK_BATCH_LIMIT, TASK_VIEWS, TaskBatchSerializer, TaskSerializer, TaskCreateAndUpdateSerializer,
+    TaskBulkSelectionSerializer, TaskBulkUpdateSerializer, task_batch_data, task_fieldset, task_list_data,
+)
+from .services import (
+    bulk_create_tasks, bulk_delete_tasks, bulk_toggle_tasks, bulk_update_tasks, filter_tasks, select_task_fields,
+    sort_tasks,
+)
+from .stats import task_stats
 from drf_yasg.utils import swagger_auto_schema, no_body
 
+NOT_FOUND_MESSAGE = 'No Task matches the given query.'
+
 
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    pagination_class = TaskKeysetPagination
 
     def get_serializer_class(self):
-        if self.action in ['create', 'update', 'partial_update']:
+        if self.action in ['create', 'update', 'partial_update', 'load_tasks']:
             return TaskCreateAndUpdateSerializer
         return TaskSerializer
 
+    @swagger_auto_schema(manual_parameters=[
+        openapi.Parameter('view', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=[*TASK_VIEWS]),
+        openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='id,title,...'),
+        openapi.Parameter('exclude', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='description,...'),
+    ])
+    def list(self, request, *args, **kwargs):
+        # Набор полей проверяется до условного GET и кэша: неизвестное поле - 400
+        self.fieldset = task_fieldset(request.query_params)
+        return self.cached_response(task_cache.list_key, self.conditional_list_response, request, *args, **kwargs)
+
+    def conditional_list_response(self, request, *args, **kwargs):
+        """Ответ списка и его ETag / Last-Modified; 304, если у клиента та же версия."""
+        if self.paginator.is_requested(request):
+            # Страница: валидаторы по её содержимому
+            response = self.list_response(request, *args, **kwargs)
+            etag, last_modified = page_validators(response.data)
+        else:
+            # Полный список: один агрегат, и при совпадении 304 без выборки и сериализации
+            response = None
+            etag, last_modified = list_validators(filter_tasks(Task.objects.all(), request.query_params), request)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified, etag, last_modified
+        if response is None:
+            response = self.list_response(request, *args, **kwargs)
+        return response, etag, last_modified
+
+    def list_response(self, request, *args, **kwargs):
+        # Полный список собирается из values_list(), минуя TaskSerializer;
+        # страницы пагинации небольшие и идут обычным путём.
+        # В обоих случаях из БД читаются только выбранные поля (?view=, ?fields=, ?exclude=)
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.paginator.is_requested(request):
+            with measure_serialization():
+                data = task_list_data(queryset, self.fieldset)
+            return Response(data)
+        page = self.paginate_queryset(select_task_fields(queryset, self.fieldset))
+        serializer = self.get_serializer(page, many=True, fields=self.fieldset)
+        with measure_serialization():
+            data = serializer.data
+        return self.get_paginated_response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_field]
+        return self.cached_response(
+            lambda request: task_cache.detail_key(pk),
+            self.conditional_retrieve_response, request, *args, **kwargs
+        )
+
+    def conditional_retrieve_response(self, request, *args, **kwargs):
+        """Карточка задачи и её ETag / Last-Modified; 304, если у клиента та же версия."""
+        etag, last_modified = detail_validators(kwargs[self.lookup_field])
+        if etag is not None:
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified, etag, last_modified
+        with measure_serialization():
+            response = super().retrieve(request, *args, **kwargs)
+        return response, etag, last_modified
+
+    def cached_response(self, make_key, handler, request, *args, **kwargs):
+        """
+        handler возвращает ответ и его ETag / Last-Modified. 200-ответ кэшируется по
+        версии вместе с валидаторами: при попадании нет ни одного запроса к БД,
+        а валидаторы считаются только при промахе.
+        """
+        if not task_cache.is_enabled():
+            response, etag, last_modified = handler(request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+
+        key = make_key(request)
+        cached = task_cache.get_cached(key)
+        if cached is not None:
+            data, etag, last_modified = cached
+            response = not_modified_response(request, etag, last_modified) or Response(data)
+            response['X-Cache'] = 'HIT'
+            return set_validators(response, etag, last_modified)
+
+        response, etag, last_modified = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            task_cache.set_cached(key, (response.data, etag, last_modified))
+        response['X-Cache'] = 'MISS'
+        return set_validators(response, etag, last_modified)
+
     def get_queryset(self):
         queryset = Task.objects.all()
         request = self.request
 
-        # --- Фильтрация по названию ---
-        title_filter = request.query_params.get('title')
-        if title_filter:
-            queryset = queryset.filter(title__icontains=title_filter)
-
-        # --- Фильтрация по приоритету ---
-        priority_filter = request.query_params.get('priority')
-        if priority_filter in ('Low', 'Medium', 'High', 'Critical'):
-            print(priority_filter)
-            queryset = queryset.filter(priority=priority_filter)
-
-        # --- Фильтрация по статусу ---
-        is_completed_by_user = request.query_params.get('status')
-        if is_completed_by_user in ('true', 'false'):
-            queryset = queryset.filter(is_completed_by_user=(is_completed_by_user == 'true'))
-
-        # --- Сортировка ---
-        sort_param = request.query_params.get('sort', 'title')
-        order_param = request.query_params.get('order', 'asc')
-
-        is_desc = order_param == 'desc'
-
-        print(sort_param)
-        if sort_param == 'priority':
-            # Кастомный порядок: Low (1), Medium (2), High (3), Critical (4)
-            priority_ordering = Case(
-                When(priority='Low', then=Value(1)),
-                When(priority='Medium', then=Value(2)),
-                When(priority='High', then=Value(3)),
-                When(priority='Critical', then=Value(4)),
-                default=Value(5),
-                output_field=IntegerField()
-            )
-            queryset = queryset.annotate(priority_order=priority_ordering)
-            ordering = '-priority_order' if is_desc else 'priority_order'
-            queryset = queryset.order_by(ordering)
-
-        elif sort_param == 'deadline':
-            print("aaaaa")
-            # Сортировка по дедлайну: NULLы в конце (или в начале)
-            if is_desc:
-                # Сначала без дедлайна, затем по убыванию
-                queryset = queryset.annotate(
-                    deadline_order=Case(
-                        When(deadline__isnull=True, then=Value(0)),
-                        default=Value(1),
-                        output_field=IntegerField()
-                    )
-                ).order_by('deadline_order', '-deadline')
-            else:
-                # Сначала с дедлайнами, потом без
-                queryset = queryset.annotate(
-                    deadline_order=Case(
-                        When(deadline__isnull=False, then=Value(0)),
-                        default=Value(1),
-                        output_field=IntegerField()
-                    )
-                ).order_by('deadline_order', 'deadline')
-        elif sort_param == 'title':
-            ordering = '-title' if is_desc else 'title'
-            queryset = queryset.order_by(ordering)
-        elif sort_param == 'created_at':
-            ordering = '-created_at' if is_desc else 'created_at'
-            queryset = queryset.order_by(ordering)
-        elif sort_param == 'status':
-            # Статус: незавершённые (0) → завершённые (1)
-            queryset = queryset.annotate(
-                status_order=Case(
-                    When(is_completed_by_user=True, then=Value(1)),
-                    default=Value(0),
-                    output_field=IntegerField()
-                )
-            )
-            ordering = '-status_order' if is_desc else 'status_order'
-            queryset = queryset.order_by(ordering)
+        queryset = filter_tasks(queryset, request.query_params)
+        return sort_tasks(queryset, request.query_params)
 
-        return queryset
+    def perform_update(self, serializer):
+        # Задачу могли удалить после get_object(): 404, как если бы её не было с начала
+        try:
+            serializer.save()
+        except Task.DoesNotExist:
+            raise Http404(NOT_FOUND_MESSAGE)
 
     @swagger_auto_schema(request_body=no_body)
     @action(detail=True, methods=['post'], serializer_class=TaskSerializer)
     def edit_status(self,request,pk):
         task = self.get_object()
-        task.edit_mark()
-        return Response(self.get_serializer(task).data)
\ No newline at end of file
+        try:
+            task.edit_mark()
+        except Task.DoesNotExist:
+            raise Http404(NOT_FOUND_MESSAGE)
+        with measure_serialization():
+            data = self.get_serializer(task).data
+        return Response(data)
+
+    @swagger_auto_schema(request_body=TaskCreateAndUpdateSerializer(many=True))
+    @action(detail=False, methods=['post'])
+    def load_tasks(self, request):
+        if not isinstance(request.data, list):
+            return Response({'detail': 'Expected a list of tasks.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Валидация всей пачки за один проход, ошибки возвращаются по индексам
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            errors = [
+                {'index': index, 'errors': item_errors}
+                for index, item_errors in enumerate(serializer.errors)
+                if item_errors
+            ]
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        created = bulk_create_tasks(serializer.validated_data)
+        return Response({'created': created}, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(manual_parameters=[
+        openapi.Parameter('export_format', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=[*EXPORT_FORMATS]),
+    ])
+    @action(detail=False, methods=['get'])
+    @compression(levels=EXPORT_COMPRESSION_LEVELS)
+    def export(self, request):
+        # Те же фильтры и сортировка, что у списка, строки читаются из БД порциями
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'export_format': f'Expected one of: {", ".join(EXPORT_FORMATS)}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream, content_type, filename = EXPORT_FORMATS[export_format]
+        # БД выбирается сейчас: тело ответа читается уже после выхода из middleware
+        queryset = self.get_queryset().using(router.db_for_read(Task))
+        response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @swagger_auto_schema(manual_parameters=[
+        openapi.Parameter(
+            'ids', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+            description=f'1,2,3 - не больше {TASK_BATCH_LIMIT}',
+        ),
+        openapi.Parameter('view', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=[*TASK_VIEWS]),
+        openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='id,title,...'),
+        openapi.Parameter('exclude', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='description,...'),
+    ])
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        # Несколько задач по id одним запросом, в порядке ids; ненайденные id - в missing
+        serializer = TaskBatchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        fieldset = task_fieldset(request.query_params)
+        results, missing = task_batch_data(Task.objects.all(), serializer.validated_data['ids'], fieldset)
+        return Response({'results': results, 'missing': missing})
+
+    @swagger_auto_schema(manual_parameters=[
+        openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+    ])
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        # Изменённые задачи и удалённые id после токена since; next - токен для следующего запроса
+        try:
+            limit = min(max(int(request.query_params.get('limit', CHANGES_LIMIT)), 1), MAX_CHANGES_LIMIT)
+        except ValueError:
+            limit = CHANGES_LIMIT
+        return Response(changes_since(request.query_params.get('since'), limit))
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        # Из счётчиков TaskCounter, без просмотра таблицы задач
+        return Response(task_stats())
+
+    @action(detail=False, methods=['get'])
+    def cache_stats(self, request):
+        return Response(task_cache.stats())
+
+    def get_bulk_selection(self, validated_data):
+        queryset = Task.objects.all()
+        if 'ids' in validated_data:
+            return queryset.filter(id__in=validated_data['ids'])
+        return filter_tasks(queryset, validated_data['filter'])
+
+    @swagger_auto_schema(request_body=TaskBulkUpdateSerializer)
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        serializer = TaskBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_bulk_selection(serializer.validated_data)
+        updated = bulk_update_tasks(queryset, serializer.validated_data['patch'])
+        return Response({'updated': updated})
+
+    @swagger_auto_schema(request_body=TaskBulkSelectionSerializer)
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        serializer = TaskBulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted = bulk_delete_tasks(self.get_bulk_selection(serializer.validated_data))
+        return Response({'deleted': deleted})
+
+    @swagger_auto_schema(request_body=TaskBulkSelectionSerializer)
+    @action(detail=False, methods=['post'])
+    def bulk_edit_status(self, request):
+        serializer = TaskBulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        toggled = bulk_toggle_tasks(self.get_bulk_selection(serializer.validated_data))
+        return Response({'toggled': toggled})
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+# Под ASGI частые запросы к задачам обслуживаются async-представлениями (tasks.async_views)
+os.environ.setdefault('TASKS_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -44,7 +44,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tasks.middleware.InstrumentationMiddleware',
+    'tasks.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'tasks.middleware.ReplicaPinningMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -63,6 +66,14 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+REST_FRAMEWORK = {
+    # JSONRenderer с учётом времени сериализации для InstrumentationMiddleware
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.renderers.TaskJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
 
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -93,13 +104,121 @@ WSGI_APPLICATION = 'todolist.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE=sqlite (по умолчанию) или postgresql (нужен пакет psycopg)
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='todolist'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        }
+    }
+
+
+def int_or_none(value):
+    """Приведение для config: 'None' или пустое значение - None, иначе целое число."""
+    if isinstance(value, str) and value.strip() in ('', 'None'):
+        return None
+    return int(value)
+
+
+# Постоянные соединения: секунды жизни соединения (0 - закрывать после запроса, None - без ограничения)
+DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int_or_none)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Реплика для чтения (tasks/routers.py): DB_REPLICA_NAME - файл SQLite или имя БД PostgreSQL
+# на DB_REPLICA_HOST. Без неё всё читается из default
+TASKS_REPLICA_ALIAS = 'replica'
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+if DB_REPLICA_NAME:
+    DATABASES[TASKS_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'NAME': DB_REPLICA_NAME,
+        'HOST': config('DB_REPLICA_HOST', default=DATABASES['default'].get('HOST', '')),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['tasks.routers.PrimaryReplicaRouter']
+
+# Сколько секунд после записи клиент читает из основной БД (отставание реплики)
+TASKS_REPLICA_LAG = config('DB_REPLICA_LAG', default=5, cast=int)
+TASKS_PRIMARY_COOKIE = 'tasks_primary_until'
+
+# PRAGMA для каждого нового SQLite-соединения (tasks/db.py).
+# WAL: читатели не ждут писателя, synchronous=NORMAL достаточно для WAL,
+# busy_timeout - сколько мс писатель ждёт блокировку вместо ошибки "database is locked",
+# cache_size < 0 - размер кэша страниц в КиБ
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='wal'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='normal'),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-64000, cast=int),
+}
+
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # Для кэша ответов задач - Redis/Memcached через CACHE_BACKEND и CACHE_LOCATION
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
     }
 }
 
+# Кэш ответов списка и карточки задачи (tasks/cache.py), по умолчанию выключен.
+# Версия данных хранится в кэше и должна меняться сразу у всех воркеров, поэтому
+# нужен общий backend с атомарным incr: Redis или Memcached
+TASKS_CACHE_ENABLED = config('TASKS_CACHE_ENABLED', default=False, cast=bool)
+TASKS_CACHE_ALIAS = 'default'
+TASKS_CACHE_TIMEOUT = config('TASKS_CACHE_TIMEOUT', default=300, cast=int)
+# Кэш в памяти процесса (LocMemCache) допустим, только если сервер - один процесс:
+# иначе запись в одном воркере не сбрасывает кэш остальных. Без этого флага
+# приложение с включённым TASKS_CACHE_ENABLED и LocMemCache не запускается
+TASKS_CACHE_SINGLE_PROCESS = config('TASKS_CACHE_SINGLE_PROCESS', default=False, cast=bool)
+
+# Статистика (/api/tasks/stats/): "скоро срок" - дедлайн в ближайшие N дней
+TASKS_DUE_SOON_DAYS = config('TASKS_DUE_SOON_DAYS', default=3, cast=int)
+
+# Async-представления для list/retrieve/create/edit_status; asgi.py включает их по умолчанию
+TASKS_ASYNC_VIEWS = config('TASKS_ASYNC_VIEWS', default=False, cast=bool)
+
+# Метрики запросов (tasks.middleware.InstrumentationMiddleware): заголовок Server-Timing
+# и строка JSON в логгер tasks.instrumentation для запросов не быстрее LOG_MS миллисекунд
+TASKS_INSTRUMENTATION = config('TASKS_INSTRUMENTATION', default=False, cast=bool)
+TASKS_INSTRUMENTATION_HEADER = config('TASKS_INSTRUMENTATION_HEADER', default=True, cast=bool)
+TASKS_INSTRUMENTATION_LOG_MS = config('TASKS_INSTRUMENTATION_LOG_MS', default=0, cast=int)
+
+# Записи об удалённых задачах для ленты изменений хранятся N дней; удаляет их
+# prune_task_tombstones, клиент с более старым токеном получает 410
+TASKS_TOMBSTONE_RETENTION_DAYS = config('TASKS_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+# SSE /api/tasks/events/: комментарий-heartbeat (и проверка изменений из других процессов)
+# каждые N секунд; через TASKS_SSE_MAX_AGE секунд поток закрывается, клиент переподключается
+TASKS_SSE_HEARTBEAT = config('TASKS_SSE_HEARTBEAT', default=15, cast=int)
+TASKS_SSE_MAX_AGE = config('TASKS_SSE_MAX_AGE', default=300, cast=int)
+
+# Сжатие ответов (tasks.middleware.CompressionMiddleware): кодировки в порядке предпочтения
+# (br и zstd - если установлены Brotli и zstandard), уровни и минимальный размер тела в байтах;
+# для отдельного представления - декоратор tasks.compression.compression
+TASKS_COMPRESSION = config('TASKS_COMPRESSION', default=True, cast=bool)
+TASKS_COMPRESSION_MIN_SIZE = config('TASKS_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+TASKS_COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+TASKS_COMPRESSION_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 6}
 
 
 # Password validation
@@ -1,20 +1,27 @@
 from .settings import *
 
-# Используем тестовую базу данных
+# Тестовая база - SQLite в памяти, независимо от DB_* в окружении.
+# TEST.NAME задан явно: pytest-django не добавляет к нему суффикс воркера xdist,
+# у каждого процесса своя база в памяти
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db_test.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'NAME': ':memory:'},
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': DATABASES['default']['CONN_HEALTH_CHECKS'],
     }
 }
 
 DEBUG = True
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 
+# Для тестов не нужна медленная (и намеренно стойкая к подбору) хэш-функция паролей
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
 
-# Отключаем кэширование для тестов
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-    }
-}
\ No newline at end of file
+
+# Кэш в памяти: у каждого воркера xdist свой процесс и своя тестовая база.
+# Кэш ответов включён, чтобы тесты проходили и через него
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'todolist'}}
+TASKS_CACHE_ENABLED = True
+TASKS_CACHE_SINGLE_PROCESS = True